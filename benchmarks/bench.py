@@ -0,0 +1,250 @@
+"""
+Benchmarks for the prepo hot paths.
+
+Usage:
+  python -m benchmarks.bench run --output results.json
+  python -m benchmarks.bench run --sizes 1e3 1e5 1e7 --datasets tall wide --output results.json
+  python -m benchmarks.bench compare baseline.json results.json
+
+run times each stage (best of --repeat runs) and measures its peak traced memory in a
+separate run, so tracing does not slow down the timings. compare exits with status 1
+when a stage got slower or used more memory than the thresholds allow.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.prepo import FeaturePreProcessor, FileReader, FileWriter, __version__
+from src.prepo.io import HAS_PYARROW
+
+from .datasets import DATASETS
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def measure(func: Callable[[], Any], setup: Callable[[], Any], repeat: int) -> Tuple[float, int]:
+    """
+    Time a function and measure its peak memory.
+
+    Args:
+        func: Function taking the value returned by setup
+        setup: Function preparing a fresh input for every run (not measured)
+        repeat: Number of timed runs
+
+    Returns:
+        Tuple of (best wall time in seconds, peak traced bytes above the starting point)
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+
+    arg = setup()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        func(arg)
+        peak = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+    return best, peak
+
+
+def run_dataset(name: str, df: pd.DataFrame, repeat: int, workdir: Path) -> List[Dict[str, Any]]:
+    """Benchmark every stage on one dataset and return one record per stage."""
+    processor = FeaturePreProcessor()
+    reader, writer = FileReader(), FileWriter()
+
+    try:
+        datatypes = processor.determine_datatypes(df)
+        clean_df, _ = processor.clean_data(df, drop_na=True)
+        filtered_df = processor.clean_outliers(clean_df, datatypes)
+    except Exception as e:
+        # Stages that need these inputs are recorded as failed below
+        datatypes = clean_df = filtered_df = None
+        print(f"  preparing stage inputs failed: {e}")
+
+    stages: Dict[str, Tuple[Callable[[Any], Any], Callable[[], Any]]] = {
+        "determine_datatypes": (processor.determine_datatypes, lambda: df),
+        "clean_data": (lambda d: processor.clean_data(d, drop_na=True), lambda: df),
+        "clean_data_impute": (lambda d: processor.clean_data(d, drop_na=False), lambda: df),
+        "clean_outliers": (lambda d: processor.clean_outliers(d, datatypes), lambda: clean_df),
+        "scaler": (lambda d: processor.scaler(d, "standard", datatypes), lambda: filtered_df.copy()),
+        "process": (processor.process, lambda: df),
+    }
+
+    formats = ["csv", "parquet"] if HAS_PYARROW else ["csv"]
+    for fmt in formats:
+        path = workdir / f"{name}.{fmt}"
+        writer.write_file(df, path)
+        stages[f"write_{fmt}"] = (lambda d, path=path: writer.write_file(d, path), lambda: df)
+        stages[f"read_{fmt}"] = (reader.read_file, lambda path=path: path)
+
+    records = []
+    for stage, (func, setup) in stages.items():
+        record = {"dataset": name, "rows": len(df), "columns": len(df.columns), "stage": stage}
+        try:
+            if datatypes is None and stage in ["clean_outliers", "scaler"]:
+                raise RuntimeError("stage inputs unavailable")
+            record["seconds"], record["peak_bytes"] = measure(func, setup, repeat)
+            print(f"  {stage:<20} {record['seconds'] * 1000:10.1f} ms {record['peak_bytes'] / 2**20:10.1f} MiB", flush=True)
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            print(f"  {stage:<20} failed: {record['error']}", flush=True)
+        records.append(record)
+
+    return records
+
+
+def run(datasets: List[str], sizes: List[int], repeat: int, max_cells: int, seed: int = 0) -> Dict[str, Any]:
+    """
+    Run the benchmarks.
+
+    The wine dataset runs once at its own size; synthetic datasets run at every size
+    whose cell count stays within max_cells.
+
+    Returns:
+        Results dictionary with metadata and one record per dataset, size and stage
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name in datasets:
+            generator = DATASETS[name]
+            for n_rows in [None] if name == "wine" else sizes:
+                df = generator(n_rows, seed=seed) if n_rows is not None else generator()
+                if df.size > max_cells:
+                    print(f"Skipping {name} with {len(df)} rows ({df.size} cells > --max-cells)")
+                    continue
+                print(f"{name}: {len(df)} rows x {len(df.columns)} columns", flush=True)
+                results.extend(run_dataset(name, df, repeat, Path(temp_dir)))
+
+    return {
+        "metadata": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "prepo": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    time_threshold: float = 0.2,
+    memory_threshold: float = 0.2,
+    min_seconds: float = 0.005,
+    min_bytes: int = 2**20,
+) -> List[Dict[str, Any]]:
+    """
+    Compare benchmark results with a baseline.
+
+    A stage regresses when its time grows by more than time_threshold (relative) and
+    min_seconds (absolute), or its peak memory by more than memory_threshold and min_bytes.
+    Stages missing from either side or failed in either run are ignored.
+
+    Returns:
+        One row per stage present in both results, with ratios and a regression list
+    """
+
+    def key(record: Dict[str, Any]) -> Tuple[str, int, str]:
+        return record["dataset"], record["rows"], record["stage"]
+
+    base = {key(record): record for record in baseline["results"]}
+    rows = []
+    for record in current["results"]:
+        old: Optional[Dict[str, Any]] = base.get(key(record))
+        if old is None or "error" in old or "error" in record:
+            continue
+
+        time_ratio = record["seconds"] / old["seconds"] if old["seconds"] > 0 else 1.0
+        memory_ratio = record["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] > 0 else 1.0
+        regressions = []
+        if time_ratio > 1 + time_threshold and record["seconds"] - old["seconds"] > min_seconds:
+            regressions.append("time")
+        if memory_ratio > 1 + memory_threshold and record["peak_bytes"] - old["peak_bytes"] > min_bytes:
+            regressions.append("memory")
+
+        rows.append({**record, "time_ratio": time_ratio, "memory_ratio": memory_ratio, "regressions": regressions})
+
+    return rows
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the benchmark command line parser."""
+    parser = argparse.ArgumentParser(description="Benchmark prepo stages")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--datasets", nargs="+", choices=list(DATASETS), default=list(DATASETS))
+    run_parser.add_argument(
+        "--sizes", nargs="+", type=lambda s: int(float(s)), default=DEFAULT_SIZES, help="Row counts, e.g. 1e3 1e6 1e7"
+    )
+    run_parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage (best is kept)")
+    run_parser.add_argument(
+        "--max-cells", type=lambda s: int(float(s)), default=int(1e8), help="Skip tables with more cells than this"
+    )
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--output", "-o", default="benchmark_results.json", help="JSON results file")
+
+    compare_parser = commands.add_parser("compare", help="Compare results with a baseline")
+    compare_parser.add_argument("baseline", help="Baseline JSON results")
+    compare_parser.add_argument("current", help="Current JSON results")
+    compare_parser.add_argument("--time-threshold", type=float, default=0.2, help="Allowed relative slowdown")
+    compare_parser.add_argument("--memory-threshold", type=float, default=0.2, help="Allowed relative memory growth")
+    compare_parser.add_argument("--min-seconds", type=float, default=0.005, help="Ignore slowdowns smaller than this")
+    compare_parser.add_argument(
+        "--min-bytes", type=lambda s: int(float(s)), default=2**20, help="Ignore memory growth smaller than this"
+    )
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Benchmark CLI entry point."""
+    args = create_parser().parse_args(argv)
+
+    if args.command == "run":
+        results = run(args.datasets, args.sizes, args.repeat, args.max_cells, seed=args.seed)
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"Wrote {len(results['results'])} results to {args.output}")
+        return 0
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    current = json.loads(Path(args.current).read_text())
+    rows = compare(baseline, current, args.time_threshold, args.memory_threshold, args.min_seconds, args.min_bytes)
+
+    print(f"{'dataset':<10} {'rows':>9} {'stage':<20} {'time':>7} {'memory':>7}")
+    for row in rows:
+        flag = "  REGRESSION: " + ", ".join(row["regressions"]) if row["regressions"] else ""
+        print(
+            f"{row['dataset']:<10} {row['rows']:>9} {row['stage']:<20} "
+            f"{row['time_ratio']:>6.2f}x {row['memory_ratio']:>6.2f}x{flag}"
+        )
+
+    regressed = [row for row in rows if row["regressions"]]
+    print(f"\n{len(regressed)} of {len(rows)} stages regressed")
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
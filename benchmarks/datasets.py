@@ -0,0 +1,105 @@
+"""
+Synthetic datasets for the prepo benchmarks.
+
+Every generator takes a row count and a seed and returns a pandas DataFrame shaped
+like the raw input prepo sees in practice: numbers stored as strings with null
+tokens, dates as text, free text and categorical columns.
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+WINE_PATH = Path(__file__).resolve().parent.parent / "data" / "raw" / "winequality-white.csv"
+
+
+def _with_tokens(values: np.ndarray, rng: np.random.Generator, fraction: float) -> np.ndarray:
+    """Format numbers as strings and replace a fraction of them with null tokens."""
+    strings = values.round(3).astype(str).astype(object)
+    mask = rng.random(len(values)) < fraction
+    strings[mask] = rng.choice(["?", "NA", "", "error"], size=int(mask.sum()))
+    return strings
+
+
+def tall(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Few columns of mixed types."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "customer_id": np.arange(n_rows),
+            "price": rng.lognormal(3, 1, n_rows).round(2),
+            "rating": rng.random(n_rows),
+            "visits": rng.integers(0, 100, n_rows),
+            "score": rng.normal(50, 10, n_rows),
+            "region": rng.choice(["north", "south", "east", "west"], n_rows),
+            "active": rng.choice(["yes", "no"], n_rows),
+        }
+    )
+
+
+def wide(n_rows: int, seed: int = 0, n_cols: int = 100) -> pd.DataFrame:
+    """Many numeric feature columns."""
+    rng = np.random.default_rng(seed)
+    values = rng.normal(0, 1, size=(n_rows, n_cols))
+    return pd.DataFrame(values, columns=[f"feature_{i}" for i in range(n_cols)])
+
+
+def strings(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Text, categorical and numbers-as-strings columns."""
+    rng = np.random.default_rng(seed)
+    words = np.array(["alpha", "beta", "gamma", "delta", "epsilon", "zeta", "eta", "theta"])
+    return pd.DataFrame(
+        {
+            "category": rng.choice(words[:5], n_rows),
+            "city": rng.choice([f"city_{i}" for i in range(50)], n_rows),
+            "amount": _with_tokens(rng.normal(100, 15, n_rows), rng, 0.01),
+            "quantity": _with_tokens(rng.integers(1, 20, n_rows).astype(float), rng, 0.01),
+            "comment": rng.choice(words, size=(n_rows, 12)).tolist(),
+        }
+    ).assign(comment=lambda df: df["comment"].str.join(" "))
+
+
+def dates(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Date and timestamp columns in several text formats."""
+    rng = np.random.default_rng(seed)
+    days = pd.Timestamp("2000-01-01") + pd.to_timedelta(rng.integers(0, 9000, n_rows), unit="D")
+    seconds = pd.to_timedelta(rng.integers(0, 86400, n_rows), unit="s")
+    return pd.DataFrame(
+        {
+            "iso_date": days.strftime("%Y-%m-%d"),
+            "timestamp": (days + seconds).strftime("%Y-%m-%d %H:%M:%S"),
+            "us_date": days.strftime("%m/%d/%Y"),
+            "eu_date": days.strftime("%d.%m.%Y"),
+            "value": rng.normal(0, 1, n_rows),
+        }
+    )
+
+
+def na_heavy(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Numeric columns with 30% missing values and null tokens."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({f"measure_{i}": rng.normal(i, 1 + i, n_rows) for i in range(6)})
+    df = df.mask(rng.random(df.shape) < 0.3)
+    df["reading"] = _with_tokens(rng.normal(10, 2, n_rows), rng, 0.3)
+    df["group"] = rng.choice(["a", "b", "c"], n_rows)
+    return df
+
+
+def wine(n_rows: Optional[int] = None, seed: int = 0) -> pd.DataFrame:
+    """Return the bundled wine quality dataset, resampled with replacement to n_rows if given."""
+    df = pd.read_csv(WINE_PATH, sep=";")
+    if n_rows is None or n_rows == len(df):
+        return df
+    return df.sample(n_rows, replace=n_rows > len(df), random_state=seed).reset_index(drop=True)
+
+
+DATASETS: Dict[str, Callable[..., pd.DataFrame]] = {
+    "tall": tall,
+    "wide": wide,
+    "strings": strings,
+    "dates": dates,
+    "na_heavy": na_heavy,
+    "wine": wine,
+}
@@ -0,0 +1,127 @@
+"""
+Startup time budgets for the prepo package and CLI.
+
+Usage:
+  python -m benchmarks.startup
+  python -m benchmarks.startup --repeat 10 --import-budget 0.3 --help-budget 0.5
+
+Each target runs in a fresh interpreter; the best wall time of --repeat runs is
+compared with its budget, net of the time a bare interpreter takes to start. The
+command exits with status 1 when a budget is exceeded or a heavy dependency
+(pandas, scikit-learn, SciPy, Polars, PyArrow) is imported at startup.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["pandas", "sklearn", "scipy", "polars", "pyarrow"]
+
+# Code run by each target; it prints the heavy modules it imported as JSON
+TARGETS = {
+    "bare": "",
+    "import": "import src.prepo",
+    "help": (
+        "import sys\n"
+        "from src.prepo.cli import main\n"
+        "sys.argv = ['prepo', '--help']\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    ),
+}
+
+# Budgets in seconds above the bare interpreter start-up
+DEFAULT_BUDGETS = {"import": 0.5, "help": 0.5}
+
+_REPORT = "\nimport json, sys\nprint(json.dumps([m for m in {modules!r} if m in sys.modules]), file=sys.stderr)\n"
+
+
+def time_target(code: str, repeat: int) -> Dict[str, Any]:
+    """
+    Run code in fresh interpreters.
+
+    Args:
+        code: Python code to run
+        repeat: Number of runs (the best is kept)
+
+    Returns:
+        Dictionary with the best wall time in seconds and the heavy modules imported
+    """
+    best = float("inf")
+    loaded: List[str] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", code + _REPORT.format(modules=HEAVY_MODULES)],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        best = min(best, time.perf_counter() - start)
+        loaded = json.loads(result.stderr.strip().splitlines()[-1])
+
+    return {"seconds": best, "heavy_modules": loaded}
+
+
+def check(repeat: int = 5, budgets: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    """
+    Measure every target and compare it with its budget.
+
+    Returns:
+        One row per target with its time above the bare interpreter, budget and failures
+    """
+    budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+    bare = time_target(TARGETS["bare"], repeat)["seconds"]
+
+    rows = []
+    for name, budget in budgets.items():
+        measured = time_target(TARGETS[name], repeat)
+        seconds = max(measured["seconds"] - bare, 0.0)
+        failures = []
+        if seconds > budget:
+            failures.append("time")
+        if measured["heavy_modules"]:
+            failures.append("imports")
+        rows.append(
+            {
+                "target": name,
+                "seconds": seconds,
+                "budget": budget,
+                "heavy_modules": measured["heavy_modules"],
+                "failures": failures,
+            }
+        )
+
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Startup benchmark CLI entry point."""
+    parser = argparse.ArgumentParser(description="Check prepo startup time budgets")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per target (best is kept)")
+    parser.add_argument("--import-budget", type=float, default=DEFAULT_BUDGETS["import"], help="Seconds for import")
+    parser.add_argument("--help-budget", type=float, default=DEFAULT_BUDGETS["help"], help="Seconds for prepo --help")
+    args = parser.parse_args(argv)
+
+    rows = check(args.repeat, {"import": args.import_budget, "help": args.help_budget})
+
+    print(f"{'target':<8} {'time (ms)':>10} {'budget (ms)':>12}  heavy modules")
+    for row in rows:
+        flag = "  FAILED: " + ", ".join(row["failures"]) if row["failures"] else ""
+        modules = ", ".join(row["heavy_modules"]) or "-"
+        print(f"{row['target']:<8} {row['seconds'] * 1000:10.1f} {row['budget'] * 1000:12.1f}  {modules}{flag}")
+
+    return 1 if any(row["failures"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,27 +6,86 @@ KNN imputation, outlier removal, and multiple scaling methods.
 
 Features:
 - Automated data type detection with type-safe enums
-- KNN imputation for missing values
+- Multivariate KNN, median or grouped-median imputation for missing values
 - Multiple scaling methods (standard, robust, minmax)
 - Outlier removal using IQR method
+- Fit/transform split with a JSON-serializable fitted state
+- Chunked streaming mode for files larger than memory
+- Per-stage timing and memory instrumentation hooks
+- Opt-in datatype detection cache keyed by schema fingerprint
+- Optional dtype downcasting stage with a per-column memory report
 - CLI tool supporting 8+ file formats
+- Native Polars backend for polars DataFrames and LazyFrames
+- Arrow backend processing pyarrow Tables without a pandas round trip
 - Optional Polars/PyArrow optimizations
 - Modular architecture for programmatic and command-line usage
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 from .cli import main as cli_main
-from .io import FileReader, FileWriter
-from .preprocessor import FeaturePreProcessor
-from .types import DataType, DataTypeDict, FileFormat, ScalerType
+from .types import DataType, DataTypeDict, FileFormat, ImputeStrategy, ParallelBackend, SamplingMethod, ScalerType
+
+if TYPE_CHECKING:
+    from .arrow_backend import ArrowBackend
+    from .cache import DatatypeCache
+    from .dtypes import DtypeReport
+    from .instrumentation import StageCollector, StageMetrics
+    from .io import FileReader, FileWriter
+    from .polars_backend import PolarsBackend
+    from .preprocessor import FeaturePreProcessor
+    from .state import FittedState
+    from .streaming import ChunkedProcessor
+
+# Public names loaded on first access, so `import prepo` does not import pandas,
+# scikit-learn, SciPy, Polars or PyArrow until they are needed
+_LAZY_IMPORTS = {
+    "FeaturePreProcessor": ".preprocessor",
+    "FittedState": ".state",
+    "ChunkedProcessor": ".streaming",
+    "PolarsBackend": ".polars_backend",
+    "ArrowBackend": ".arrow_backend",
+    "StageCollector": ".instrumentation",
+    "StageMetrics": ".instrumentation",
+    "DatatypeCache": ".cache",
+    "DtypeReport": ".dtypes",
+    "FileReader": ".io",
+    "FileWriter": ".io",
+}
 
 __version__ = "0.2.0"
 __all__ = [
     "FeaturePreProcessor",
+    "FittedState",
+    "ChunkedProcessor",
+    "PolarsBackend",
+    "ArrowBackend",
+    "StageCollector",
+    "StageMetrics",
+    "DatatypeCache",
+    "DtypeReport",
     "DataType",
     "ScalerType",
+    "ImputeStrategy",
+    "ParallelBackend",
+    "SamplingMethod",
     "FileFormat",
     "DataTypeDict",
     "FileReader",
     "FileWriter",
     "cli_main",
 ]
+
+
+def __getattr__(name: str):
+    """Import lazily loaded public names on first access."""
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,279 @@
+"""
+Arrow execution backend for the prepo package.
+
+This module contains the ArrowBackend class, which runs the FeaturePreProcessor
+pipeline on pyarrow Tables. Cleaning, outlier removal and scaling use pyarrow.compute
+kernels on the column buffers, and columns a stage does not change are shared with
+its input, so a Parquet, Feather or ORC file can be read, processed and written
+without converting the data to pandas.
+"""
+
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .dependencies import HAS_PYARROW
+from .imputation import NumericImputer
+from .types import DataType, DataTypeDict, ImputeStrategy, ScalerType
+
+if TYPE_CHECKING:
+    from .preprocessor import FeaturePreProcessor
+
+# This module is imported on first use, so pyarrow is only loaded when it is needed
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+
+class ArrowBackend:
+    """
+    PyArrow implementation of determine_datatypes, clean_data, clean_outliers, scaler and process.
+
+    Datatypes are decided on the same row sample as the pandas path (only the sampled rows
+    are converted to pandas), so both backends detect identical types. Numeric strings are
+    parsed column by column and imputation hands the numeric block to NumericImputer;
+    everything else runs on Arrow arrays and returns a new Table that shares its unchanged
+    columns with the input.
+    """
+
+    def __init__(self, processor: "FeaturePreProcessor"):
+        """
+        Initialize the ArrowBackend.
+
+        Args:
+            processor: FeaturePreProcessor providing the detection rules and settings
+        """
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow is required for the Arrow backend. Install it with: pip install pyarrow")
+        self.processor = processor
+
+    def determine_datatypes(self, table: "pa.Table") -> DataTypeDict:
+        """
+        Determine the data type of each column.
+
+        Args:
+            table: pyarrow Table
+
+        Returns:
+            Dictionary mapping column names to their inferred data types
+        """
+        sample_size = min(self.processor.sample_size, table.num_rows)
+
+        if sample_size > 100:
+            # The rows pandas' df.sample(sample_size, random_state=42) would pick
+            positions = np.random.RandomState(42).choice(table.num_rows, size=sample_size, replace=False)
+            table = table.take(pa.array(positions))
+
+        return self.processor.determine_datatypes(table.to_pandas())
+
+    def _replace(self, table: "pa.Table", columns: Dict[str, "pa.ChunkedArray"]) -> "pa.Table":
+        """Return a table with the given columns replaced, sharing every other column."""
+        if not columns:
+            return table
+        for col, values in columns.items():
+            table = table.set_column(table.schema.get_field_index(col), col, values)
+        # The pandas metadata still describes the replaced columns' old dtypes
+        return table.replace_schema_metadata(None)
+
+    def _to_number(self, values: "pa.ChunkedArray") -> "pa.ChunkedArray":
+        """Parse a string column as float64, turning unparseable values into nulls."""
+        # pyarrow's cast has no coercing mode, so the strings are parsed as pd.to_numeric would
+        parsed = pd.to_numeric(pd.Series(values.to_numpy(zero_copy_only=False)).str.strip(), errors="coerce")
+        return pa.chunked_array([pa.array(parsed.to_numpy(dtype=float), from_pandas=True)])
+
+    def _is_text(self, data_type: "pa.DataType") -> bool:
+        """Check if an Arrow type holds strings."""
+        return bool(pa.types.is_string(data_type) or pa.types.is_large_string(data_type))
+
+    def _normalize(self, table: "pa.Table", datatypes: DataTypeDict) -> "pa.Table":
+        """Standardize null representations and convert numeric columns to numeric types."""
+        from .preprocessor import NUMERIC_TYPES
+
+        null_tokens = pa.array(self.processor.null_values, type=pa.string())
+        replaced = {}
+        for field in table.schema:
+            col, values = field.name, table.column(field.name)
+
+            if pa.types.is_dictionary(field.type) and self._is_text(field.type.value_type):
+                # Parquet files written from pandas categoricals read back dictionary-encoded
+                value_type = field.type.value_type
+                is_token = pc.is_in(values, value_set=null_tokens.cast(value_type))
+                is_numeric = datatypes[col] in NUMERIC_TYPES
+                if is_numeric or pc.any(is_token).as_py():
+                    decoded = pc.if_else(is_token, pa.scalar(None, type=value_type), values.cast(value_type))
+                    values = self._to_number(decoded) if is_numeric else decoded.dictionary_encode()
+            elif self._is_text(field.type):
+                is_token = pc.is_in(values, value_set=null_tokens.cast(field.type))
+                if pc.any(is_token).as_py():
+                    values = pc.if_else(is_token, pa.scalar(None, type=field.type), values)
+                if datatypes[col] in NUMERIC_TYPES:
+                    values = self._to_number(values)
+            elif pa.types.is_floating(field.type) and pc.any(pc.is_nan(values)).as_py():
+                # NaN counts as missing, as in pandas
+                values = pc.if_else(pc.is_nan(values), pa.scalar(None, type=field.type), values)
+
+            if values is not table.column(col):
+                replaced[col] = values
+
+        return self._replace(table, replaced)
+
+    def _valid_mask(self, table: "pa.Table", columns: List[str]) -> Optional["pa.ChunkedArray"]:
+        """Return a mask that is True for rows without nulls in the given columns."""
+        mask = None
+        for col in columns:
+            if table.column(col).null_count:
+                valid = pc.is_valid(table.column(col))
+                mask = valid if mask is None else pc.and_(mask, valid)
+        return mask
+
+    def _filter(self, table: "pa.Table", mask: Optional["pa.ChunkedArray"]) -> "pa.Table":
+        """Keep the rows where mask is True; the table is returned as it is if no row is removed."""
+        if mask is None or pc.all(mask).as_py():
+            return table
+        return table.filter(mask)
+
+    def _clean(self, table: "pa.Table", datatypes: DataTypeDict, drop_na: bool) -> "pa.Table":
+        """Normalize and drop or impute missing values."""
+        from .preprocessor import NUMERIC_TYPES
+
+        table = self._normalize(table, datatypes)
+        if drop_na:
+            return self._filter(table, self._valid_mask(table, table.column_names))
+
+        columns = table.column_names
+        numeric_cols = [col for col in columns if datatypes[col] in NUMERIC_TYPES]
+        categorical_cols = [col for col in columns if datatypes[col] == DataType.CATEGORICAL]
+        other_cols = [col for col in columns if col not in numeric_cols and col not in categorical_cols]
+
+        table = self._filter(table, self._valid_mask(table, other_cols))
+
+        strategy = self.processor.impute_strategy
+        missing_numeric = [col for col in numeric_cols if table.column(col).null_count]
+        if missing_numeric:
+            block = pd.DataFrame({col: table.column(col).to_numpy(zero_copy_only=False) for col in numeric_cols}, dtype=float)
+            groups = None
+            if strategy == ImputeStrategy.GROUPED_MEDIAN:
+                group_by = self.processor.impute_group_by or next(iter(categorical_cols), None)
+                if group_by is not None:
+                    groups = pd.Series(table.column(group_by).to_numpy(zero_copy_only=False))
+            imputer = NumericImputer(strategy, n_neighbors=self.processor.n_neighbors)
+            filled = imputer.fit_transform(block, groups=groups)
+            table = self._replace(
+                table, {col: pa.chunked_array([pa.array(filled[col].to_numpy(), from_pandas=True)]) for col in numeric_cols}
+            )
+
+        replaced = {}
+        for col in categorical_cols:
+            values = table.column(col)
+            if values.null_count and len(values) > values.null_count:
+                if pa.types.is_dictionary(values.type):
+                    decoded = values.cast(values.type.value_type)
+                    replaced[col] = pc.fill_null(decoded, self._mode(decoded)).dictionary_encode()
+                else:
+                    replaced[col] = pc.fill_null(values, self._mode(values))
+        return self._replace(table, replaced)
+
+    def _mode(self, values: "pa.ChunkedArray") -> "pa.Scalar":
+        """Return the most frequent non-null value, the smallest one on ties (as pandas' mode()[0])."""
+        counts = pc.value_counts(values.drop_null())
+        most = pc.equal(counts.field("counts"), pc.max(counts.field("counts")))
+        return pc.min(pc.filter(counts.field("values"), most))
+
+    def _quartiles(self, values: "pa.ChunkedArray") -> Optional[Tuple[float, float]]:
+        """Return the linearly interpolated first and third quartiles of a column (None if it has no values)."""
+        q1, q3 = pc.quantile(values, q=[0.25, 0.75], interpolation="linear").to_pylist()
+        return None if q1 is None else (q1, q3)
+
+    def _outlier_mask(self, table: "pa.Table", col: str) -> "pa.ChunkedArray":
+        """Return a mask that is True for values within the column's IQR bounds."""
+        values = table.column(col)
+        quartiles = self._quartiles(values)
+        if quartiles is None:
+            return pc.is_valid(values)
+        q1, q3 = quartiles
+        iqrv = q3 - q1
+        return pc.and_(pc.greater_equal(values, q1 - 1.5 * iqrv), pc.less_equal(values, q3 + 1.5 * iqrv))
+
+    def _filter_outliers(self, table: "pa.Table", datatypes: DataTypeDict, sequential: bool) -> "pa.Table":
+        """Remove outliers with IQR bounds computed by pyarrow.compute."""
+        cols = [col for col in table.column_names if self.processor._is_outlier_column(col, datatypes[col])]
+        if not cols:
+            return table
+
+        if sequential:
+            # Each filter computes its quartiles on the rows kept by the previous one
+            for col in cols:
+                table = self._filter(table, self._outlier_mask(table, col))
+            return table
+
+        mask = self._outlier_mask(table, cols[0])
+        for col in cols[1:]:
+            mask = pc.and_(mask, self._outlier_mask(table, col))
+        return self._filter(table, mask)
+
+    def _scale_params(self, values: "pa.ChunkedArray", scaler_type: ScalerType) -> Optional[Tuple[float, float]]:
+        """Return the (center, scale) pair of a column for a scaler type (None if it has no values)."""
+        if values.null_count == len(values):
+            return None
+        if scaler_type == ScalerType.STANDARD:
+            return pc.mean(values).as_py(), pc.stddev(values, ddof=1).as_py()
+        if scaler_type == ScalerType.ROBUST:
+            q1, median, q3 = pc.quantile(values, q=[0.25, 0.5, 0.75], interpolation="linear").to_pylist()
+            return median, q3 - q1
+        bounds = pc.min_max(values)
+        return bounds["min"].as_py(), bounds["max"].as_py() - bounds["min"].as_py()
+
+    def _scale(
+        self, table: "pa.Table", scaler_type: ScalerType, datatypes: Optional[Mapping[str, Union[DataType, str]]]
+    ) -> "pa.Table":
+        """Scale the scalable columns."""
+        if scaler_type == ScalerType.NONE or datatypes is None or table.num_rows == 0:
+            return table
+
+        replaced = {}
+        for col in self.processor._scalable_columns(table.column_names, datatypes):
+            values = table.column(col).cast(pa.float64())
+            params = self._scale_params(values, scaler_type)
+            if params is None:
+                continue
+            center, scale = params
+            values = pc.subtract(values, center)
+            replaced[col] = values if not scale else pc.divide(values, scale)
+        return self._replace(table, replaced)
+
+    def clean_data(self, table: "pa.Table", drop_na: bool = True) -> Tuple["pa.Table", DataTypeDict]:
+        """Arrow version of FeaturePreProcessor.clean_data."""
+        datatypes = self.determine_datatypes(table)
+        return self._clean(table, datatypes, drop_na), datatypes
+
+    def clean_outliers(self, table: "pa.Table", dt: DataTypeDict, sequential: bool = True) -> "pa.Table":
+        """Arrow version of FeaturePreProcessor.clean_outliers."""
+        return self._filter_outliers(table, dt, sequential)
+
+    def scaler(
+        self,
+        table: "pa.Table",
+        scaler_type: ScalerType,
+        datatypes: Optional[Dict[str, Union[DataType, str]]] = None,
+    ) -> "pa.Table":
+        """Arrow version of FeaturePreProcessor.scaler; returns the scaled table."""
+        return self._scale(table, scaler_type, datatypes)
+
+    def process(
+        self,
+        table: "pa.Table",
+        drop_na: bool,
+        scaler_type: ScalerType,
+        remove_outlier: bool,
+        sequential_outliers: bool,
+    ) -> "pa.Table":
+        """Arrow version of FeaturePreProcessor.process."""
+        datatypes = self.determine_datatypes(table)
+        table = self._clean(table, datatypes, drop_na)
+        if remove_outlier:
+            table = self._filter_outliers(table, datatypes, sequential_outliers)
+        return self._scale(table, scaler_type, datatypes)
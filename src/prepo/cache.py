@@ -0,0 +1,196 @@
+"""
+Datatype detection cache for the prepo package.
+
+This module contains the DatatypeCache class, an LRU cache of determine_datatypes
+results keyed by a schema fingerprint, with optional persistence to a JSON file so
+repeat batches with the same schema skip detection entirely.
+"""
+
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .types import DataType, DataTypeDict
+
+CACHE_VERSION = 1
+
+# Values classified by the content sketch
+_NUMBER = re.compile(r"^\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*$")
+_DATE_LIKE = re.compile(r"\d[-/.:]\d|\d\s+[A-Za-z]{3}|[A-Za-z]{3}\s+\d")
+
+
+def _value_class(value: Any) -> str:
+    """Classify a non-missing value as number, date-like, long text or text."""
+    text = str(value)
+    if _NUMBER.match(text):
+        return "number"
+    if _DATE_LIKE.search(text):
+        return "date"
+    return "long_text" if len(text) > 100 else "text"
+
+
+class DatatypeCache:
+    """
+    LRU cache of detected datatypes keyed by schema fingerprint.
+
+    The fingerprint combines the column names, their dtypes and a cheap content sketch
+    of up to probe_size evenly spaced rows: for each column whether it has missing values,
+    up to three distinct values, and either the [0, 1] range and integrality of numbers
+    or the classes (number, date-like, text, long text) of other values. Batches with the
+    same schema and value shapes share one entry; call invalidate or clear after changing
+    detection rules or when a batch was misdetected.
+
+    Example:
+        cache = DatatypeCache(maxsize=64, path="datatypes_cache.json")
+        processor = FeaturePreProcessor(datatype_cache=cache)
+    """
+
+    def __init__(self, maxsize: int = 128, path: Optional[Union[str, Path]] = None, probe_size: int = 64):
+        """
+        Initialize the DatatypeCache.
+
+        Args:
+            maxsize: Maximum number of cached schemas; the least recently used is evicted
+            path: JSON file the cache is loaded from (if it exists) and saved to on every change
+            probe_size: Number of rows sketched per fingerprint
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive number of entries")
+
+        self.maxsize = maxsize
+        self.path = Path(path) if path is not None else None
+        self.probe_size = probe_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, DataTypeDict]" = OrderedDict()
+
+        if self.path is not None and self.path.exists():
+            self._load(self.path)
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        """Check if a fingerprint has a cached entry."""
+        return key in self._entries
+
+    def fingerprint(self, df: pd.DataFrame) -> str:
+        """
+        Compute the schema fingerprint of a dataframe.
+
+        Args:
+            df: DataFrame to fingerprint
+
+        Returns:
+            Hex digest identifying the column names, dtypes and content sketch
+        """
+        n_rows = len(df)
+        positions = np.unique(np.linspace(0, n_rows - 1, num=min(self.probe_size, n_rows)).astype(int))
+        probe = df.iloc[positions]
+
+        schema: List[Any] = []
+        for col in probe.columns:
+            series = probe[col]
+            values = series.dropna()
+            sketch: List[Any] = [str(col), str(series.dtype), bool(len(values) < len(series)), min(values.nunique(), 3)]
+
+            if pd.api.types.is_bool_dtype(series):
+                pass
+            elif pd.api.types.is_numeric_dtype(series):
+                numbers = values.to_numpy(dtype=float)
+                in_range = bool(len(numbers) and (numbers >= 0).all() and (numbers <= 1).all())
+                sketch += [in_range, bool(np.all(np.mod(numbers, 1) == 0))]
+            else:
+                sketch.append(sorted({_value_class(value) for value in values}))
+
+            schema.append(sketch)
+
+        return hashlib.sha1(json.dumps(schema, default=str).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[DataTypeDict]:
+        """
+        Look up cached datatypes.
+
+        Args:
+            key: Fingerprint returned by fingerprint
+
+        Returns:
+            A copy of the cached datatypes, or None if the key is not cached
+        """
+        datatypes = self._entries.get(key)
+        if datatypes is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return dict(datatypes)
+
+    def put(self, key: str, datatypes: DataTypeDict) -> None:
+        """
+        Store datatypes, evicting the least recently used entry when full.
+
+        Args:
+            key: Fingerprint returned by fingerprint
+            datatypes: Detected datatypes
+        """
+        self._entries[key] = dict(datatypes)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        self._save()
+
+    def invalidate(self, df: Optional[pd.DataFrame] = None, key: Optional[str] = None) -> bool:
+        """
+        Remove the entry of a dataframe or fingerprint.
+
+        Args:
+            df: DataFrame whose entry should be removed
+            key: Fingerprint whose entry should be removed
+
+        Returns:
+            True if an entry was removed
+        """
+        if key is None:
+            if df is None:
+                raise ValueError("Pass a dataframe or a fingerprint to invalidate")
+            key = self.fingerprint(df)
+
+        removed = self._entries.pop(key, None) is not None
+        if removed:
+            self._save()
+        return removed
+
+    def clear(self) -> None:
+        """Remove all entries (and from the cache file, if any)."""
+        self._entries.clear()
+        self._save()
+
+    def _save(self) -> None:
+        """Write the entries to the cache file, least recently used first."""
+        if self.path is None:
+            return
+
+        entries = [[key, {col: dtype.value for col, dtype in dts.items()}] for key, dts in self._entries.items()]
+        data = {"version": CACHE_VERSION, "entries": entries}
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    def _load(self, path: Path) -> None:
+        """Read the entries from a cache file."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        version = data.get("version")
+        if version != CACHE_VERSION:
+            raise ValueError(f"Unsupported cache version: {version} (expected {CACHE_VERSION})")
+
+        for key, datatypes in data["entries"][-self.maxsize :]:
+            self._entries[key] = {col: DataType(value) for col, value in datatypes.items()}
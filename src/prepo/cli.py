@@ -6,16 +6,25 @@ Polars/PyArrow optimizations for high-performance data preprocessing.
 """
 
 import argparse
+import glob
 import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, cast
 
-import pandas as pd
-
-from .io import FileReader, FileWriter
-from .preprocessor import FeaturePreProcessor
 from .types import FileFormat, ScalerType
 
+# pandas and the processing modules are imported by the commands that use them,
+# so that `prepo --help` and argument errors return without loading them
+if TYPE_CHECKING:
+    import polars as pl
+
+    from .io import FileReader, FileWriter
+    from .state import FittedState
+
+# Formats read straight into pyarrow Tables with --pyarrow
+ARROW_FORMATS = [FileFormat.PARQUET, FileFormat.FEATHER, FileFormat.ORC]
+
 
 def create_parser() -> argparse.ArgumentParser:
     """Create and configure the argument parser."""
@@ -29,6 +38,14 @@ Examples:
   prepo input.json output.parquet --no-outliers --keep-na  # Keep outliers and NA values
   prepo input.csv output.feather --polars      # Use Polars for high performance
   prepo input.tsv output.xlsx --pyarrow        # Use PyArrow optimizations
+  prepo big.csv output.csv --chunksize 100000  # Stream files larger than memory
+  prepo cache.feather out.feather --mmap       # Memory-map a large Feather file
+  prepo in.parquet out.csv --columns a,b --filter "date >= 2024-01-01"  # Read a subset
+  prepo "data/*.csv" out/ --workers 8          # Batch mode: process many files in parallel
+  prepo data/ out/ --fit-on data/ref.csv       # Fit once on a reference file, apply to all
+  prepo big.csv out.parquet --chunksize 500000 --pipeline --workers 4  # Overlap read, process, write
+  prepo inspect big.csv --min-frequency 0.001  # Detect column types from a sample of rows
+  prepo in.csv out/ --partition-by region --compression zstd --workers 4  # Partitioned Parquet dataset
 
 Supported formats:
   Input/Output: CSV, JSON, Excel (.xlsx/.xls), Parquet, Feather, TSV, Pickle, ORC
@@ -36,8 +53,8 @@ Supported formats:
     )
 
     # Input/Output arguments
-    parser.add_argument("input", help="Input file path")
-    parser.add_argument("output", help="Output file path")
+    parser.add_argument("input", help="Input file path, or a glob pattern or directory for batch mode")
+    parser.add_argument("output", help="Output file path, or the output directory in batch mode")
 
     # Processing options
     parser.add_argument(
@@ -56,6 +73,84 @@ Supported formats:
 
     parser.add_argument("--pyarrow", action="store_true", help="Use PyArrow for optimized I/O operations (if available)")
 
+    parser.add_argument(
+        "--mmap", action="store_true", help="Memory-map Feather/Arrow IPC and Parquet input instead of reading it into memory"
+    )
+
+    parser.add_argument(
+        "--no-copy",
+        action="store_true",
+        help="Filter rows once and scale in place to keep peak memory close to the input size",
+    )
+
+    parser.add_argument(
+        "--optimize-dtypes",
+        action="store_true",
+        help="Downcast output columns to compact dtypes (small ints, bool, category) and report the bytes saved",
+    )
+
+    parser.add_argument(
+        "--float32-tolerance",
+        type=float,
+        metavar="TOL",
+        help="With --optimize-dtypes, store float columns as float32 if no value changes by more than TOL",
+    )
+
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        help="Stream the input in chunks of this many rows so memory use does not grow with file size",
+    )
+
+    # Projection and filtering
+    parser.add_argument("--columns", help="Comma-separated columns to read (default: all columns)")
+
+    parser.add_argument(
+        "--filter",
+        action="append",
+        metavar="EXPR",
+        help="Keep rows matching an expression such as 'year >= 2020' (repeatable; all must match)",
+    )
+
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="With --chunksize, read, process and write chunks concurrently (--workers sets the processing threads)",
+    )
+
+    # Parquet layout options
+    parser.add_argument(
+        "--partition-by",
+        metavar="COLS",
+        help="Write a Hive-partitioned Parquet dataset to the output directory, one part per value of "
+        "these comma-separated columns",
+    )
+
+    parser.add_argument(
+        "--compression",
+        choices=["zstd", "lz4", "snappy", "gzip", "brotli", "none"],
+        help="Parquet compression codec (default: snappy)",
+    )
+
+    parser.add_argument("--compression-level", type=int, metavar="LEVEL", help="Level of the --compression codec")
+
+    parser.add_argument("--row-group-size", type=int, metavar="ROWS", help="Target rows per Parquet row group")
+
+    parser.add_argument(
+        "--row-group-mb", type=float, metavar="MB", help="Target in-memory size per Parquet row group in megabytes"
+    )
+
+    # Batch mode options
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes in batch mode, processing threads with --pipeline, or partitions "
+        "written concurrently with --partition-by (default: 1)",
+    )
+
+    parser.add_argument("--fit-on", help="Batch mode: fit once on this reference file and apply the fit to every input file")
+
     # File format options
     parser.add_argument(
         "--input-format",
@@ -71,7 +166,7 @@ Supported formats:
 
     # Additional options
     parser.add_argument(
-        "--info", action="store_true", help="Display information about detected data types and processing steps"
+        "--info", action="store_true", help="Display detected data types and a per-stage time and memory breakdown"
     )
 
     parser.add_argument("--version", action="version", version="prepo 0.2.0")
@@ -79,8 +174,98 @@ Supported formats:
     return parser
 
 
+def create_inspect_parser() -> argparse.ArgumentParser:
+    """Create the argument parser of the inspect command."""
+    parser = argparse.ArgumentParser(
+        prog="prepo inspect",
+        description="Detect the data type of each column from a sample of the rows of a file",
+    )
+
+    parser.add_argument("input", help="Input file path")
+
+    parser.add_argument("--sample-size", type=int, default=1000, help="Number of rows sampled (default: 1000)")
+
+    parser.add_argument(
+        "--min-frequency",
+        type=float,
+        metavar="P",
+        help="Size the sample so a pattern in this fraction of the rows is seen with --confidence (overrides --sample-size)",
+    )
+
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.99,
+        help="Probability of seeing a pattern as frequent as --min-frequency (default: 0.99)",
+    )
+
+    parser.add_argument(
+        "--sampling",
+        choices=["stratified", "reservoir"],
+        default="stratified",
+        help="Stratified spreads the sample over the whole file and reads only the sampled parts of CSV "
+        "and Parquet files; reservoir reads the file once for a uniform sample (default: stratified)",
+    )
+
+    parser.add_argument("--strata", type=int, default=10, help="Number of position strata (default: 10)")
+
+    parser.add_argument(
+        "--chunksize", type=int, default=100_000, help="Rows read at a time when the file is streamed (default: 100000)"
+    )
+
+    parser.add_argument(
+        "--input-format",
+        choices=["csv", "json", "excel", "xlsx", "xls", "parquet", "feather", "pickle", "tsv", "orc"],
+        help="Explicitly specify input file format (auto-detected if not provided)",
+    )
+
+    return parser
+
+
+def is_batch_input(path: str) -> bool:
+    """Check if an input argument is a directory or a glob pattern."""
+    return Path(path).is_dir() or any(char in path for char in "*?[")
+
+
+def expand_inputs(path: str) -> List[Path]:
+    """
+    Expand a batch input into the files to process.
+
+    Args:
+        path: Directory (its files with a supported extension) or glob pattern
+
+    Returns:
+        Sorted list of input files
+    """
+    if Path(path).is_dir():
+        suffixes = {f".{fmt.value}" for fmt in FileFormat} | {".pkl"}
+        return sorted(p for p in Path(path).iterdir() if p.is_file() and p.suffix.lower() in suffixes)
+    return sorted(Path(p) for p in glob.glob(path, recursive=True) if Path(p).is_file())
+
+
+def batch_root(path: str) -> Path:
+    """Return the directory batch outputs are named relative to: the input directory or the glob's fixed prefix."""
+    if Path(path).is_dir():
+        return Path(path)
+    parts = Path(path).parts
+    fixed = next(i for i, part in enumerate(parts) if any(char in part for char in "*?["))
+    return Path(*parts[:fixed]) if fixed else Path(".")
+
+
 def validate_args(args) -> None:
     """Validate command line arguments."""
+    if getattr(args, "workers", 1) <= 0:
+        print("Error: --workers must be a positive number of processes", file=sys.stderr)
+        sys.exit(1)
+
+    if is_batch_input(args.input):
+        validate_batch_args(args)
+        return
+
+    if getattr(args, "fit_on", None):
+        print("Error: --fit-on requires a glob pattern or directory as input", file=sys.stderr)
+        sys.exit(1)
+
     # Check input file exists
     input_path = Path(args.input)
     if not input_path.exists():
@@ -93,30 +278,464 @@ def validate_args(args) -> None:
         print(f"Error: Output directory '{output_path.parent}' does not exist", file=sys.stderr)
         sys.exit(1)
 
+    if args.chunksize is not None and args.chunksize <= 0:
+        print("Error: --chunksize must be a positive number of rows", file=sys.stderr)
+        sys.exit(1)
+
+    if args.chunksize is not None and (getattr(args, "columns", None) or getattr(args, "filter", None)):
+        print("Error: --columns and --filter are not supported with --chunksize", file=sys.stderr)
+        sys.exit(1)
+
+    if args.chunksize is None and getattr(args, "pipeline", False):
+        print("Error: --pipeline requires --chunksize", file=sys.stderr)
+        sys.exit(1)
+
+    if args.chunksize is not None and getattr(args, "optimize_dtypes", False):
+        print("Error: --optimize-dtypes is not supported with --chunksize", file=sys.stderr)
+        sys.exit(1)
+
+    if args.chunksize is not None and getattr(args, "partition_by", None):
+        print("Error: --partition-by is not supported with --chunksize", file=sys.stderr)
+        sys.exit(1)
+
+    validate_filters(args)
+    validate_optimize_args(args)
+    validate_parquet_args(args)
+
+
+def validate_filters(args) -> None:
+    """Validate the --filter expressions."""
+    if not getattr(args, "filter", None):
+        return
+
+    from .io import parse_filter
+
+    for expression in args.filter:
+        try:
+            parse_filter(expression)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+
+def validate_optimize_args(args) -> None:
+    """Validate the dtype optimization options."""
+    tolerance = getattr(args, "float32_tolerance", None)
+    if tolerance is not None and not getattr(args, "optimize_dtypes", False):
+        print("Error: --float32-tolerance requires --optimize-dtypes", file=sys.stderr)
+        sys.exit(1)
+
+    if tolerance is not None and tolerance < 0:
+        print("Error: --float32-tolerance must not be negative", file=sys.stderr)
+        sys.exit(1)
+
+    if getattr(args, "optimize_dtypes", False) and getattr(args, "polars", False):
+        print("Error: --optimize-dtypes is not supported with --polars", file=sys.stderr)
+        sys.exit(1)
+
+
+def validate_parquet_args(args) -> None:
+    """Validate the Parquet layout options."""
+    partition_by = getattr(args, "partition_by", None)
+    layout = [getattr(args, name, None) for name in ["compression", "compression_level", "row_group_size", "row_group_mb"]]
+    if not partition_by and all(option is None for option in layout):
+        return
+
+    from .dependencies import HAS_PYARROW
+
+    if not HAS_PYARROW:
+        print("Error: Parquet layout options require pyarrow. Install it with: pip install pyarrow", file=sys.stderr)
+        sys.exit(1)
+
+    output_format = args.output_format or Path(args.output).suffix.lstrip(".").lower()
+    if partition_by and args.output_format not in [None, "parquet"]:
+        print("Error: --partition-by writes a Parquet dataset; use --output-format parquet", file=sys.stderr)
+        sys.exit(1)
+    if not partition_by and output_format != "parquet" and not is_batch_input(args.input):
+        print("Error: --compression and --row-group-* options require Parquet output", file=sys.stderr)
+        sys.exit(1)
+
+    if args.compression_level is not None and args.compression is None:
+        print("Error: --compression-level requires --compression", file=sys.stderr)
+        sys.exit(1)
+
+    if args.row_group_size is not None and args.row_group_mb is not None:
+        print("Error: --row-group-size and --row-group-mb are mutually exclusive", file=sys.stderr)
+        sys.exit(1)
+
+    if (args.row_group_size is not None and args.row_group_size <= 0) or (
+        args.row_group_mb is not None and args.row_group_mb <= 0
+    ):
+        print("Error: --row-group-size and --row-group-mb must be positive", file=sys.stderr)
+        sys.exit(1)
+
+
+def validate_batch_args(args) -> None:
+    """Validate the arguments of batch mode."""
+    if not expand_inputs(args.input):
+        print(f"Error: No input files match '{args.input}'", file=sys.stderr)
+        sys.exit(1)
+
+    if args.fit_on and not Path(args.fit_on).exists():
+        print(f"Error: Reference file '{args.fit_on}' does not exist", file=sys.stderr)
+        sys.exit(1)
+
+    if args.chunksize is not None or args.pipeline or args.partition_by:
+        print("Error: --chunksize, --pipeline and --partition-by are not supported in batch mode", file=sys.stderr)
+        sys.exit(1)
+
+    validate_filters(args)
+    validate_optimize_args(args)
+    validate_parquet_args(args)
+
+    output_dir = Path(args.output)
+    if output_dir.exists() and not output_dir.is_dir():
+        print(f"Error: Output '{args.output}' must be a directory in batch mode", file=sys.stderr)
+        sys.exit(1)
+
+    inputs = expand_inputs(args.input)
+    root = batch_root(args.input)
+    outputs: Dict[Path, Path] = {}
+    for input_path in inputs:
+        output_path = _batch_output_path(input_path, root, output_dir, args.output_format)
+        resolved = output_path.resolve()
+        if resolved in outputs:
+            print(
+                f"Error: '{input_path}' and '{outputs[resolved]}' would both be written to '{output_path}'",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        outputs[resolved] = input_path
+
+    overwritten = sorted(str(path) for path in inputs if path.resolve() in outputs)
+    if overwritten:
+        print(f"Error: Batch output would overwrite input files: {', '.join(overwritten)}", file=sys.stderr)
+        sys.exit(1)
+
+
+def validate_inspect_args(args) -> None:
+    """Validate the arguments of the inspect command."""
+    if not Path(args.input).is_file():
+        print(f"Error: Input file '{args.input}' does not exist", file=sys.stderr)
+        sys.exit(1)
+
+    if args.sample_size <= 0 or args.strata <= 0 or args.chunksize <= 0:
+        print("Error: --sample-size, --strata and --chunksize must be positive", file=sys.stderr)
+        sys.exit(1)
+
+    if args.min_frequency is not None and not 0 < args.min_frequency < 1:
+        print("Error: --min-frequency must be between 0 and 1", file=sys.stderr)
+        sys.exit(1)
+
+    if not 0 < args.confidence < 1:
+        print("Error: --confidence must be between 0 and 1", file=sys.stderr)
+        sys.exit(1)
+
+
+def inspect_file(args) -> None:
+    """Detect and print the datatypes of a file from a sample of its rows."""
+    from .io import FileReader
+    from .preprocessor import FeaturePreProcessor
+    from .sampling import required_sample_size
+
+    sample_size = args.sample_size
+    if args.min_frequency is not None:
+        sample_size = required_sample_size(args.min_frequency, args.confidence)
+
+    processor = FeaturePreProcessor(sample_size=sample_size)
+    reader = FileReader(null_values=processor.null_values)
+
+    start = time.perf_counter()
+    try:
+        input_format = FileFormat(args.input_format) if args.input_format else None
+        sample = reader.read_sample(
+            args.input,
+            size=sample_size,
+            method=args.sampling,
+            n_strata=args.strata,
+            chunksize=args.chunksize,
+            file_format=input_format,
+        )
+    except Exception as e:
+        print(f"Error reading input file: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    datatypes = processor.determine_datatypes(sample)
+    elapsed = time.perf_counter() - start
+
+    print(f"Sampled {len(sample)} rows ({args.sampling}) of {args.input} in {elapsed:.2f}s")
+    print("\nDetected data types:")
+    for col, dtype in datatypes.items():
+        print(f"  {col}: {dtype}")
+
+
+def _create_reader(args, processor) -> "FileReader":
+    """Create the FileReader for the command line options and the processor's null tokens."""
+    from .io import FileReader
+
+    return FileReader(
+        use_polars=args.polars, use_pyarrow=args.pyarrow, null_values=processor.null_values, memory_map=args.mmap
+    )
+
+
+def _create_writer(args) -> "FileWriter":
+    """Create the FileWriter for the command line options, with the Parquet layout options if any are set."""
+    from .io import FileWriter, ParquetOptions
+
+    options = None
+    if args.partition_by or any(
+        option is not None for option in [args.compression, args.compression_level, args.row_group_size, args.row_group_mb]
+    ):
+        options = ParquetOptions(
+            compression=args.compression or "snappy",
+            compression_level=args.compression_level,
+            row_group_size=args.row_group_size,
+            row_group_bytes=int(args.row_group_mb * 2**20) if args.row_group_mb is not None else None,
+        )
+    return FileWriter(use_polars=args.polars, use_pyarrow=args.pyarrow, parquet_options=options)
+
+
+def _read_options(args) -> Dict[str, Any]:
+    """Return the column projection and row filters of the command line options."""
+    columns = [col.strip() for col in args.columns.split(",") if col.strip()] if getattr(args, "columns", None) else None
+    return {"columns": columns, "filters": getattr(args, "filter", None)}
+
+
+def _process_options(args) -> Dict[str, Any]:
+    """Return the dtype optimization and copy options of the command line."""
+    return {
+        "optimize_dtypes": getattr(args, "optimize_dtypes", False),
+        "float_tolerance": getattr(args, "float32_tolerance", None),
+        "copy": not getattr(args, "no_copy", False),
+    }
+
+
+def _batch_output_path(input_path: Path, root: Path, output_dir: Path, output_format: Optional[str]) -> Path:
+    """Return the output path of one batch input file, keeping its path relative to the batch root."""
+    if output_format:
+        suffix = ".xlsx" if output_format == FileFormat.EXCEL.value else f".{output_format}"
+    else:
+        suffix = input_path.suffix
+    return (output_dir / input_path.relative_to(root)).with_suffix(suffix)
+
+
+def process_batch_file(args, input_path: Path, state: Optional["FittedState"] = None) -> Dict[str, Any]:
+    """
+    Process one file of a batch.
+
+    Runs in a worker process, so failures are returned instead of raised.
+
+    Args:
+        args: Parsed command line arguments
+        input_path: File to process
+        state: Fitted state applied with transform (process is used if None)
+
+    Returns:
+        Summary with the file name, rows in and out, seconds and error (None on success)
+    """
+    from .preprocessor import FeaturePreProcessor
+
+    start = time.perf_counter()
+    summary: Dict[str, Any] = {"file": str(input_path), "rows_in": None, "rows_out": None, "error": None}
+    try:
+        processor = FeaturePreProcessor(use_polars=args.polars, use_pyarrow=args.pyarrow)
+        reader = _create_reader(args, processor)
+        writer = _create_writer(args)
+        input_format = FileFormat(args.input_format) if args.input_format else None
+        output_format = FileFormat(args.output_format) if args.output_format else None
+
+        df = reader.read_file(input_path, file_format=input_format, **_read_options(args))
+        summary["rows_in"] = len(df)
+        datatypes = state.datatypes if state is not None else None
+        if datatypes is None and writer.parquet_options is not None:
+            datatypes = processor.determine_datatypes(df)
+
+        if state is not None:
+            processed_df = processor.transform(df, state=state)
+            if args.optimize_dtypes:
+                processed_df, _ = processor.optimize_dtypes(processed_df, state.datatypes, args.float32_tolerance)
+        else:
+            processed_df = processor.process(
+                df,
+                drop_na=not args.keep_na,
+                scaler_type=ScalerType(args.scaler),
+                remove_outlier=not args.no_outliers,
+                **_process_options(args),
+            )
+        summary["rows_out"] = len(processed_df)
+
+        output_path = _batch_output_path(input_path, batch_root(args.input), Path(args.output), args.output_format)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        writer.write_file(processed_df, output_path, file_format=output_format, datatypes=datatypes)
+    except Exception as e:
+        summary["error"] = str(e)
+
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+
+def process_batch(args) -> None:
+    """Process every file matched by a glob pattern or directory."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    from .preprocessor import FeaturePreProcessor
+
+    inputs = expand_inputs(args.input)
+    root = batch_root(args.input)
+    Path(args.output).mkdir(parents=True, exist_ok=True)
+
+    state = None
+    if args.fit_on:
+        try:
+            print(f"Fitting on {args.fit_on}...")
+            processor = FeaturePreProcessor(use_polars=args.polars, use_pyarrow=args.pyarrow)
+            reader = _create_reader(args, processor)
+            input_format = FileFormat(args.input_format) if args.input_format else None
+            state = processor.fit(
+                reader.read_file(args.fit_on, file_format=input_format, **_read_options(args)),
+                drop_na=not args.keep_na,
+                scaler_type=ScalerType(args.scaler),
+                remove_outlier=not args.no_outliers,
+            )
+        except Exception as e:
+            print(f"Error fitting on reference file: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    print(f"Processing {len(inputs)} files with {args.workers} worker(s)...")
+    start = time.perf_counter()
+    if args.workers == 1:
+        summaries = [process_batch_file(args, path, state) for path in inputs]
+    else:
+        # Workers are reused across files, so imports are paid once per worker
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futures = [executor.submit(process_batch_file, args, path, state) for path in inputs]
+            summaries = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{'file':<40} {'rows in':>10} {'rows out':>10} {'time (s)':>9}  status")
+    for summary in summaries:
+        rows_in = summary["rows_in"] if summary["rows_in"] is not None else "-"
+        rows_out = summary["rows_out"] if summary["rows_out"] is not None else "-"
+        status = f"FAILED: {summary['error']}" if summary["error"] else "ok"
+        name = str(Path(summary["file"]).relative_to(root))
+        print(f"{name:<40} {rows_in:>10} {rows_out:>10} {summary['seconds']:>9.2f}  {status}")
+
+    failed = [summary for summary in summaries if summary["error"]]
+    total_rows = sum(summary["rows_out"] or 0 for summary in summaries if not summary["error"])
+    print(f"\n{len(summaries) - len(failed)} succeeded, {len(failed)} failed, {total_rows} rows written in {elapsed:.2f}s")
+
+    if failed:
+        sys.exit(1)
+    print("Processing complete!")
+
+
+def process_file_chunked(args) -> None:
+    """Process the file in chunks according to command line arguments."""
+    from .preprocessor import FeaturePreProcessor
+    from .streaming import ChunkedProcessor
+
+    processor = FeaturePreProcessor(use_polars=args.polars, use_pyarrow=args.pyarrow)
+    chunked = ChunkedProcessor(
+        processor=processor,
+        reader=_create_reader(args, processor),
+        writer=_create_writer(args),
+        chunksize=args.chunksize,
+        pipeline=args.pipeline,
+        workers=args.workers,
+    )
+
+    input_format = FileFormat(args.input_format) if args.input_format else None
+    output_format = FileFormat(args.output_format) if args.output_format else None
+    scaler_type = ScalerType(args.scaler)
+    drop_na = not args.keep_na
+    remove_outliers = not args.no_outliers
+
+    try:
+        print(f"Processing {args.input} in chunks of {args.chunksize} rows...")
+        if args.info:
+            print(f"  Scaler: {scaler_type}")
+            print(f"  Drop NA: {drop_na}")
+            print(f"  Remove outliers: {remove_outliers}")
+
+        rows = chunked.process_file(
+            args.input,
+            args.output,
+            input_format=input_format,
+            output_format=output_format,
+            drop_na=drop_na,
+            scaler_type=scaler_type,
+            remove_outlier=remove_outliers,
+        )
+
+    except Exception as e:
+        print(f"Error processing data: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    state = processor.fitted_state
+    if args.info and state is not None:
+        print("\nDetected data types:")
+        for col, dtype in state.datatypes.items():
+            print(f"  {col}: {dtype}")
+        print()
+
+    print(f"Wrote {rows} rows to {args.output}")
+    print("Processing complete!")
+
 
 def process_file(args) -> None:
     """Process the file according to command line arguments."""
+    if is_batch_input(args.input):
+        process_batch(args)
+        return
+
+    if args.chunksize:
+        process_file_chunked(args)
+        return
+
+    from .instrumentation import StageCollector
+    from .preprocessor import FeaturePreProcessor
+
     # Initialize components
-    processor = FeaturePreProcessor(use_polars=args.polars, use_pyarrow=args.pyarrow)
+    collector = StageCollector()
+    processor = FeaturePreProcessor(
+        use_polars=args.polars,
+        use_pyarrow=args.pyarrow,
+        stage_hooks=[collector] if args.info else None,
+        track_memory=args.info,
+    )
 
-    reader = FileReader(use_polars=args.polars, use_pyarrow=args.pyarrow)
+    reader = _create_reader(args, processor)
 
-    writer = FileWriter(use_polars=args.polars, use_pyarrow=args.pyarrow)
+    writer = _create_writer(args)
 
     # Read input file
     try:
         input_format = FileFormat(args.input_format) if args.input_format else None
         print(f"Reading {args.input}...")
-        df = reader.read_file(args.input, file_format=input_format)
+        if processor.use_polars:
+            # Keep the data in polars from reading to writing
+            # read_polars returns a LazyFrame only with lazy=True
+            df = cast("pl.DataFrame", reader.read_polars(args.input, file_format=input_format, **_read_options(args)))
+        elif (
+            processor.use_pyarrow
+            and not args.optimize_dtypes
+            and (input_format or reader._detect_format(args.input)) in ARROW_FORMATS
+        ):
+            # Keep the data in Arrow from reading to writing (dtype optimization needs pandas)
+            df = reader.read_arrow(args.input, file_format=input_format, **_read_options(args))
+        else:
+            df = reader.read_file(args.input, file_format=input_format, **_read_options(args))
         print(f"Loaded {len(df)} rows, {len(df.columns)} columns")
 
     except Exception as e:
         print(f"Error reading input file: {e}", file=sys.stderr)
         sys.exit(1)
 
+    # Detected datatypes also choose the dictionary-encoded Parquet columns
+    datatypes = processor.determine_datatypes(df) if args.info or writer.parquet_options is not None else None
+
     # Display data type information if requested
-    if args.info:
-        datatypes = processor.determine_datatypes(df)
+    if args.info and datatypes is not None:
         print("\nDetected data types:")
         for col, dtype in datatypes.items():
             print(f"  {col}: {dtype}")
@@ -135,10 +754,22 @@ def process_file(args) -> None:
             print(f"  Drop NA: {drop_na}")
             print(f"  Remove outliers: {remove_outliers}")
 
-        processed_df = processor.process(df=df, drop_na=drop_na, scaler_type=scaler_type, remove_outlier=remove_outliers)
+        processed_df = processor.process(
+            df=df, drop_na=drop_na, scaler_type=scaler_type, remove_outlier=remove_outliers, **_process_options(args)
+        )
 
         print(f"Processed data: {len(processed_df)} rows, {len(processed_df.columns)} columns")
 
+        if processor.dtype_report is not None:
+            print("\nDtype optimization:")
+            print(processor.dtype_report.format())
+            print()
+
+        if collector.stages:
+            print("\nStage breakdown:")
+            print(collector.format())
+            print()
+
     except Exception as e:
         print(f"Error processing data: {e}", file=sys.stderr)
         sys.exit(1)
@@ -147,7 +778,14 @@ def process_file(args) -> None:
     try:
         output_format = FileFormat(args.output_format) if args.output_format else None
         print(f"Writing {args.output}...")
-        writer.write_file(processed_df, args.output, file_format=output_format)
+        if args.partition_by:
+            partition_by = [col.strip() for col in args.partition_by.split(",") if col.strip()]
+            partitions = writer.write_dataset(
+                processed_df, args.output, partition_by, datatypes=datatypes, workers=args.workers
+            )
+            print(f"Wrote {partitions} partitions")
+        else:
+            writer.write_file(processed_df, args.output, file_format=output_format, datatypes=datatypes)
         print("Processing complete!")
 
     except Exception as e:
@@ -155,10 +793,17 @@ def process_file(args) -> None:
         sys.exit(1)
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     """Main CLI entry point."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["inspect"]:
+        args = create_inspect_parser().parse_args(argv[1:])
+        validate_inspect_args(args)
+        inspect_file(args)
+        return
+
     parser = create_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     validate_args(args)
     process_file(args)
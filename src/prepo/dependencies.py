@@ -0,0 +1,25 @@
+"""
+Optional dependency detection for the prepo package.
+
+Polars and PyArrow are detected without being imported, so they are only loaded
+by the code paths that use them.
+"""
+
+import importlib.util
+import sys
+
+HAS_POLARS = importlib.util.find_spec("polars") is not None
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+def is_polars_frame(df) -> bool:
+    """Check if an object is a polars DataFrame or LazyFrame without importing polars."""
+    # A polars frame can only exist if polars has already been imported
+    pl = sys.modules.get("polars")
+    return pl is not None and isinstance(df, (pl.DataFrame, pl.LazyFrame))
+
+
+def is_arrow_table(df) -> bool:
+    """Check if an object is a pyarrow Table without importing pyarrow."""
+    pa = sys.modules.get("pyarrow")
+    return pa is not None and isinstance(df, pa.Table)
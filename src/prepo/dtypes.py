@@ -0,0 +1,188 @@
+"""
+Compact dtype optimization for the prepo package.
+
+This module contains the optimize_dtypes function, which downcasts the columns of a
+processed dataframe according to their detected DataType, and the DtypeReport it
+returns with the memory saved by every changed column.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .dependencies import HAS_PYARROW
+from .types import DataType, DataTypeDict
+
+# Strings are stored as category when they repeat at least this often on average
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# Data types whose float columns may be stored as float32
+FLOAT_TYPES = [DataType.NUMERIC, DataType.PRICE, DataType.PERCENTAGE, DataType.INTEGER]
+
+
+@dataclass
+class DtypeChange:
+    """A column converted to a more compact dtype."""
+
+    column: str
+    from_dtype: str
+    to_dtype: str
+    bytes_before: int
+    bytes_after: int
+
+    @property
+    def bytes_saved(self) -> int:
+        """Bytes saved by this change."""
+        return self.bytes_before - self.bytes_after
+
+
+class DtypeReport:
+    """
+    Memory saved by optimize_dtypes, per changed column.
+
+    Example:
+        df, report = optimize_dtypes(df, datatypes)
+        print(report.format())
+    """
+
+    def __init__(self, changes: Optional[List[DtypeChange]] = None):
+        """Initialize the DtypeReport with a list of changes."""
+        self.changes: List[DtypeChange] = list(changes) if changes else []
+
+    @property
+    def bytes_saved(self) -> int:
+        """Total bytes saved by all changes."""
+        return sum(change.bytes_saved for change in self.changes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the changes and the total saving as a dictionary."""
+        return {
+            "columns": [{**asdict(change), "bytes_saved": change.bytes_saved} for change in self.changes],
+            "bytes_saved": self.bytes_saved,
+        }
+
+    def format(self) -> str:
+        """Format the changes as a text table."""
+        lines = [f"{'column':<20} {'from':>10} {'to':>10} {'before (KiB)':>13} {'after (KiB)':>12} {'saved':>7}"]
+        for c in self.changes:
+            saved = c.bytes_saved / c.bytes_before if c.bytes_before else 0.0
+            lines.append(
+                f"{c.column:<20} {c.from_dtype:>10} {c.to_dtype:>10} "
+                f"{c.bytes_before / 1024:13.1f} {c.bytes_after / 1024:12.1f} {saved:7.0%}"
+            )
+        lines.append(f"{'total saved':<20} {self.bytes_saved / 1024:56.1f}")
+        return "\n".join(lines)
+
+
+def _integer_dtype(series: pd.Series) -> Optional[str]:
+    """Return the smallest integer dtype holding every value, or None if a value is not integral."""
+    values = series.dropna()
+    if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+        return None
+    numbers = values.to_numpy(dtype=float)
+    if len(numbers) == 0 or not np.all(np.isfinite(numbers)) or not np.all(numbers == np.round(numbers)):
+        return None
+
+    low, high = numbers.min(), numbers.max()
+    for dtype in ["int8", "int16", "int32", "int64"]:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            # Nullable integers keep missing values without falling back to float
+            return dtype.capitalize() if series.hasnans else dtype
+    return None
+
+
+def _binary_dtype(series: pd.Series) -> Optional[str]:
+    """Return a boolean dtype if the column only holds 0/1 or True/False, otherwise None."""
+    values = series.dropna()
+    if pd.api.types.is_bool_dtype(values):
+        return "boolean" if series.hasnans else None
+    if not pd.api.types.is_numeric_dtype(values) or not values.isin([0, 1]).all():
+        return None
+    return "boolean" if series.hasnans else "bool"
+
+
+def _string_dtype(series: pd.Series, dtype: DataType) -> Optional[str]:
+    """Return category for repetitive strings and the Arrow string dtype otherwise."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return None
+    if dtype in [DataType.CATEGORICAL, DataType.BINARY] or series.nunique() <= CATEGORY_MAX_UNIQUE_RATIO * len(series):
+        return "category"
+    if HAS_PYARROW and pd.api.types.is_object_dtype(series):
+        return "string[pyarrow]"
+    return None
+
+
+def _float32_fits(series: pd.Series, tolerance: float) -> bool:
+    """Check if a float64 column survives float32 storage within an absolute tolerance."""
+    if series.dtype != np.float64:
+        return False
+    values = series.to_numpy()
+    error = np.abs(values.astype(np.float32).astype(np.float64) - values)
+    return bool(np.all(np.isnan(error) | (error <= tolerance)))
+
+
+def _target_dtype(series: pd.Series, dtype: DataType, float_tolerance: Optional[float]) -> Optional[str]:
+    """Decide the compact dtype of one column (None keeps the current dtype)."""
+    if dtype == DataType.BINARY:
+        return _binary_dtype(series) or _integer_dtype(series) or _string_dtype(series, dtype)
+
+    if dtype in [DataType.INTEGER, DataType.ID]:
+        target = _integer_dtype(series)
+        if target is not None:
+            return target
+
+    if dtype in FLOAT_TYPES:
+        if float_tolerance is not None and _float32_fits(series, float_tolerance):
+            return "float32"
+        return None
+
+    if dtype in [DataType.CATEGORICAL, DataType.STRING, DataType.TEXT] and not pd.api.types.is_numeric_dtype(series):
+        return _string_dtype(series, dtype)
+
+    return None
+
+
+def optimize_dtypes(
+    df: pd.DataFrame, datatypes: DataTypeDict, float_tolerance: Optional[float] = None
+) -> Tuple[pd.DataFrame, DtypeReport]:
+    """
+    Downcast columns to compact dtypes according to their detected DataType.
+
+    - INTEGER and numeric ID columns with integral values: smallest int8/16/32/64 (nullable
+      Int8/16/32/64 if values are missing)
+    - BINARY: bool for 0/1 values, otherwise category
+    - CATEGORICAL and repetitive STRING columns: category; other STRING and TEXT object
+      columns: Arrow-backed strings
+    - float columns of numeric types (e.g. scaled features): float32, only if float_tolerance
+      is given and every value changes by at most float_tolerance
+
+    A conversion is kept only if it makes the column smaller.
+
+    Args:
+        df: DataFrame to optimize (not modified)
+        datatypes: Dictionary mapping column names to their data types
+        float_tolerance: Maximum absolute error accepted for float32 storage (None keeps float64)
+
+    Returns:
+        Tuple of (optimized_dataframe, report)
+    """
+    result = df.copy(deep=False)
+    report = DtypeReport()
+
+    for col in df.columns:
+        series = df[col]
+        target = _target_dtype(series, datatypes.get(col, DataType.UNKNOWN), float_tolerance)
+        if target is None:
+            continue
+
+        converted = series.astype(target)
+        before = int(series.memory_usage(index=False, deep=True))
+        after = int(converted.memory_usage(index=False, deep=True))
+        if after < before:
+            result[col] = converted
+            report.changes.append(DtypeChange(col, str(series.dtype), str(converted.dtype), before, after))
+
+    return result, report
@@ -0,0 +1,215 @@
+"""
+Missing value imputation for numeric columns.
+
+This module contains the NumericImputer class, which fills every numeric column
+of a dataframe in a single pass with a KNN, median or grouped-median strategy
+and keeps per-column statistics that can be reused on later batches.
+"""
+
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .types import ImputeStrategy
+
+
+def group_keys(series: pd.Series) -> pd.Series:
+    """Return string group keys for a grouping column, keeping missing values as NaN."""
+    return series.astype(str).where(series.notna())
+
+
+class NumericImputer:
+    """
+    Single-pass imputer for a block of numeric columns.
+
+    Strategies:
+    - knn: one KNN model over all numeric columns. Small inputs use scikit-learn's
+      KNNImputer; larger inputs use a KD-tree built on complete rows, queried once per
+      missing-value pattern on the observed columns.
+    - median: column medians
+    - grouped_median: column medians within the groups of a grouping column, falling
+      back to the overall median for unseen or missing groups
+
+    After fit_transform, statistics holds one fill value per column (the mean for knn,
+    the median otherwise) and group_statistics the per-group medians. For knn, reference
+    holds the rows neighbors are searched in (the whole block, or its sampled complete rows
+    when use_tree is True), so transform imputes later batches with the same model.
+    """
+
+    def __init__(
+        self,
+        strategy: Union[ImputeStrategy, str] = ImputeStrategy.KNN,
+        n_neighbors: int = 3,
+        tree_threshold: int = 10_000,
+        max_reference_rows: int = 50_000,
+        query_chunksize: int = 10_000,
+        random_state: int = 42,
+    ):
+        """
+        Initialize the NumericImputer.
+
+        Args:
+            strategy: Imputation strategy (knn, median, grouped_median)
+            n_neighbors: Number of neighbors used by the knn strategy
+            tree_threshold: Row count above which knn uses the KD-tree search
+            max_reference_rows: Maximum number of complete rows indexed by the KD-tree
+            query_chunksize: Number of rows queried against the KD-tree at once
+            random_state: Seed used to subsample the KD-tree reference rows
+        """
+        if isinstance(strategy, str):
+            strategy = ImputeStrategy(strategy)
+
+        self.strategy = strategy
+        self.n_neighbors = n_neighbors
+        self.tree_threshold = tree_threshold
+        self.max_reference_rows = max_reference_rows
+        self.query_chunksize = query_chunksize
+        self.random_state = random_state
+        self.statistics: Dict[str, Any] = {}
+        self.group_statistics: Dict[str, Dict[str, Any]] = {}
+        self.reference: Optional[pd.DataFrame] = None
+        self.use_tree = False
+
+    def fit_transform(self, df: pd.DataFrame, groups: Optional[pd.Series] = None) -> pd.DataFrame:
+        """
+        Learn fill statistics from a numeric block and impute its missing values.
+
+        Args:
+            df: DataFrame containing only numeric columns
+            groups: Grouping column aligned with df (grouped_median only)
+
+        Returns:
+            DataFrame with missing values filled; all-missing columns stay missing
+        """
+        self.group_statistics = {}
+        if self.strategy == ImputeStrategy.KNN:
+            self.statistics = df.mean().to_dict()
+            self._fit_reference(df)
+        else:
+            self.statistics = df.median().to_dict()
+
+        if df.empty or not df.isna().any().any():
+            return df
+
+        if self.strategy == ImputeStrategy.GROUPED_MEDIAN and groups is not None:
+            keys = group_keys(groups)
+            medians = df.groupby(keys).median()
+            self.group_statistics = {col: medians[col].dropna().to_dict() for col in df.columns}
+            filled = df.fillna(medians.reindex(keys).set_axis(df.index))
+            return filled.fillna(self.statistics)
+
+        if self.strategy in [ImputeStrategy.MEDIAN, ImputeStrategy.GROUPED_MEDIAN]:
+            return df.fillna(self.statistics)
+
+        return self.transform(df)
+
+    def _fit_reference(self, df: pd.DataFrame) -> None:
+        """Keep the rows KNN searches for neighbors: all rows, or sampled complete rows for the KD-tree."""
+        cols = [col for col in df.columns if df[col].notna().any()]
+        values = df[cols].to_numpy(dtype=float)
+        self.use_tree = len(values) > self.tree_threshold
+
+        if self.use_tree:
+            values = values[~np.isnan(values).any(axis=1)]
+            if len(values) > self.max_reference_rows:
+                rng = np.random.default_rng(self.random_state)
+                values = values[rng.choice(len(values), self.max_reference_rows, replace=False)]
+        self.reference = pd.DataFrame(values, columns=cols)
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Impute the missing values of a numeric block with the fitted KNN reference rows.
+
+        Applied to the fitted block, this gives the same values as fit_transform.
+
+        Args:
+            df: DataFrame with the fitted numeric columns
+
+        Returns:
+            DataFrame with missing values filled; columns missing from every reference row stay missing
+        """
+        from sklearn.impute import KNNImputer
+
+        if self.reference is None:
+            raise ValueError("NumericImputer has no KNN reference rows. Call fit_transform() with the knn strategy first.")
+
+        cols = list(self.reference.columns)
+        values = df[cols].to_numpy(dtype=float, copy=True)
+        if not np.isnan(values).any():
+            return df
+
+        reference = self.reference.to_numpy(dtype=float)
+        if len(reference) == 0:
+            return df.fillna(self.statistics)
+        if self.use_tree:
+            means = np.array([self.statistics[col] for col in cols], dtype=float)
+            values = self._knn_tree(values, means, reference)
+        else:
+            # fit_transform of KNNImputer is fit followed by transform, so the fitted block is imputed identically
+            values = KNNImputer(n_neighbors=self.n_neighbors).fit(reference).transform(values)
+
+        result = df.copy()
+        result[cols] = values
+        return result
+
+    def _knn_tree(self, values: np.ndarray, means: np.ndarray, reference: np.ndarray) -> np.ndarray:
+        """
+        Impute with neighbors found by a KD-tree over complete reference rows.
+
+        Rows are grouped by which columns are missing; each group is matched on its observed
+        columns and filled with the mean of its neighbors' values.
+        """
+        from sklearn.neighbors import KDTree
+
+        missing = np.isnan(values)
+        incomplete = np.flatnonzero(missing.any(axis=1))
+
+        if len(reference) == 0:
+            return np.where(missing, means, values)
+
+        k = min(self.n_neighbors, len(reference))
+        patterns, inverse = np.unique(missing[incomplete], axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+
+        for p, pattern in enumerate(patterns):
+            rows = incomplete[inverse == p]
+            observed = ~pattern
+
+            if not observed.any():
+                values[np.ix_(rows, pattern)] = means[pattern]
+                continue
+
+            tree = KDTree(reference[:, observed])
+            for start in range(0, len(rows), self.query_chunksize):
+                chunk = rows[start : start + self.query_chunksize]
+                _, neighbors = tree.query(values[np.ix_(chunk, observed)], k=k)
+                values[np.ix_(chunk, pattern)] = reference[neighbors][:, :, pattern].mean(axis=1)
+
+        return values
+
+
+def fill_missing(
+    df: pd.DataFrame,
+    statistics: Dict[str, Any],
+    group_statistics: Optional[Dict[str, Dict[str, Any]]] = None,
+    groups: Optional[pd.Series] = None,
+) -> pd.DataFrame:
+    """
+    Fill missing values with previously fitted statistics.
+
+    Args:
+        df: DataFrame to fill
+        statistics: Fill value per column
+        group_statistics: Fill value per column and group key (used before statistics)
+        groups: Grouping column aligned with df
+
+    Returns:
+        Filled DataFrame
+    """
+    if group_statistics and groups is not None:
+        keys = group_keys(groups)
+        df = df.copy()
+        for col, values in group_statistics.items():
+            df[col] = df[col].fillna(keys.map(values))
+    return df.fillna(statistics)
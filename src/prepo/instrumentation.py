@@ -0,0 +1,75 @@
+"""
+Per-stage instrumentation for the prepo package.
+
+This module contains the StageMetrics record reported by FeaturePreProcessor.process
+for each pipeline stage, the StageHook callback type and the StageCollector hook,
+which gathers the metrics into a structured report.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class StageMetrics:
+    """Measurements of one pipeline stage."""
+
+    stage: str
+    seconds: float
+    rows_in: int
+    rows_out: int
+    columns_in: int
+    columns_out: int
+    bytes_allocated: Optional[int] = None  # Peak traced allocation, if memory tracking is enabled
+
+
+# Callback invoked with the metrics of every stage
+StageHook = Callable[[StageMetrics], None]
+
+
+class StageCollector:
+    """
+    Stage hook that keeps the metrics of every stage it receives.
+
+    Example:
+        collector = StageCollector()
+        processor = FeaturePreProcessor(stage_hooks=[collector], track_memory=True)
+        processor.process(df)
+        print(collector.format())
+    """
+
+    def __init__(self):
+        """Initialize an empty StageCollector."""
+        self.stages: List[StageMetrics] = []
+
+    def __call__(self, metrics: StageMetrics) -> None:
+        """Record the metrics of a stage."""
+        self.stages.append(metrics)
+
+    def clear(self) -> None:
+        """Forget all recorded stages."""
+        self.stages = []
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Return the recorded stages and totals as a dictionary.
+
+        Returns:
+            Dictionary with a list of per-stage metrics and the total time and allocation
+        """
+        allocated = [m.bytes_allocated for m in self.stages if m.bytes_allocated is not None]
+        return {
+            "stages": [asdict(m) for m in self.stages],
+            "total_seconds": sum(m.seconds for m in self.stages),
+            "total_bytes_allocated": sum(allocated) if allocated else None,
+        }
+
+    def format(self) -> str:
+        """Format the recorded stages as a text table."""
+        lines = [f"{'stage':<14} {'time (ms)':>10} {'rows in':>10} {'rows out':>10} {'cols':>9} {'alloc (MiB)':>12}"]
+        for m in self.stages:
+            allocated = f"{m.bytes_allocated / 2**20:12.2f}" if m.bytes_allocated is not None else f"{'-':>12}"
+            columns = f"{m.columns_in}->{m.columns_out}"
+            lines.append(f"{m.stage:<14} {m.seconds * 1000:10.1f} {m.rows_in:>10} {m.rows_out:>10} {columns:>9} {allocated}")
+        lines.append(f"{'total':<14} {self.report()['total_seconds'] * 1000:10.1f}")
+        return "\n".join(lines)
@@ -5,49 +5,248 @@ This module provides functionality to read and write data from various file form
 including CSV, JSON, Excel, Parquet, and more with optional Polars/PyArrow optimizations.
 """
 
+import io
+import math
+import operator
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, cast
+from urllib.parse import quote
 
 import numpy as np
 import pandas as pd
 
-from .types import FileFormat
+from .dependencies import HAS_POLARS, HAS_PYARROW, is_arrow_table, is_polars_frame
+from .sampling import RowReservoir, StratifiedSample
+from .types import DataType, DataTypeDict, FileFormat, SamplingMethod
 
-# Optional high-performance libraries
-try:
+# Polars and PyArrow are imported by the methods that use them
+if TYPE_CHECKING:
     import polars as pl
+    import pyarrow as pa
+
+# A row filter (column, operator, value); rows matching every filter are kept
+Filter = Tuple[str, str, Any]
+
+FILTER_OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<=": operator.le,
+    ">=": operator.ge,
+    "<": operator.lt,
+    ">": operator.gt,
+}
+
+_FILTER_EXPRESSION = re.compile(r"^\s*(.+?)\s*(==|!=|<=|>=|<|>|=)\s*(.+?)\s*$")
+
+
+def parse_filter(expression: str) -> Filter:
+    """
+    Parse a filter expression such as "year >= 2020" or "city == 'north'".
+
+    Args:
+        expression: Column name, operator (==, =, !=, <, <=, >, >=) and value
+
+    Returns:
+        Filter tuple of (column, operator, value) with the value as a string
+    """
+    match = _FILTER_EXPRESSION.match(expression)
+    if match is None:
+        raise ValueError(f"Invalid filter expression: {expression!r} (expected e.g. 'year >= 2020')")
+
+    col, op, value = match.groups()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        value = value[1:-1]
+    return col, "==" if op == "=" else op, value
+
+
+def _normalize_filters(filters: Optional[Sequence[Union[str, Filter]]]) -> List[Filter]:
+    """Parse filter expressions and check the operators of filter tuples."""
+    if filters is None:
+        return []
+    if isinstance(filters, str):
+        filters = [filters]
+
+    parsed = []
+    for item in filters:
+        col, op, value = parse_filter(item) if isinstance(item, str) else item
+        if op not in FILTER_OPERATORS:
+            raise ValueError(f"Unsupported filter operator: {op}. Available: {list(FILTER_OPERATORS)}")
+        parsed.append((col, op, value))
+    return parsed
+
+
+def _coerce_filter_value(col: str, value: Any, kind: Optional[str]) -> Any:
+    """Convert a string filter value to the kind (numeric, datetime, date) of its column."""
+    if not isinstance(value, str) or kind is None:
+        return value
+    try:
+        if kind == "numeric":
+            return pd.to_numeric(value)
+        timestamp = pd.Timestamp(value)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Cannot compare {kind} column {col} with {value!r}") from e
+    return timestamp.date() if kind == "date" else timestamp.to_pydatetime()
+
+
+def _projected_columns(columns: Optional[Sequence[str]], filters: List[Filter]) -> Optional[List[str]]:
+    """Return the columns to read: the requested ones plus those the filters need."""
+    if columns is None:
+        return None
+    return list(dict.fromkeys(list(columns) + [col for col, _, _ in filters]))
+
+
+def filter_rows(
+    df: pd.DataFrame, filters: Sequence[Union[str, Filter]], columns: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Keep the rows of a dataframe matching every filter and select columns.
+
+    String values are converted to the type of numeric and datetime columns; rows with
+    a missing value in a filtered column are dropped.
+
+    Args:
+        df: DataFrame to filter
+        filters: Filter expressions or (column, operator, value) tuples
+        columns: Columns to keep (all if None)
+
+    Returns:
+        Filtered dataframe with a fresh index
+    """
+    filters = _normalize_filters(filters)
+    if filters:
+        mask = np.ones(len(df), dtype=bool)
+        for col, op, value in filters:
+            if col not in df.columns:
+                raise ValueError(f"Filter column not found: {col}")
+            series = df[col]
+            kind = None
+            if pd.api.types.is_datetime64_any_dtype(series):
+                kind = "datetime"
+            elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                kind = "numeric"
+            result = FILTER_OPERATORS[op](series, _coerce_filter_value(col, value, kind))
+            mask &= np.asarray(pd.array(result, dtype="boolean").fillna(False), dtype=bool)
+        df = df[mask].reset_index(drop=True)
+
+    return df[list(columns)] if columns is not None else df
 
-    HAS_POLARS = True
-except ImportError:
-    pl = None
-    HAS_POLARS = False
 
-try:
+def _arrow_filter_expression(filters: List[Filter], schema: "pa.Schema"):
+    """Build a pyarrow.compute expression matching every filter."""
     import pyarrow as pa
-    import pyarrow.parquet as pq
+    import pyarrow.compute as pc
 
-    HAS_PYARROW = True
-except ImportError:
-    pa = None
-    pq = None
-    HAS_PYARROW = False
+    expression = None
+    for col, op, value in filters:
+        if schema.get_field_index(col) < 0:
+            raise ValueError(f"Filter column not found: {col}")
+        field_type = schema.field(col).type
+        kind = None
+        if pa.types.is_timestamp(field_type):
+            kind = "datetime"
+        elif pa.types.is_date(field_type):
+            kind = "date"
+        elif pa.types.is_integer(field_type) or pa.types.is_floating(field_type) or pa.types.is_decimal(field_type):
+            kind = "numeric"
+        condition = FILTER_OPERATORS[op](pc.field(col), _coerce_filter_value(col, value, kind))
+        expression = condition if expression is None else expression & condition
+    return expression
 
 
-class FileReader:
+def _polars_filter_expression(filters: List[Filter], schema: Dict[str, Any]):
+    """Build a polars expression matching every filter."""
+    import polars as pl
+
+    expression = None
+    for col, op, value in filters:
+        if col not in schema:
+            raise ValueError(f"Filter column not found: {col}")
+        dtype = schema[col]
+        kind = None
+        if dtype == pl.Datetime:
+            kind = "datetime"
+        elif dtype == pl.Date:
+            kind = "date"
+        elif dtype.is_numeric():
+            kind = "numeric"
+        condition = FILTER_OPERATORS[op](pl.col(col), pl.lit(_coerce_filter_value(col, value, kind)))
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def mask_null_tokens(df: pd.DataFrame, null_values: Iterable[str]) -> pd.DataFrame:
     """
-    Universal file reader supporting 8+ file formats with optional optimizations.
+    Replace null tokens with NaN in the object, string and categorical columns of a dataframe.
+
+    Each column is matched against the tokens with a hash-set lookup (Series.isin). Other
+    columns are never scanned, and only columns that contain a token are copied.
+
+    Args:
+        df: DataFrame to clean
+        null_values: Tokens treated as missing values
+
+    Returns:
+        The dataframe itself if no token was found, otherwise a new dataframe sharing
+        the unchanged columns
     """
+    tokens = list(null_values)
+    result = df
+    for col in df.columns:
+        series = df[col]
+        dtype = series.dtype
+        if not (
+            pd.api.types.is_object_dtype(dtype)
+            or pd.api.types.is_string_dtype(dtype)
+            or isinstance(dtype, pd.CategoricalDtype)
+        ):
+            continue
+
+        mask = series.isin(tokens)
+        if mask.any():
+            if result is df:
+                result = df.copy(deep=False)
+            result[col] = series.mask(mask)
+
+    return result
+
+
+class FileReader:
+    """Universal file reader supporting 8+ file formats with optional optimizations."""
 
-    def __init__(self, use_polars: bool = False, use_pyarrow: bool = False):
+    def __init__(
+        self,
+        use_polars: bool = False,
+        use_pyarrow: bool = False,
+        null_values: Optional[List[str]] = None,
+        memory_map: bool = False,
+    ):
         """
         Initialize the FileReader.
 
         Args:
             use_polars: Use Polars for high-performance operations if available
             use_pyarrow: Use PyArrow for optimized I/O operations if available
+            null_values: Tokens read as missing values; passed to the CSV parsers and
+                masked in the string columns of other formats
+            memory_map: Memory-map Feather/Arrow IPC and Parquet files with PyArrow instead of
+                reading them into the heap. Uncompressed Feather columns are then used in place
+                (numeric columns without missing values also by the pandas frames read_file
+                returns); compressed files and Parquet are still decoded into memory.
         """
         self.use_polars = use_polars and HAS_POLARS
         self.use_pyarrow = use_pyarrow and HAS_PYARROW
+        self.null_values = list(null_values) if null_values else None
+        self.memory_map = memory_map and HAS_PYARROW
+
+    def _mask_null_tokens(self, df: pd.DataFrame, file_format: FileFormat) -> pd.DataFrame:
+        """Mask null tokens in formats whose reader did not already handle them."""
+        if self.null_values is None or file_format in [FileFormat.CSV, FileFormat.TSV]:
+            return df
+        return mask_null_tokens(df, self.null_values)
 
     def _detect_format(self, filepath: Union[str, Path]) -> FileFormat:
         """
@@ -77,13 +276,30 @@ class FileReader:
 
         return format_mapping.get(extension, FileFormat.CSV)
 
-    def read_file(self, filepath: Union[str, Path], file_format: Optional[FileFormat] = None, **kwargs) -> pd.DataFrame:
+    def read_file(
+        self,
+        filepath: Union[str, Path],
+        file_format: Optional[FileFormat] = None,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Sequence[Union[str, Filter]]] = None,
+        **kwargs,
+    ) -> pd.DataFrame:
         """
         Read data from various file formats.
 
+        Column projection and filters are pushed down to the reader where it supports them:
+        Parquet row groups are skipped by their statistics, Parquet, Feather and ORC (with
+        PyArrow) and Polars scans only decode the selected columns, and the rows are filtered
+        before converting to pandas. CSV, TSV and Excel read only the needed columns; other
+        formats are read whole. Every other reader filters the rows after reading.
+
         Args:
             filepath: Path to the file
             file_format: Explicit file format (auto-detected if None)
+            columns: Columns to read (all if None)
+            filters: Row filters that must all match, as expressions such as "year >= 2020"
+                or (column, operator, value) tuples; string values are converted to the type
+                of numeric and date columns
             **kwargs: Additional arguments for specific readers
 
         Returns:
@@ -91,32 +307,331 @@ class FileReader:
         """
         if file_format is None:
             file_format = self._detect_format(filepath)
+        filters = _normalize_filters(filters)
+        pushdown = (columns is not None or bool(filters)) and HAS_PYARROW
+        arrow_formats = [FileFormat.PARQUET, FileFormat.FEATHER, FileFormat.ORC]
 
-        if self.use_polars and file_format in [FileFormat.CSV, FileFormat.PARQUET]:
-            return self._read_with_polars(filepath, file_format, **kwargs)
-        elif self.use_pyarrow and file_format == FileFormat.PARQUET:
-            return self._read_with_pyarrow(filepath, **kwargs)
+        if self.memory_map and file_format in [FileFormat.FEATHER, FileFormat.PARQUET]:
+            df = self._read_with_pyarrow(filepath, file_format, columns=columns, filters=filters, **kwargs)
+        elif self.use_polars and file_format in [FileFormat.CSV, FileFormat.PARQUET]:
+            df = self._read_with_polars(filepath, file_format, columns=columns, filters=filters, **kwargs)
+        elif (self.use_pyarrow and file_format == FileFormat.PARQUET) or (pushdown and file_format in arrow_formats):
+            df = self._read_with_pyarrow(filepath, file_format, columns=columns, filters=filters, **kwargs)
         else:
-            return self._read_with_pandas(filepath, file_format, **kwargs)
+            df = self._read_with_pandas(filepath, file_format, columns=_projected_columns(columns, filters), **kwargs)
+            df = filter_rows(df, filters, columns)
 
-    def _read_with_polars(self, filepath: Union[str, Path], file_format: FileFormat, **kwargs) -> pd.DataFrame:
-        """Read file using Polars for high performance."""
-        if file_format == FileFormat.CSV:
-            df_pl = pl.read_csv(filepath, **kwargs)
+        return self._mask_null_tokens(df, file_format)
+
+    def read_polars(
+        self,
+        filepath: Union[str, Path],
+        file_format: Optional[FileFormat] = None,
+        lazy: bool = False,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Sequence[Union[str, Filter]]] = None,
+        **kwargs,
+    ) -> Union["pl.DataFrame", "pl.LazyFrame"]:
+        """
+        Read data into a polars frame without going through pandas.
+
+        CSV, TSV, Parquet and Feather are read (or scanned, if lazy) natively by polars;
+        other formats are read with pandas and converted. Column projection and filters
+        are part of the scan, so the polars optimizer pushes them down to the reader.
+
+        Args:
+            filepath: Path to the file
+            file_format: Explicit file format (auto-detected if None)
+            lazy: Return a LazyFrame that scans the file instead of a DataFrame
+            columns: Columns to read (all if None)
+            filters: Row filters that must all match (see read_file)
+            **kwargs: Additional arguments for specific readers
+
+        Returns:
+            polars DataFrame, or LazyFrame if lazy is True
+        """
+        if not HAS_POLARS:
+            raise ImportError("polars is required to read polars frames. Install it with: pip install polars")
+        import polars as pl
+
+        if file_format is None:
+            file_format = self._detect_format(filepath)
+
+        if file_format == FileFormat.TSV:
+            kwargs["separator"] = "\t"
+        filters = _normalize_filters(filters)
+
+        if file_format in [FileFormat.CSV, FileFormat.TSV]:
+            if self.null_values:
+                kwargs.setdefault("null_values", self.null_values)
+            lf = pl.scan_csv(filepath, **kwargs)
         elif file_format == FileFormat.PARQUET:
-            df_pl = pl.read_parquet(filepath, **kwargs)
+            lf = pl.scan_parquet(filepath, **kwargs)
+        elif file_format == FileFormat.FEATHER:
+            lf = pl.scan_ipc(filepath, **kwargs)
+        else:
+            df = self._read_with_pandas(filepath, file_format, columns=_projected_columns(columns, filters), **kwargs)
+            lf = pl.from_pandas(self._mask_null_tokens(df, file_format)).lazy()
+
+        if filters:
+            lf = lf.filter(_polars_filter_expression(filters, lf.collect_schema()))
+        if columns is not None:
+            lf = lf.select(list(columns))
+        return lf if lazy else lf.collect()
+
+    def read_arrow(
+        self,
+        filepath: Union[str, Path],
+        file_format: Optional[FileFormat] = None,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Sequence[Union[str, Filter]]] = None,
+        **kwargs,
+    ) -> "pa.Table":
+        """
+        Read data into a pyarrow Table without going through pandas.
+
+        Parquet, Feather, ORC, CSV and TSV are read natively by pyarrow (CSV null tokens
+        become nulls while parsing); other formats are read with pandas and converted.
+        With memory_map, Feather and Parquet files are memory-mapped, so an uncompressed
+        Feather table references the file instead of a heap copy.
+
+        Only the selected columns (and those the filters need) are decoded. Parquet filters
+        skip row groups by their statistics; other formats filter the decoded table.
+
+        Args:
+            filepath: Path to the file
+            file_format: Explicit file format (auto-detected if None)
+            columns: Columns to read (all if None)
+            filters: Row filters that must all match (see read_file)
+            **kwargs: Additional arguments for specific readers
+
+        Returns:
+            pyarrow Table
+        """
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow is required to read Arrow tables. Install it with: pip install pyarrow")
+        import pyarrow as pa
+
+        if file_format is None:
+            file_format = self._detect_format(filepath)
+        filters = _normalize_filters(filters)
+        needed = _projected_columns(columns, filters)
+
+        if file_format == FileFormat.PARQUET:
+            import pyarrow.parquet as pq
+
+            memory_map = kwargs.pop("memory_map", self.memory_map)
+            if filters:
+                schema = pq.read_schema(filepath, memory_map=memory_map)
+                kwargs["filters"] = _arrow_filter_expression(filters, schema)
+            # The reader evaluates the filters itself, so only the requested columns are needed
+            return pq.read_table(filepath, columns=columns, memory_map=memory_map, **kwargs)
+        elif file_format == FileFormat.FEATHER:
+            import pyarrow.feather as feather
+
+            memory_map = kwargs.pop("memory_map", self.memory_map)
+            table = feather.read_table(filepath, columns=needed, memory_map=memory_map, **kwargs)
+        elif file_format == FileFormat.ORC:
+            import pyarrow.orc as orc
+
+            table = orc.read_table(filepath, columns=needed, **kwargs)
+        elif file_format in [FileFormat.CSV, FileFormat.TSV]:
+            import pyarrow.csv as csv
+
+            if file_format == FileFormat.TSV:
+                kwargs.setdefault("parse_options", csv.ParseOptions(delimiter="\t"))
+            if self.null_values or needed is not None:
+                convert_options = csv.ConvertOptions(
+                    null_values=self.null_values, strings_can_be_null=bool(self.null_values), include_columns=needed
+                )
+                kwargs.setdefault("convert_options", convert_options)
+            table = csv.read_csv(filepath, **kwargs)
+        else:
+            df = self._read_with_pandas(filepath, file_format, columns=needed, **kwargs)
+            table = pa.Table.from_pandas(self._mask_null_tokens(df, file_format), preserve_index=False)
+
+        if filters:
+            table = table.filter(_arrow_filter_expression(filters, table.schema))
+        return table.select(list(columns)) if columns is not None else table
+
+    def iter_chunks(
+        self, filepath: Union[str, Path], chunksize: int, file_format: Optional[FileFormat] = None, **kwargs
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Read data in chunks of at most chunksize rows.
+
+        CSV, TSV and line-delimited JSON are read incrementally with pandas, and Parquet
+        by row batches when PyArrow is available. With memory_map, Feather files are mapped
+        and converted one slice at a time. Other formats are read whole and sliced.
+
+        Args:
+            filepath: Path to the file
+            chunksize: Maximum number of rows per chunk
+            file_format: Explicit file format (auto-detected if None)
+            **kwargs: Additional arguments for specific readers
+
+        Yields:
+            DataFrame chunks
+        """
+        if file_format is None:
+            file_format = self._detect_format(filepath)
+
+        if file_format in [FileFormat.CSV, FileFormat.TSV]:
+            if file_format == FileFormat.TSV:
+                kwargs["sep"] = "\t"
+            if self.null_values:
+                kwargs.setdefault("na_values", self.null_values)
+            with pd.read_csv(filepath, chunksize=chunksize, **kwargs) as chunks:
+                yield from chunks
+        elif file_format == FileFormat.JSON and kwargs.get("lines"):
+            with pd.read_json(filepath, chunksize=chunksize, **kwargs) as chunks:
+                for chunk in chunks:
+                    yield self._mask_null_tokens(chunk, file_format)
+        elif file_format == FileFormat.PARQUET and HAS_PYARROW:
+            import pyarrow.parquet as pq
+
+            parquet_file = pq.ParquetFile(filepath)
+            for batch in parquet_file.iter_batches(batch_size=chunksize, **kwargs):
+                yield self._mask_null_tokens(batch.to_pandas(), file_format)
+        elif file_format == FileFormat.FEATHER and self.memory_map:
+            table = self.read_arrow(filepath, file_format=file_format, **kwargs)
+            for start in range(0, table.num_rows, chunksize):
+                yield self._mask_null_tokens(table.slice(start, chunksize).to_pandas(split_blocks=True), file_format)
         else:
+            df = self.read_file(filepath, file_format=file_format, **kwargs)
+            for start in range(0, len(df), chunksize):
+                yield df.iloc[start : start + chunksize]
+
+    def read_sample(
+        self,
+        filepath: Union[str, Path],
+        size: int = 1000,
+        method: Union[SamplingMethod, str] = SamplingMethod.STRATIFIED,
+        n_strata: int = 10,
+        chunksize: int = 100_000,
+        file_format: Optional[FileFormat] = None,
+        seed: int = 42,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """
+        Read a sample of at most size rows, e.g. for datatype detection on a large file.
+
+        The reservoir method reads the file once in chunks and keeps a uniform sample. The
+        stratified method spreads the sample over the whole file, so patterns that only
+        appear in its last rows are still seen. CSV/TSV files are not read in full: one line
+        is read at each of size evenly spaced byte offsets (which assumes no quoted line
+        breaks). Parquet files (with PyArrow) are sampled evenly from n_strata evenly spaced
+        row groups, the first and last included, and the other row groups are not read.
+        Other formats are streamed with iter_chunks into a StratifiedSample.
+
+        Args:
+            filepath: Path to the file
+            size: Maximum number of rows returned
+            method: Sampling method (stratified, reservoir)
+            n_strata: Number of position strata of the stratified method
+            chunksize: Rows read at a time when the file is streamed
+            file_format: Explicit file format (auto-detected if None)
+            seed: Seed for the random number generators
+            **kwargs: Additional arguments for specific readers
+
+        Returns:
+            DataFrame with the sampled rows in file order
+        """
+        if file_format is None:
+            file_format = self._detect_format(filepath)
+        method = SamplingMethod(method) if isinstance(method, str) else method
+
+        if method == SamplingMethod.STRATIFIED and file_format in [FileFormat.CSV, FileFormat.TSV]:
+            return self._sample_csv(filepath, size, file_format, **kwargs)
+        if method == SamplingMethod.STRATIFIED and file_format == FileFormat.PARQUET and HAS_PYARROW:
+            return self._sample_parquet(filepath, size, n_strata)
+
+        if method == SamplingMethod.STRATIFIED:
+            sampler: Union[StratifiedSample, RowReservoir] = StratifiedSample(size, n_strata, seed=seed)
+        else:
+            sampler = RowReservoir(size, seed=seed)
+        for chunk in self.iter_chunks(filepath, chunksize, file_format=file_format, **kwargs):
+            sampler.update(chunk)
+        return sampler.sample
+
+    def _sample_csv(self, filepath: Union[str, Path], size: int, file_format: FileFormat, **kwargs) -> pd.DataFrame:
+        """Read the first line starting at each of size evenly spaced byte offsets of a CSV/TSV file."""
+        lines: List[bytes] = []
+        with open(filepath, "rb") as f:
+            header = f.readline()
+            start = position = f.tell()
+            end = f.seek(0, os.SEEK_END)
+
+            for i in range(size):
+                offset = start + (end - start) * i // size
+                if offset > position:
+                    # Skip the rest of the line the offset falls into
+                    f.seek(offset - 1)
+                    f.readline()
+                else:
+                    # Small files: offsets fall into lines already read, take the next one
+                    f.seek(position)
+                line = f.readline()
+                if not line:
+                    break
+                lines.append(line if line.endswith(b"\n") else line + b"\n")
+                position = f.tell()
+
+        if file_format == FileFormat.TSV:
+            kwargs["sep"] = "\t"
+        if self.null_values:
+            kwargs.setdefault("na_values", self.null_values)
+        return pd.read_csv(io.BytesIO(header + b"".join(lines)), **kwargs)
+
+    def _sample_parquet(self, filepath: Union[str, Path], size: int, n_strata: int) -> pd.DataFrame:
+        """Sample rows evenly from n_strata evenly spaced row groups (first and last included) of a Parquet file."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(filepath)
+        n_groups = parquet_file.metadata.num_row_groups
+        groups = np.unique(np.round(np.linspace(0, n_groups - 1, min(n_strata, n_groups))).astype(int))
+        per_group = math.ceil(size / max(len(groups), 1))
+
+        pieces = []
+        for group in groups:
+            n_rows = parquet_file.metadata.row_group(group).num_rows
+            rows = np.unique(np.linspace(0, n_rows - 1, min(per_group, n_rows)).astype(np.int64))
+            pieces.append(parquet_file.read_row_group(group).take(pa.array(rows)))
+
+        table = pa.concat_tables(pieces) if pieces else parquet_file.schema_arrow.empty_table()
+        return self._mask_null_tokens(table.to_pandas(), FileFormat.PARQUET)
+
+    def _read_with_polars(self, filepath: Union[str, Path], file_format: FileFormat, **kwargs) -> pd.DataFrame:
+        """Read file using Polars for high performance."""
+        if file_format not in [FileFormat.CSV, FileFormat.PARQUET]:
             raise ValueError(f"Polars doesn't support {file_format}")
 
-        return df_pl.to_pandas()
+        # read_polars returns a LazyFrame only with lazy=True
+        return cast("pl.DataFrame", self.read_polars(filepath, file_format=file_format, **kwargs)).to_pandas()
+
+    def _read_with_pyarrow(
+        self, filepath: Union[str, Path], file_format: FileFormat = FileFormat.PARQUET, **kwargs
+    ) -> pd.DataFrame:
+        """Read Parquet or Feather file using PyArrow for optimized I/O."""
+        table = self.read_arrow(filepath, file_format=file_format, **kwargs)
+        # split_blocks lets numeric columns without nulls reference the (mapped) Arrow buffers
+        return table.to_pandas(split_blocks=self.memory_map)
 
-    def _read_with_pyarrow(self, filepath: Union[str, Path], **kwargs) -> pd.DataFrame:
-        """Read Parquet file using PyArrow for optimized I/O."""
-        table = pq.read_table(filepath, **kwargs)
-        return table.to_pandas()
+    def _read_with_pandas(
+        self, filepath: Union[str, Path], file_format: FileFormat, columns: Optional[Sequence[str]] = None, **kwargs
+    ) -> pd.DataFrame:
+        """Read file using pandas, reading only the given columns where the reader supports it."""
+        if self.null_values and file_format in [FileFormat.CSV, FileFormat.TSV]:
+            # Parsed as missing on top of pandas' default NA strings
+            kwargs.setdefault("na_values", self.null_values)
+
+        if columns is not None:
+            if file_format in [FileFormat.CSV, FileFormat.TSV, FileFormat.XLSX, FileFormat.XLS, FileFormat.EXCEL]:
+                kwargs["usecols"] = list(columns)
+            elif file_format in [FileFormat.PARQUET, FileFormat.FEATHER, FileFormat.ORC]:
+                kwargs["columns"] = list(columns)
 
-    def _read_with_pandas(self, filepath: Union[str, Path], file_format: FileFormat, **kwargs) -> pd.DataFrame:
-        """Read file using pandas."""
         if file_format == FileFormat.CSV:
             return pd.read_csv(filepath, **kwargs)
         elif file_format == FileFormat.JSON:
@@ -137,21 +652,90 @@ class FileReader:
             raise ValueError(f"Unsupported file format: {file_format}")
 
 
-class FileWriter:
+# Datatypes whose columns repeat a few distinct values, dictionary-encoded in Parquet
+DICTIONARY_TYPES = [DataType.CATEGORICAL, DataType.BINARY, DataType.STRING, DataType.TEMPORAL]
+
+# Directory name of the rows whose partition value is missing (as in Hive and Spark)
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+def _partition_name(value: Any) -> str:
+    """Return the escaped directory name of a partition value."""
+    if pd.isna(value):
+        return NULL_PARTITION
+    return quote(str(value), safe="")
+
+
+@dataclass
+class ParquetOptions:
     """
-    Universal file writer supporting multiple formats.
+    Row group layout and encoding of the Parquet files written by FileWriter with PyArrow.
+
+    Attributes:
+        compression: Codec (zstd, lz4, snappy, gzip, brotli or none)
+        compression_level: Codec level (the codec's default if None)
+        row_group_size: Target number of rows per row group
+        row_group_bytes: Target in-memory bytes per row group, converted to rows with the
+            average row size (used when row_group_size is None)
+        dictionary_types: Datatypes whose columns are dictionary-encoded when the datatypes
+            are known; other columns (scaled numbers, IDs, long text) are plain-encoded
     """
 
-    def __init__(self, use_polars: bool = False, use_pyarrow: bool = False):
+    compression: str = "snappy"
+    compression_level: Optional[int] = None
+    row_group_size: Optional[int] = None
+    row_group_bytes: Optional[int] = None
+    dictionary_types: List[DataType] = field(default_factory=lambda: list(DICTIONARY_TYPES))
+
+    def writer_kwargs(self, table: "pa.Table", datatypes: Optional[DataTypeDict] = None) -> Dict[str, Any]:
+        """
+        Return the pyarrow.parquet writer arguments for a table.
+
+        Args:
+            table: Table to write
+            datatypes: Detected datatypes of its columns (dictionary encoding for all columns if None)
+
+        Returns:
+            Keyword arguments for pq.write_table and pq.ParquetWriter
+        """
+        import pyarrow as pa
+
+        kwargs: Dict[str, Any] = {"compression": self.compression}
+        if self.compression_level is not None:
+            kwargs["compression_level"] = self.compression_level
+        if datatypes is not None:
+            kwargs["use_dictionary"] = [
+                col
+                for col in table.column_names
+                if datatypes.get(col) in self.dictionary_types or pa.types.is_dictionary(table.schema.field(col).type)
+            ]
+        return kwargs
+
+    def rows_per_group(self, table: "pa.Table") -> Optional[int]:
+        """Return the number of rows per row group for a table (the writer's default if None)."""
+        if self.row_group_size is not None:
+            return self.row_group_size
+        if self.row_group_bytes is not None and table.num_rows:
+            return max(1, int(self.row_group_bytes * table.num_rows // max(table.nbytes, 1)))
+        return None
+
+
+class FileWriter:
+    """Universal file writer supporting multiple formats."""
+
+    def __init__(self, use_polars: bool = False, use_pyarrow: bool = False, parquet_options: Optional[ParquetOptions] = None):
         """
         Initialize the FileWriter.
 
         Args:
             use_polars: Use Polars for high-performance operations if available
             use_pyarrow: Use PyArrow for optimized I/O operations if available
+            parquet_options: Row group size, compression and dictionary encoding of Parquet
+                output; Parquet files are then written with PyArrow
         """
         self.use_polars = use_polars and HAS_POLARS
         self.use_pyarrow = use_pyarrow and HAS_PYARROW
+        self.parquet_options = parquet_options
 
     def _detect_format(self, filepath: Union[str, Path]) -> FileFormat:
         """Detect file format from file extension."""
@@ -174,42 +758,262 @@ class FileWriter:
         return format_mapping.get(extension, FileFormat.CSV)
 
     def write_file(
-        self, df: pd.DataFrame, filepath: Union[str, Path], file_format: Optional[FileFormat] = None, **kwargs
+        self,
+        df: pd.DataFrame,
+        filepath: Union[str, Path],
+        file_format: Optional[FileFormat] = None,
+        datatypes: Optional[DataTypeDict] = None,
+        **kwargs,
     ) -> None:
         """
         Write DataFrame to various file formats.
 
         Args:
-            df: DataFrame to write
+            df: DataFrame to write (polars DataFrames and LazyFrames and pyarrow Tables are also accepted)
             filepath: Output file path
             file_format: Explicit file format (auto-detected if None)
+            datatypes: Detected datatypes, choosing the dictionary-encoded columns of Parquet
+                files written with parquet_options
             **kwargs: Additional arguments for specific writers
         """
         if file_format is None:
             file_format = self._detect_format(filepath)
 
+        if file_format == FileFormat.PARQUET and self.parquet_options is not None and HAS_PYARROW:
+            self._write_parquet(self._to_arrow(df), filepath, datatypes, **kwargs)
+            return
+
+        if is_polars_frame(df):
+            import polars as pl
+
+            if isinstance(df, pl.LazyFrame):
+                df = df.collect()
+            if file_format in [FileFormat.CSV, FileFormat.TSV, FileFormat.PARQUET, FileFormat.FEATHER]:
+                self._write_with_polars(df, filepath, file_format, **kwargs)
+                return
+            df = df.to_pandas()
+
+        if is_arrow_table(df):
+            if file_format in [FileFormat.CSV, FileFormat.TSV, FileFormat.PARQUET, FileFormat.FEATHER, FileFormat.ORC]:
+                self._write_with_pyarrow(df, filepath, file_format, **kwargs)
+                return
+            df = df.to_pandas()
+
         if self.use_polars and file_format in [FileFormat.CSV, FileFormat.PARQUET]:
             self._write_with_polars(df, filepath, file_format, **kwargs)
         elif self.use_pyarrow and file_format == FileFormat.PARQUET:
-            self._write_with_pyarrow(df, filepath, **kwargs)
+            self._write_with_pyarrow(df, filepath, file_format, **kwargs)
         else:
             self._write_with_pandas(df, filepath, file_format, **kwargs)
 
+    def write_chunks(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        filepath: Union[str, Path],
+        file_format: Optional[FileFormat] = None,
+        datatypes: Optional[DataTypeDict] = None,
+        **kwargs,
+    ) -> int:
+        """
+        Write a sequence of DataFrames to a single file.
+
+        CSV and TSV chunks are appended with pandas and Parquet chunks are written as row
+        groups with PyArrow, so only one chunk is held in memory. With a row group target in
+        parquet_options, chunks are buffered until a row group is full, so the layout does
+        not depend on the chunk size. Other formats are concatenated and written at once.
+
+        Args:
+            chunks: DataFrames with the same columns
+            filepath: Output file path
+            file_format: Explicit file format (auto-detected if None)
+            datatypes: Detected datatypes, choosing the dictionary-encoded Parquet columns
+            **kwargs: Additional arguments for specific writers
+
+        Returns:
+            Number of rows written
+        """
+        if file_format is None:
+            file_format = self._detect_format(filepath)
+
+        rows = 0
+        if file_format in [FileFormat.CSV, FileFormat.TSV]:
+            if file_format == FileFormat.TSV:
+                kwargs["sep"] = "\t"
+            first = True
+            for chunk in chunks:
+                chunk.to_csv(filepath, mode="w" if first else "a", header=first, index=False, quoting=1, **kwargs)
+                rows += len(chunk)
+                first = False
+            if first:
+                Path(filepath).write_text("")
+        elif file_format == FileFormat.PARQUET and HAS_PYARROW:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            options = self.parquet_options
+            writer = None
+            target = None
+            buffered = None
+            try:
+                for chunk in chunks:
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        writer_kwargs = options.writer_kwargs(table, datatypes) if options is not None else {}
+                        writer = pq.ParquetWriter(filepath, table.schema, **{**writer_kwargs, **kwargs})
+                        target = options.rows_per_group(table) if options is not None else None
+                    else:
+                        table = table.cast(writer.schema)
+                    rows += len(chunk)
+
+                    if target is None:
+                        writer.write_table(table)
+                        continue
+                    buffered = table if buffered is None else pa.concat_tables([buffered, table])
+                    full = buffered.num_rows // target * target
+                    if full:
+                        writer.write_table(buffered.slice(0, full), row_group_size=target)
+                        buffered = buffered.slice(full)
+                if writer is not None and buffered is not None and buffered.num_rows:
+                    writer.write_table(buffered)
+            finally:
+                if writer is not None:
+                    writer.close()
+            if writer is None:
+                self.write_file(pd.DataFrame(), filepath, file_format=file_format)
+        else:
+            frames = list(chunks)
+            df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+            self.write_file(df, filepath, file_format=file_format, **kwargs)
+            rows = len(df)
+
+        return rows
+
+    def write_dataset(
+        self,
+        df: pd.DataFrame,
+        path: Union[str, Path],
+        partition_by: Union[str, Sequence[str]],
+        datatypes: Optional[DataTypeDict] = None,
+        workers: int = 1,
+        **kwargs,
+    ) -> int:
+        """
+        Write a Hive-partitioned Parquet dataset, as read by Spark, DuckDB, Polars and PyArrow.
+
+        The rows of each combination of partition values are written, without the partition
+        columns, to path/col=value/part-0.parquet with parquet_options (values are
+        URL-escaped and missing values go to col=__HIVE_DEFAULT_PARTITION__). Partitions are
+        written by workers threads; PyArrow releases the GIL while encoding and compressing.
+
+        Args:
+            df: DataFrame to write (polars DataFrames and LazyFrames and pyarrow Tables are also accepted)
+            path: Dataset directory, which must not exist or be empty
+            partition_by: Column(s) whose values name the partition directories
+            datatypes: Detected datatypes, choosing the dictionary-encoded columns
+            workers: Number of partitions written concurrently
+            **kwargs: Additional arguments for pq.write_table
+
+        Returns:
+            Number of partitions written
+        """
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow is required to write Parquet datasets. Install it with: pip install pyarrow")
+        import pyarrow as pa
+
+        partition_by = [partition_by] if isinstance(partition_by, str) else list(partition_by)
+        table = self._to_arrow(df)
+        missing = [col for col in partition_by if col not in table.column_names]
+        if missing:
+            raise ValueError(f"Partition columns not found: {missing}")
+
+        root = Path(path)
+        if root.exists() and (not root.is_dir() or any(root.iterdir())):
+            raise FileExistsError(f"Dataset directory '{root}' already exists and is not empty")
+        root.mkdir(parents=True, exist_ok=True)
+
+        keys = pd.DataFrame({col: table.column(col).to_pandas() for col in partition_by})
+        groups = keys.groupby(partition_by, dropna=False, sort=True).indices
+        data = table.drop_columns(partition_by)
+
+        def write_partition(item: Tuple[Any, np.ndarray]) -> None:
+            values, rows = item
+            values = values if isinstance(values, tuple) else (values,)
+            directory = root.joinpath(*(f"{col}={_partition_name(value)}" for col, value in zip(partition_by, values)))
+            directory.mkdir(parents=True, exist_ok=True)
+            self._write_parquet(data.take(pa.array(rows)), directory / "part-0.parquet", datatypes, **kwargs)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(write_partition, groups.items()))
+        return len(groups)
+
+    def _to_arrow(self, df: Any) -> "pa.Table":
+        """Convert a pandas or polars frame to a pyarrow Table (Tables are returned as they are)."""
+        import pyarrow as pa
+
+        if is_arrow_table(df):
+            return df
+        if is_polars_frame(df):
+            import polars as pl
+
+            return (df.collect() if isinstance(df, pl.LazyFrame) else df).to_arrow()
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+    def _write_parquet(
+        self, table: "pa.Table", filepath: Union[str, Path], datatypes: Optional[DataTypeDict] = None, **kwargs
+    ) -> None:
+        """Write a Parquet file with PyArrow and parquet_options (the defaults if None)."""
+        import pyarrow.parquet as pq
+
+        options = self.parquet_options or ParquetOptions()
+        kwargs = {**options.writer_kwargs(table, datatypes), **kwargs}
+        kwargs.setdefault("row_group_size", options.rows_per_group(table))
+        pq.write_table(table, filepath, **kwargs)
+
     def _write_with_polars(self, df: pd.DataFrame, filepath: Union[str, Path], file_format: FileFormat, **kwargs) -> None:
         """Write file using Polars for high performance."""
-        df_pl = pl.from_pandas(df)
+        import polars as pl
+
+        df_pl = df if isinstance(df, pl.DataFrame) else pl.from_pandas(df)
 
         if file_format == FileFormat.CSV:
             df_pl.write_csv(filepath, **kwargs)
+        elif file_format == FileFormat.TSV:
+            df_pl.write_csv(filepath, separator="\t", **kwargs)
         elif file_format == FileFormat.PARQUET:
             df_pl.write_parquet(filepath, **kwargs)
+        elif file_format == FileFormat.FEATHER:
+            df_pl.write_ipc(filepath, **kwargs)
         else:
             raise ValueError(f"Polars doesn't support {file_format}")
 
-    def _write_with_pyarrow(self, df: pd.DataFrame, filepath: Union[str, Path], **kwargs) -> None:
-        """Write Parquet file using PyArrow for optimized I/O."""
-        table = pa.Table.from_pandas(df)
-        pq.write_table(table, filepath, **kwargs)
+    def _write_with_pyarrow(
+        self, df: pd.DataFrame, filepath: Union[str, Path], file_format: FileFormat = FileFormat.PARQUET, **kwargs
+    ) -> None:
+        """Write file using PyArrow for optimized I/O (pyarrow Tables are written as they are)."""
+        import pyarrow as pa
+
+        table = df if isinstance(df, pa.Table) else pa.Table.from_pandas(df)
+
+        if file_format == FileFormat.PARQUET:
+            import pyarrow.parquet as pq
+
+            pq.write_table(table, filepath, **kwargs)
+        elif file_format == FileFormat.FEATHER:
+            import pyarrow.feather as feather
+
+            feather.write_feather(table, filepath, **kwargs)
+        elif file_format == FileFormat.ORC:
+            import pyarrow.orc as orc
+
+            orc.write_table(table, filepath, **kwargs)
+        elif file_format in [FileFormat.CSV, FileFormat.TSV]:
+            import pyarrow.csv as csv
+
+            if file_format == FileFormat.TSV:
+                kwargs.setdefault("write_options", csv.WriteOptions(delimiter="\t"))
+            csv.write_csv(table, filepath, **kwargs)
+        else:
+            raise ValueError(f"PyArrow doesn't support {file_format}")
 
     def _write_with_pandas(self, df: pd.DataFrame, filepath: Union[str, Path], file_format: FileFormat, **kwargs) -> None:
         """Write file using pandas."""
@@ -0,0 +1,116 @@
+"""
+Overlapped chunk pipelines for the prepo package.
+
+This module contains read_ahead, which reads chunks in a background thread, and
+map_ordered, which transforms them in a thread pool and yields the results in input
+order. Both hold at most queue_size chunks ahead of their consumer, so a slow stage
+applies backpressure instead of letting the queues grow. Chained as
+
+    writer.write_chunks(map_ordered(transform, read_ahead(chunks)), path)
+
+reading, processing and writing run concurrently and the throughput approaches the
+speed of the slowest stage instead of the sum of all three.
+"""
+
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_DONE = object()
+
+
+class _Failure:
+    """An exception raised by a producer thread, re-raised in the consumer."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def read_ahead(items: Iterable[T], queue_size: int = 2) -> Iterator[T]:
+    """
+    Iterate over items while a background thread produces the next ones.
+
+    Args:
+        items: Iterable to consume in the background (e.g. FileReader.iter_chunks)
+        queue_size: Maximum number of items produced ahead of the consumer
+
+    Returns:
+        Iterator over the items, in order; an exception raised by the iterable is re-raised
+        where the failing item would have been yielded
+    """
+    if queue_size <= 0:
+        raise ValueError(f"queue_size must be positive, got {queue_size}")
+
+    buffer: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        # Retry with a timeout so the thread notices when the consumer stops early
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put(item):
+                    return
+        except BaseException as e:
+            put(_Failure(e))
+            return
+        put(_DONE)
+
+    thread = threading.Thread(target=produce, name="prepo-read-ahead", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def map_ordered(func: Callable[[T], R], items: Iterable[T], workers: int = 1, queue_size: int = 2) -> Iterator[R]:
+    """
+    Apply func to items in a thread pool and yield the results in input order.
+
+    At most workers + queue_size items are submitted ahead of the consumer.
+
+    Args:
+        func: Function applied to each item (e.g. FeaturePreProcessor.transform)
+        items: Items to transform
+        workers: Number of threads running func
+        queue_size: Number of finished or pending results kept ahead of the running ones
+
+    Returns:
+        Iterator over func(item) for each item, in order
+    """
+    if workers <= 0:
+        raise ValueError(f"workers must be positive, got {workers}")
+
+    pending: Deque = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prepo-transform") as executor:
+        try:
+            for item in items:
+                pending.append(executor.submit(func, item))
+                if len(pending) >= workers + queue_size:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
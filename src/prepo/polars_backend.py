@@ -0,0 +1,220 @@
+"""
+Polars execution backend for the prepo package.
+
+This module contains the PolarsBackend class, which runs the FeaturePreProcessor
+pipeline on polars DataFrames and LazyFrames. Cleaning, outlier removal and scaling
+are expressed as lazy polars expressions, so each pipeline is planned once and run
+by the multithreaded polars engine.
+"""
+
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .dependencies import HAS_POLARS
+from .imputation import NumericImputer
+from .types import DataType, DataTypeDict, ImputeStrategy, ScalerType
+
+if TYPE_CHECKING:
+    from .preprocessor import FeaturePreProcessor
+
+# This module is imported on first use, so polars is only loaded when it is needed
+if HAS_POLARS or TYPE_CHECKING:
+    import polars as pl
+
+
+class PolarsBackend:
+    """
+    Polars implementation of determine_datatypes, clean_data, clean_outliers, scaler and process.
+
+    Datatypes are decided on the same row sample as the pandas path (the sampled rows are
+    gathered in polars and handed to the pandas decision rules), so both backends detect
+    identical types. KNN imputation collects the numeric block and runs NumericImputer;
+    every other step stays lazy until the result is collected.
+    """
+
+    def __init__(self, processor: "FeaturePreProcessor"):
+        """
+        Initialize the PolarsBackend.
+
+        Args:
+            processor: FeaturePreProcessor providing the detection rules and settings
+        """
+        if not HAS_POLARS:
+            raise ImportError("polars is required for the Polars backend. Install it with: pip install polars")
+        self.processor = processor
+
+    def determine_datatypes(self, df: Union["pl.DataFrame", "pl.LazyFrame"]) -> DataTypeDict:
+        """
+        Determine the data type of each column.
+
+        Args:
+            df: polars DataFrame or LazyFrame
+
+        Returns:
+            Dictionary mapping column names to their inferred data types
+        """
+        lf = df.lazy()
+        n_rows = lf.select(pl.len()).collect().item()
+        sample_size = min(self.processor.sample_size, n_rows)
+
+        if sample_size > 100:
+            # The rows pandas' df.sample(sample_size, random_state=42) would pick
+            positions = np.random.RandomState(42).choice(n_rows, size=sample_size, replace=False)
+            sample = lf.with_row_index("__prepo_row").filter(pl.col("__prepo_row").is_in(positions)).drop("__prepo_row")
+        else:
+            sample = lf
+
+        sample_pd = pd.DataFrame(sample.collect().to_dict(as_series=False))
+        return self.processor.determine_datatypes(sample_pd)
+
+    def _normalize(self, lf: "pl.LazyFrame", datatypes: DataTypeDict) -> "pl.LazyFrame":
+        """Standardize null representations and convert numeric columns to numeric types."""
+        from .preprocessor import NUMERIC_TYPES
+
+        exprs = []
+        for col, dtype in lf.collect_schema().items():
+            expr = pl.col(col)
+            is_float = dtype.is_float()
+
+            if dtype == pl.String:
+                expr = pl.when(expr.is_in(self.processor.null_values)).then(pl.lit(None, dtype=pl.String)).otherwise(expr)
+                if datatypes[col] in NUMERIC_TYPES:
+                    expr = expr.str.strip_chars().cast(pl.Float64, strict=False)
+                    is_float = True
+
+            # NaN counts as missing, as in pandas
+            if is_float:
+                expr = expr.fill_nan(None)
+            exprs.append(expr.alias(col))
+
+        return lf.with_columns(exprs)
+
+    def _clean(self, lf: "pl.LazyFrame", datatypes: DataTypeDict, drop_na: bool) -> "pl.LazyFrame":
+        """Normalize and drop or impute missing values."""
+        from .preprocessor import NUMERIC_TYPES
+
+        lf = self._normalize(lf, datatypes)
+        if drop_na:
+            return lf.drop_nulls()
+
+        columns = lf.collect_schema().names()
+        numeric_cols = [col for col in columns if datatypes[col] in NUMERIC_TYPES]
+        categorical_cols = [col for col in columns if datatypes[col] == DataType.CATEGORICAL]
+        other_cols = [col for col in columns if col not in numeric_cols and col not in categorical_cols]
+
+        if other_cols:
+            lf = lf.drop_nulls(subset=other_cols)
+
+        strategy = self.processor.impute_strategy
+        if numeric_cols and strategy == ImputeStrategy.KNN:
+            collected = lf.collect()
+            block = pd.DataFrame(collected.select(numeric_cols).to_numpy(), columns=numeric_cols, dtype=float)
+            imputer = NumericImputer(strategy, n_neighbors=self.processor.n_neighbors)
+            filled = imputer.fit_transform(block)
+            lf = collected.with_columns([pl.Series(col, filled[col].to_numpy()) for col in numeric_cols]).lazy()
+        elif numeric_cols:
+            group_by = None
+            if strategy == ImputeStrategy.GROUPED_MEDIAN:
+                group_by = self.processor.impute_group_by or next(iter(categorical_cols), None)
+            lf = lf.with_columns([self._median_fill_expr(col, group_by) for col in numeric_cols])
+
+        if categorical_cols:
+            lf = lf.with_columns(
+                [pl.col(col).fill_null(pl.col(col).drop_nulls().mode().sort().first()) for col in categorical_cols]
+            )
+
+        return lf
+
+    def _median_fill_expr(self, col: str, group_by: Optional[str]) -> "pl.Expr":
+        """Return an expression filling a column with its (group) median."""
+        expr = pl.col(col)
+        if group_by is not None:
+            # Missing groups fall back to the overall median, as in the pandas path
+            group_median = pl.when(pl.col(group_by).is_not_null()).then(pl.col(col).median().over(group_by))
+            expr = expr.fill_null(group_median)
+        return expr.fill_null(pl.col(col).median()).alias(col)
+
+    def _outlier_mask(self, col: str) -> "pl.Expr":
+        """Return an expression that is True for values within the column's IQR bounds."""
+        q1 = pl.col(col).quantile(0.25, "linear")
+        q3 = pl.col(col).quantile(0.75, "linear")
+        iqrv = q3 - q1
+        return pl.col(col).is_between(q1 - 1.5 * iqrv, q3 + 1.5 * iqrv)
+
+    def _filter_outliers(self, lf: "pl.LazyFrame", datatypes: DataTypeDict, sequential: bool) -> "pl.LazyFrame":
+        """Remove outliers with lazily evaluated IQR bounds."""
+        cols = [col for col in lf.collect_schema().names() if self.processor._is_outlier_column(col, datatypes[col])]
+        if not cols:
+            return lf
+
+        if sequential:
+            # Each filter computes its quartiles on the rows kept by the previous one
+            for col in cols:
+                lf = lf.filter(self._outlier_mask(col))
+            return lf
+
+        return lf.filter(pl.all_horizontal([self._outlier_mask(col) for col in cols]))
+
+    def _scale_expr(self, col: str, scaler_type: ScalerType) -> "pl.Expr":
+        """Return an expression scaling a column with statistics of the same frame."""
+        x = pl.col(col)
+        if scaler_type == ScalerType.STANDARD:
+            center, scale = x.mean(), x.std()
+        elif scaler_type == ScalerType.ROBUST:
+            center, scale = x.median(), x.quantile(0.75, "linear") - x.quantile(0.25, "linear")
+        else:
+            center, scale = x.min(), x.max() - x.min()
+        return pl.when(scale == 0).then(x - center).otherwise((x - center) / scale).alias(col)
+
+    def _scale(
+        self, lf: "pl.LazyFrame", scaler_type: ScalerType, datatypes: Optional[Mapping[str, Union[DataType, str]]]
+    ) -> "pl.LazyFrame":
+        """Scale the scalable columns."""
+        if scaler_type == ScalerType.NONE or datatypes is None:
+            return lf
+        cols = self.processor._scalable_columns(lf.collect_schema().names(), datatypes)
+        return lf.with_columns([self._scale_expr(col, scaler_type) for col in cols])
+
+    def _finish(
+        self, lf: "pl.LazyFrame", like: Union["pl.DataFrame", "pl.LazyFrame"]
+    ) -> Union["pl.DataFrame", "pl.LazyFrame"]:
+        """Return a LazyFrame for lazy input and a collected DataFrame otherwise."""
+        return lf if isinstance(like, pl.LazyFrame) else lf.collect()
+
+    def clean_data(
+        self, df: Union["pl.DataFrame", "pl.LazyFrame"], drop_na: bool = True
+    ) -> Tuple[Union["pl.DataFrame", "pl.LazyFrame"], DataTypeDict]:
+        """Polars version of FeaturePreProcessor.clean_data."""
+        datatypes = self.determine_datatypes(df)
+        return self._finish(self._clean(df.lazy(), datatypes, drop_na), df), datatypes
+
+    def clean_outliers(self, df: Union["pl.DataFrame", "pl.LazyFrame"], dt: DataTypeDict, sequential: bool = True):
+        """Polars version of FeaturePreProcessor.clean_outliers."""
+        return self._finish(self._filter_outliers(df.lazy(), dt, sequential), df)
+
+    def scaler(
+        self,
+        df: Union["pl.DataFrame", "pl.LazyFrame"],
+        scaler_type: ScalerType,
+        datatypes: Optional[Dict[str, Union[DataType, str]]] = None,
+    ):
+        """Polars version of FeaturePreProcessor.scaler; returns the scaled frame."""
+        return self._finish(self._scale(df.lazy(), scaler_type, datatypes), df)
+
+    def process(
+        self,
+        df: Union["pl.DataFrame", "pl.LazyFrame"],
+        drop_na: bool,
+        scaler_type: ScalerType,
+        remove_outlier: bool,
+        sequential_outliers: bool,
+    ):
+        """Polars version of FeaturePreProcessor.process."""
+        datatypes = self.determine_datatypes(df)
+        lf = self._clean(df.lazy(), datatypes, drop_na)
+        if remove_outlier:
+            lf = self._filter_outliers(lf, datatypes, sequential_outliers)
+        lf = self._scale(lf, scaler_type, datatypes)
+        return self._finish(lf, df)
@@ -5,32 +5,80 @@ This module contains the main FeaturePreProcessor class that provides
 methods for cleaning, scaling, and processing pandas DataFrames.
 """
 
-from typing import Any, Dict, List, Optional, Tuple, Union
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import replace
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
-from dateutil.parser import parse
-from scipy.stats import iqr
-from sklearn.impute import KNNImputer
 
-from .types import DataType, DataTypeDict, ScalerType
-
-# Optional high-performance libraries
-try:
-    import polars as pl
-
-    HAS_POLARS = True
-except ImportError:
-    pl = None
-    HAS_POLARS = False
-
-try:
-    import pyarrow as pa
-
-    HAS_PYARROW = True
-except ImportError:
-    pa = None
-    HAS_PYARROW = False
+from .cache import DatatypeCache
+from .dependencies import HAS_POLARS, HAS_PYARROW, is_arrow_table, is_polars_frame
+from .dtypes import DtypeReport, optimize_dtypes
+from .imputation import NumericImputer, fill_missing
+from .instrumentation import StageHook, StageMetrics
+from .io import mask_null_tokens
+from .state import FittedState
+from .stats import HeavyHitters, HyperLogLog, RunningStats
+from .types import DataType, DataTypeDict, ImputeStrategy, ParallelBackend, ScalerType
+
+# The backends are imported on first use, so polars and pyarrow are only loaded when needed
+if TYPE_CHECKING:
+    from .arrow_backend import ArrowBackend
+    from .polars_backend import PolarsBackend
+
+# pandas < 2.0 has no format="ISO8601", which covers ISO dates and times with any
+# precision, "T" separator, "Z" suffix or UTC offset
+if int(pd.__version__.split(".")[0]) >= 2:
+    ISO_FORMATS = ["ISO8601"]
+else:
+    ISO_FORMATS = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S.%f"]
+
+# Candidate formats tried (vectorized) before falling back to dateutil
+DATE_FORMATS = ISO_FORMATS + [
+    "%Y-%m-%d %H:%M",
+    "%Y/%m/%d",
+    "%Y/%m/%d %H:%M:%S",
+    "%m/%d/%Y",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %I:%M %p",
+    "%d/%m/%Y",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y %H:%M:%S",
+    "%m-%d-%Y",
+    "%d-%m-%Y",
+    "%d.%m.%Y",
+    "%H:%M:%S",
+    "%H:%M",
+    "%b %d %Y",
+    "%b %d, %Y",
+    "%B %d %Y",
+    "%B %d, %Y",
+    "%d %b %Y",
+    "%d %B %Y",
+    "%b %d, %Y %I%p",
+    "%b %d, %Y %I:%M %p",
+    "%B %d, %Y %I:%M %p",
+    "%a, %d %b %Y %H:%M:%S",
+]
+
+# Tokens treated as missing values
+NULL_VALUES = ["?", "Error", "na", "NA", "ERROR", "error", "err", "ERR", "NAType", "natype", "UNKNOWN", "unknown", ""]
+
+# Data types that are converted to numbers, imputed, outlier-filtered and scaled
+NUMERIC_TYPES = [DataType.NUMERIC, DataType.PRICE, DataType.PERCENTAGE, DataType.INTEGER]
+
+
+def _detect_column_buffer(buffer: Tuple[str, np.ndarray, Any], approximate_cardinality: bool = False) -> DataType:
+    """Detect the data type of a column sent to a worker process as (name, values, dtype)."""
+    col, values, dtype = buffer
+    processor = FeaturePreProcessor(approximate_cardinality=approximate_cardinality)
+    return processor._detect_column(col, pd.Series(values, dtype=dtype, name=col))
 
 
 class FeaturePreProcessor:
@@ -43,19 +91,60 @@ class FeaturePreProcessor:
     - KNN imputation for missing values
     - Multiple scaling methods (standard, robust, minmax)
     - Outlier removal using IQR method
-    - Optional Polars/PyArrow optimizations
+    - Optional Polars/PyArrow optimizations; polars DataFrames and LazyFrames are
+      processed natively by PolarsBackend and pyarrow Tables by ArrowBackend
     """
 
-    def __init__(self, use_polars: bool = False, use_pyarrow: bool = False):
+    def __init__(
+        self,
+        use_polars: bool = False,
+        use_pyarrow: bool = False,
+        impute_strategy: Union[ImputeStrategy, str] = ImputeStrategy.KNN,
+        n_neighbors: int = 3,
+        impute_group_by: Optional[str] = None,
+        stage_hooks: Optional[List[StageHook]] = None,
+        track_memory: bool = False,
+        datatype_cache: Optional[DatatypeCache] = None,
+        n_jobs: int = 1,
+        parallel_backend: Union[ParallelBackend, str] = ParallelBackend.THREAD,
+        null_values: Optional[List[str]] = None,
+        approximate_cardinality: bool = False,
+        sample_size: int = 1000,
+    ):
         """
         Initialize the FeaturePreProcessor.
 
         Args:
-            use_polars: Use Polars for high-performance operations if available
+            use_polars: Run process on pandas input with the Polars backend if available
+                (polars input always uses it)
             use_pyarrow: Use PyArrow for optimized I/O operations if available
+            impute_strategy: How numeric values are imputed when drop_na is False (knn, median, grouped_median)
+            n_neighbors: Number of neighbors used by KNN imputation
+            impute_group_by: Grouping column for grouped_median (defaults to the first categorical column)
+            stage_hooks: Callbacks receiving StageMetrics for each stage of process on pandas input
+            track_memory: Also report the bytes allocated by each stage (traced with tracemalloc)
+            datatype_cache: Cache reusing detected datatypes for dataframes with the same schema fingerprint
+            n_jobs: Number of workers analyzing columns during datatype detection (-1 uses all CPUs)
+            parallel_backend: Worker pool used when n_jobs > 1 (thread, process)
+            null_values: Tokens treated as missing values (defaults to NULL_VALUES)
+            approximate_cardinality: Estimate the distinct count and the share of the most
+                frequent value in datatype detection with HyperLogLog and heavy-hitters
+                sketches instead of exact hash tables
+            sample_size: Number of rows sampled for datatype detection
         """
         self.use_polars = use_polars and HAS_POLARS
         self.use_pyarrow = use_pyarrow and HAS_PYARROW
+        self.impute_strategy = ImputeStrategy(impute_strategy) if isinstance(impute_strategy, str) else impute_strategy
+        self.n_neighbors = n_neighbors
+        self.impute_group_by = impute_group_by
+        self.stage_hooks = list(stage_hooks) if stage_hooks else []
+        self.track_memory = track_memory
+        self.datatype_cache = datatype_cache
+        self.n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+        self.null_values = list(null_values) if null_values is not None else list(NULL_VALUES)
+        self.parallel_backend = ParallelBackend(parallel_backend) if isinstance(parallel_backend, str) else parallel_backend
+        self.approximate_cardinality = approximate_cardinality
+        self.sample_size = sample_size
         self.ENUM = DataType  # Add the ENUM attribute
 
         self.scalers = {
@@ -64,257 +153,482 @@ class FeaturePreProcessor:
             ScalerType.MINMAX: self._minmax_scaler,
             ScalerType.NONE: None,
         }
+        self.scaler_params = {
+            ScalerType.STANDARD: self._standard_params,
+            ScalerType.ROBUST: self._robust_params,
+            ScalerType.MINMAX: self._minmax_params,
+        }
+        self.fitted_state: Optional[FittedState] = None
+        self.dtype_report: Optional[DtypeReport] = None
+
+    def _robust_params(self, series: pd.Series) -> Tuple[float, float]:
+        """Return the (center, scale) pair used by robust scaling."""
+        from scipy.stats import iqr
+
+        return series.median(), iqr(series)
+
+    def _minmax_params(self, series: pd.Series) -> Tuple[float, float]:
+        """Return the (center, scale) pair used by min-max scaling."""
+        min_val, max_val = series.min(), series.max()
+        return min_val, max_val - min_val
+
+    def _standard_params(self, series: pd.Series) -> Tuple[float, float]:
+        """Return the (center, scale) pair used by standard scaling."""
+        return series.mean(), series.std()
+
+    def _apply_scale(self, series: pd.Series, center: float, scale: float) -> pd.Series:
+        """Apply (series - center) / scale, only centering when the scale is zero."""
+        if scale == 0:
+            return series - center
+        return (series - center) / scale
 
     def _robust_scaler(self, series: pd.Series) -> pd.Series:
         """Apply robust scaling using IQR."""
-        median = series.median()
-        iqr_value = iqr(series)
-        if iqr_value == 0:
-            return series - median
-        return (series - median) / iqr_value
+        return self._apply_scale(series, *self._robust_params(series))
 
     def _minmax_scaler(self, series: pd.Series) -> pd.Series:
         """Apply min-max scaling."""
-        min_val, max_val = series.min(), series.max()
-        if min_val == max_val:
-            return series - min_val
-        return (series - min_val) / (max_val - min_val)
+        return self._apply_scale(series, *self._minmax_params(series))
 
     def _standard_scaler(self, series: pd.Series) -> pd.Series:
         """Apply standard scaling (z-score normalization)."""
-        mean_val, std_val = series.mean(), series.std()
-        if std_val == 0:
-            return series - mean_val
-        return (series - mean_val) / std_val
+        return self._apply_scale(series, *self._standard_params(series))
 
-    def _is_numeric(self, series):
-        """Check if a series contains mostly numeric data."""
+    def _numeric_values(self, series: pd.Series) -> pd.Series:
+        """Return the non-null values of a series as float64, NaN where a value is not a number."""
+        values = series.dropna()
+        if pd.api.types.is_numeric_dtype(values):
+            return values.astype(float)
+        return pd.to_numeric(values.astype(str), errors="coerce").astype(float)
+
+    def _is_numeric(self, series: pd.Series, numeric: Optional[pd.Series] = None) -> bool:
+        """Check if a series contains mostly numeric data (numeric: its _numeric_values, if known)."""
         if pd.api.types.is_numeric_dtype(series):
             return True
 
-        sample = series.dropna().astype(str)
-        if len(sample) > 1000:
-            sample = sample.sample(1000)
-
-        if len(sample) == 0:
+        if numeric is None:
+            numeric = self._numeric_values(series)
+        if len(numeric) == 0:
             return False
 
-        converted = pd.to_numeric(sample, errors="coerce")
+        return bool(numeric.notna().mean() > 0.6)
 
-        success_rate = converted.notna().sum() / len(sample)
+    def _is_percentage_range(self, series: pd.Series, numeric: Optional[pd.Series] = None) -> bool:
+        """Check if the numeric values of a series are mostly between 0 and 1."""
+        if numeric is None:
+            numeric = self._numeric_values(series)
+        clean_numeric = numeric.dropna()
 
-        return success_rate > 0.6
-
-    def _is_percentage_range(self, series):
-        """checks if a numeric series is a percentage"""
-        try:
-            numeric_data = pd.to_numeric(series, errors="coerce")
-            clean_numeric = numeric_data.dropna()
-
-            if len(clean_numeric) == 0:
-                return False
-
-            in_range = clean_numeric.between(0, 1)
-            percentage_in_range = in_range.mean()
+        if len(clean_numeric) == 0:
+            return False
 
-            return percentage_in_range > 0.9
+        return bool(clean_numeric.between(0, 1).mean() > 0.9)
 
-        except Exception:
-            return False
+    def _is_integral(self, series: pd.Series, numeric: pd.Series) -> bool:
+        """Check if every numeric value of a series is a whole number (vectorized on the float values)."""
+        if pd.api.types.is_integer_dtype(series) or pd.api.types.is_bool_dtype(series):
+            return True
+        values = numeric.dropna().to_numpy()
+        return bool(np.isfinite(values).all() and np.equal(np.floor(values), values).all())
 
     def _is_date(self, value) -> bool:
         """Check if a value can be parsed as a date."""
+        from dateutil.parser import parse
+
         if pd.isna(value) or not isinstance(value, str):
             return False
         try:
             parse(value, fuzzy=False)
             return True
-        except (ValueError, TypeError):
+        except (ValueError, TypeError, OverflowError):
+            return False
+
+    def _is_temporal(self, series: pd.Series, probe_size: int = 5) -> bool:
+        """
+        Check if every non-null value of a series can be parsed as a date.
+
+        Values are matched against DATE_FORMATS in bulk with pd.to_datetime; only the
+        distinct values no candidate format matched are parsed one by one with dateutil.
+
+        Args:
+            series: Series to check
+            probe_size: Number of leading values parsed with dateutil to reject early
+
+        Returns:
+            True if the series is temporal
+        """
+        values = series.dropna()
+        if values.empty or pd.api.types.infer_dtype(values, skipna=False) != "string":
+            return False
+
+        # Cheap rejection: a single unparseable value rules the column out
+        if not all(self._is_date(value) for value in values.iloc[:probe_size]):
             return False
 
+        remaining = values
+        for fmt in DATE_FORMATS:
+            # utc=True lets values with different offsets parse into one column
+            parsed = pd.to_datetime(remaining, format=fmt, errors="coerce", utc=True)
+            remaining = remaining[parsed.isna()]
+            if remaining.empty:
+                return True
+
+        return all(self._is_date(value) for value in remaining.unique())
+
     def _is_string(self, value) -> bool:
         """Check if a value is a string."""
         return isinstance(value, str)
 
-    def clean_outliers(self, df: pd.DataFrame, dt: DataTypeDict) -> pd.DataFrame:
+    def _is_outlier_column(self, col: str, dtype: DataType) -> bool:
+        """Check if a column takes part in IQR outlier removal."""
+        if any(word in col.lower() for word in ["id", "tag", "identification", "item"]):
+            return False
+        return dtype in NUMERIC_TYPES
+
+    def _outlier_mask(
+        self, df: pd.DataFrame, dt: DataTypeDict, mask: Optional[np.ndarray] = None, sequential: bool = True
+    ) -> Tuple[Optional[np.ndarray], Dict[str, Tuple[float, float]]]:
         """
-        Remove outliers from numeric columns in the dataframe using IQR method.
+        Compute the IQR outlier mask of a dataframe without filtering it.
+
+        Args:
+            df: DataFrame to check
+            dt: Dictionary mapping column names to their data types
+            mask: Rows already excluded (False) by an earlier step, or None for all rows
+            sequential: If True, compute each column's bounds on the rows kept by the previous
+                columns; if False, compute all bounds on the rows of the input mask
+
+        Returns:
+            Tuple of (mask, bounds) where mask is True for the rows kept (None if no column
+            was checked and no mask was given) and bounds maps column names to (lower, upper)
+        """
+        cols = [col for col in df.columns if self._is_outlier_column(col, dt[col])]
+        bounds = {}
+        base = mask
+        for col in cols:
+            values = df[col].to_numpy(dtype=float)
+            rows = mask if sequential else base
+            # Quartiles skip NaN, as Series.quantile does
+            q1, q3 = np.nanquantile(values if rows is None else values[rows], [0.25, 0.75])
+            iqrv = q3 - q1
+            bounds[col] = (q1 - 1.5 * iqrv, q3 + 1.5 * iqrv)
+            keep = (values >= bounds[col][0]) & (values <= bounds[col][1])
+            mask = keep if mask is None else mask & keep
+
+        return mask, bounds
+
+    def _fit_outlier_bounds(
+        self, df: pd.DataFrame, dt: DataTypeDict, sequential: bool = True
+    ) -> Tuple[pd.DataFrame, Dict[str, Tuple[float, float]]]:
+        """
+        Remove outliers and record the IQR bounds that were applied.
+
+        The bounds are computed on a boolean mask and the rows are filtered once at the end.
 
         Args:
             df: DataFrame to clean
             dt: Dictionary mapping column names to their data types
+            sequential: If True, filter column by column so each column's bounds are computed
+                on the rows kept by the previous columns; if False, compute all bounds on the
+                input rows and filter once with a combined mask
 
         Returns:
-            DataFrame with outliers removed
+            Tuple of (filtered_dataframe, bounds) where bounds maps column names to (lower, upper)
+        """
+        mask, bounds = self._outlier_mask(df, dt, sequential=sequential)
+        filtered = self._apply_mask(df, mask)
+        return (df.copy() if filtered is df else filtered), bounds
+
+    def _missing_mask(self, df: pd.DataFrame) -> Optional[np.ndarray]:
+        """Return a mask that is True for rows without missing values (None if none is missing)."""
+        mask = df.notna().all(axis=1).to_numpy()
+        return None if mask.all() else mask
+
+    def _apply_mask(self, df: pd.DataFrame, mask: Optional[np.ndarray]) -> pd.DataFrame:
+        """Keep the rows where mask is True (df itself if every row is kept)."""
+        if mask is None or mask.all():
+            return df
+        return df[mask]
+
+    def clean_outliers(self, df: pd.DataFrame, dt: DataTypeDict, sequential: bool = True) -> pd.DataFrame:
         """
-        newdf = df.copy()
+        Remove outliers from numeric columns in the dataframe using IQR method.
 
-        for col in df.columns:
-            if any(word in col.lower() for word in ["id", "tag", "identification", "item"]):
-                continue
-            if dt[col] in [DataType.PRICE, DataType.NUMERIC, DataType.PERCENTAGE, DataType.INTEGER]:
-                iqrv = iqr(newdf[col])
-                q1 = newdf[col].quantile(0.25)
-                q3 = newdf[col].quantile(0.75)
-                newdf = newdf[newdf[col].between(q1 - 1.5 * iqrv, q3 + 1.5 * iqrv)]
+        Args:
+            df: DataFrame to clean
+            dt: Dictionary mapping column names to their data types
+            sequential: If True (default), compute each column's bounds on the rows left by the
+                previous columns; if False, compute all bounds at once and filter in one pass
 
-        return newdf
+        Returns:
+            DataFrame with outliers removed
+        """
+        if is_polars_frame(df):
+            return self._polars_backend().clean_outliers(df, dt, sequential=sequential)
+        if is_arrow_table(df):
+            return self._arrow_backend().clean_outliers(df, dt, sequential=sequential)
+        return self._fit_outlier_bounds(df, dt, sequential=sequential)[0]
 
     def determine_datatypes(self, df: pd.DataFrame) -> DataTypeDict:
         """
         Determine the data type of each column in the dataframe using automated detection.
 
+        If the processor has a datatype_cache, dataframes whose schema fingerprint is cached
+        skip detection.
+
         Args:
             df: DataFrame to find data types
 
         Returns:
             Dictionary mapping column names to their inferred data types
         """
-        datatypes = {}
-        sample_size = min(1000, len(df.index))
+        if is_polars_frame(df):
+            return self._polars_backend().determine_datatypes(df)
+        if is_arrow_table(df):
+            return self._arrow_backend().determine_datatypes(df)
+
+        if self.datatype_cache is not None:
+            key = self.datatype_cache.fingerprint(df)
+            cached = self.datatype_cache.get(key)
+            if cached is not None:
+                return cached
+            datatypes = self._detect_datatypes(df)
+            self.datatype_cache.put(key, datatypes)
+            return datatypes
+
+        return self._detect_datatypes(df)
+
+    def _detect_datatypes(self, df: pd.DataFrame) -> DataTypeDict:
+        """Run datatype detection on a pandas dataframe (see determine_datatypes)."""
+        sample_size = min(self.sample_size, len(df.index))
         sample_df = df.sample(sample_size, random_state=42) if sample_size > 100 else df
+        columns = list(sample_df.columns)
+
+        n_jobs = min(self.n_jobs, len(columns))
+        if n_jobs <= 1:
+            return {col: self._detect_column(col, sample_df[col]) for col in columns}
+
+        # map returns results in column order, so the outcome does not depend on scheduling
+        if self.parallel_backend == ParallelBackend.THREAD:
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                detected = list(executor.map(self._detect_column, columns, [sample_df[col] for col in columns]))
+        else:
+            # Columns travel as NumPy buffers of the sampled rows rather than pickled Series
+            buffers = [(col, sample_df[col].to_numpy(), sample_df[col].dtype) for col in columns]
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                chunksize = max(1, len(columns) // (n_jobs * 4))
+                detect = partial(_detect_column_buffer, approximate_cardinality=self.approximate_cardinality)
+                detected = list(executor.map(detect, buffers, chunksize=chunksize))
+
+        return dict(zip(columns, detected))
+
+    def _detect_column(self, col: str, series: pd.Series) -> DataType:
+        """Determine the data type of one (sampled) column."""
+        # Coerced once and shared by the numeric, percentage and integer checks
+        numeric = self._numeric_values(series)
+        col_lower = col.lower()
+        props = {
+            "is_numeric": self._is_numeric(series, numeric),
+            "col_lower": col_lower,
+        }
 
-        # Precompute column properties
-        column_properties = {}
-        for col in sample_df.columns:
-            series = sample_df[col]
-            column_properties[col] = {
-                "is_numeric": self._is_numeric(series),
-                "nunique": series.nunique(),
-                "nunique_ratio": series.value_counts(normalize=True),
-                "col_lower": col.lower(),
-                "na_count": series.isna().sum(),
-            }
-
-        for col in sample_df.columns:
-            props = column_properties[col]
-            series = sample_df[col]
-            col_lower = props["col_lower"]
-
-            # temporal
-            if any(word in col_lower for word in ["date", "time", "year", "month", "day"]):
-                datatypes[col] = DataType.TEMPORAL
-            elif series.dropna().apply(self._is_date).all() and not series.dropna().empty:
-                datatypes[col] = DataType.TEMPORAL
-
-            # binary
-            elif props["nunique"] == 2:
-                datatypes[col] = DataType.BINARY
-
-            # ID columns (check before numeric to catch numeric IDs)
-            elif any(word in col_lower for word in ["id", "identification", "serial", "key"]):
-                datatypes[col] = DataType.ID
-
-            # percentage - check both value range and keywords (but prioritize actual value range)
-            elif props["is_numeric"] and self._is_percentage_range(series):
-                datatypes[col] = DataType.PERCENTAGE
-            elif (
-                any(word in col_lower for word in ["perc", "percentage", "percent", "%", "score", "ratio"])
-                and props["is_numeric"]
-                and self._is_percentage_range(series)
-            ):
-                datatypes[col] = DataType.PERCENTAGE
-
-            # price/currency
-            elif props["is_numeric"] and any(
-                word in col_lower
-                for word in [
-                    "price",
-                    "cost",
-                    "revenue",
-                    "sales",
-                    "income",
-                    "expense",
-                    "$",
-                    "€",
-                    "£",
-                    "¥",
-                    "₹",
-                    "₽",
-                    "₩",
-                    "₪",
-                    "₦",
-                    "₡",
-                    "¢",
-                    "₨",
-                    "₱",
-                ]
-            ):
-                datatypes[col] = DataType.PRICE
-
-            # Check for integer vs float numeric
-            elif props["is_numeric"]:
-                if series.dropna().apply(lambda x: float(x).is_integer()).all():
-                    datatypes[col] = DataType.INTEGER
-                else:
-                    datatypes[col] = DataType.NUMERIC
-
-            # categorical (before string to catch categorical data)
-            elif (props["nunique_ratio"].max() < 0.2 and pd.api.types.is_object_dtype(series)) or any(
-                word in col_lower for word in ["category", "categories", "type", "group"]
-            ):
-                datatypes[col] = DataType.CATEGORICAL
-
-            # string/text
-            elif pd.api.types.is_string_dtype(series) or pd.api.types.is_object_dtype(series):
-                if series.dropna().str.len().mean() > 100:
-                    datatypes[col] = DataType.TEXT
-                else:
-                    datatypes[col] = DataType.STRING
-
-            # unknown
+        # temporal
+        if any(word in col_lower for word in ["date", "time", "year", "month", "day"]):
+            return DataType.TEMPORAL
+        elif self._is_temporal(series):
+            return DataType.TEMPORAL
+
+        # binary
+        elif self._nunique(series) == 2:
+            return DataType.BINARY
+
+        # ID columns (check before numeric to catch numeric IDs)
+        elif any(word in col_lower for word in ["id", "identification", "serial", "key"]):
+            return DataType.ID
+
+        # percentage - check both value range and keywords (but prioritize actual value range)
+        elif props["is_numeric"] and self._is_percentage_range(series, numeric):
+            return DataType.PERCENTAGE
+        elif (
+            any(word in col_lower for word in ["perc", "percentage", "percent", "%", "score", "ratio"])
+            and props["is_numeric"]
+            and self._is_percentage_range(series, numeric)
+        ):
+            return DataType.PERCENTAGE
+
+        # price/currency
+        elif props["is_numeric"] and any(
+            word in col_lower
+            for word in [
+                "price",
+                "cost",
+                "revenue",
+                "sales",
+                "income",
+                "expense",
+                "$",
+                "€",
+                "£",
+                "¥",
+                "₹",
+                "₽",
+                "₩",
+                "₪",
+                "₦",
+                "₡",
+                "¢",
+                "₨",
+                "₱",
+            ]
+        ):
+            return DataType.PRICE
+
+        # Check for integer vs float numeric
+        elif props["is_numeric"]:
+            if self._is_integral(series, numeric):
+                return DataType.INTEGER
             else:
-                datatypes[col] = DataType.UNKNOWN
+                return DataType.NUMERIC
+
+        # categorical (before string to catch categorical data)
+        elif (pd.api.types.is_object_dtype(series) and self._max_frequency(series) < 0.2) or any(
+            word in col_lower for word in ["category", "categories", "type", "group"]
+        ):
+            return DataType.CATEGORICAL
+
+        # string/text
+        elif pd.api.types.is_string_dtype(series) or pd.api.types.is_object_dtype(series):
+            if series.dropna().str.len().mean() > 100:
+                return DataType.TEXT
+            else:
+                return DataType.STRING
 
-        return datatypes
+        # unknown
+        else:
+            return DataType.UNKNOWN
+
+    def _nunique(self, series: pd.Series) -> int:
+        """Return the number of distinct non-null values, estimated if approximate_cardinality is set."""
+        if self.approximate_cardinality:
+            return round(HyperLogLog().update(series).count())
+        return int(series.nunique())
+
+    def _max_frequency(self, series: pd.Series) -> float:
+        """Return the share of the most frequent non-null value, estimated if approximate_cardinality is set."""
+        if self.approximate_cardinality:
+            return HeavyHitters().update(series).max_frequency()
+        return float(series.value_counts(normalize=True).max())
+
+    def _normalize(self, df: pd.DataFrame, datatypes: DataTypeDict) -> pd.DataFrame:
+        """Standardize null representations and convert numeric columns to numeric types."""
+        # Only string-like columns are scanned for null tokens; the shallow copy shares
+        # every column that is not replaced below
+        clean_df = mask_null_tokens(df, self.null_values)
+        if clean_df is df:
+            clean_df = df.copy(deep=False)
 
-    def clean_data(self, df: pd.DataFrame, drop_na: bool = True) -> Tuple[pd.DataFrame, DataTypeDict]:
+        for col in clean_df.columns:
+            if datatypes[col] in NUMERIC_TYPES and not pd.api.types.is_numeric_dtype(clean_df[col]):
+                clean_df[col] = pd.to_numeric(clean_df[col], errors="coerce")
+
+        return clean_df
+
+    def _clean(self, df: pd.DataFrame, datatypes: DataTypeDict, drop_na: bool) -> Tuple[pd.DataFrame, FittedState]:
         """
-        Clean the dataframe by handling missing values and standardizing null representations.
+        Normalize and drop or impute missing values.
 
         Args:
             df: DataFrame to clean
-            drop_na: If True, drop rows with NA values; if False, impute them using KNN
+            datatypes: Dictionary mapping column names to their data types
+            drop_na: If True, drop rows with NA values; if False, impute them
 
         Returns:
-            Tuple of (cleaned_dataframe, datatypes_dict)
+            Tuple of (cleaned_dataframe, state) where state holds the datatypes and the fill
+            values of every numeric and categorical column (none when drop_na is True)
         """
-        datatypes = self.determine_datatypes(df)
-        clean_df = df.copy()
+        return self._handle_missing(self._normalize(df, datatypes), datatypes, drop_na)
 
-        null_values = ["?", "Error", "na", "NA", "ERROR", "error", "err", "ERR", "NAType", "natype", "UNKNOWN", "unknown", ""]
-        clean_df = clean_df.replace(null_values, np.nan)
-
-        # Convert numeric columns to proper numeric types
-        for col in clean_df.columns:
-            if datatypes[col] in [DataType.NUMERIC, DataType.PRICE, DataType.PERCENTAGE, DataType.INTEGER]:
-                clean_df[col] = pd.to_numeric(clean_df[col], errors="coerce")
+    def _handle_missing(
+        self, clean_df: pd.DataFrame, datatypes: DataTypeDict, drop_na: bool
+    ) -> Tuple[pd.DataFrame, FittedState]:
+        """Drop or impute missing values of a normalized dataframe (see _clean)."""
+        state = FittedState(datatypes=datatypes, drop_na=drop_na)
 
         if drop_na:
             clean_df = clean_df.dropna(how="any")
-        else:
-            for col in clean_df.columns:
-                if not clean_df[col].isnull().any():
-                    continue
+            return clean_df.reset_index(drop=True), state
 
-                if datatypes[col] in [DataType.NUMERIC, DataType.PRICE, DataType.PERCENTAGE, DataType.INTEGER]:
-                    if clean_df[col].notna().sum() >= 3:  # Need at least 3 values for KNN
-                        imputer = KNNImputer(n_neighbors=min(3, clean_df[col].notna().sum()))
-                        clean_df[col] = imputer.fit_transform(clean_df[[col]]).flatten()
-                    else:
-                        clean_df[col] = clean_df[col].fillna(clean_df[col].mean())
+        numeric_cols = [col for col in clean_df.columns if datatypes[col] in NUMERIC_TYPES]
+        categorical_cols = [col for col in clean_df.columns if datatypes[col] == DataType.CATEGORICAL]
+        other_cols = [col for col in clean_df.columns if col not in numeric_cols and col not in categorical_cols]
 
-                elif datatypes[col] == DataType.CATEGORICAL:
-                    mode_value = clean_df[col].mode()
-                    if not mode_value.empty:
-                        clean_df[col] = clean_df[col].fillna(mode_value[0])
+        # Rows missing a value that cannot be imputed are dropped before fitting the imputer
+        clean_df = clean_df.dropna(subset=other_cols)
 
-                else:
-                    clean_df = clean_df.dropna(subset=[col])
+        if self.impute_strategy == ImputeStrategy.GROUPED_MEDIAN:
+            state.group_by = self.impute_group_by or next(iter(categorical_cols), None)
+        groups = clean_df[state.group_by] if state.group_by is not None else None
 
-        clean_df = clean_df.reset_index(drop=True)
+        imputer = NumericImputer(self.impute_strategy, n_neighbors=self.n_neighbors)
+        if numeric_cols:
+            clean_df[numeric_cols] = imputer.fit_transform(clean_df[numeric_cols], groups=groups)
+        state.impute_values.update(imputer.statistics)
+        state.group_impute_values = imputer.group_statistics
+        if imputer.reference is not None:
+            state.knn_reference = {col: imputer.reference[col].tolist() for col in imputer.reference.columns}
+            state.knn_neighbors, state.knn_tree = imputer.n_neighbors, imputer.use_tree
+
+        for col in categorical_cols:
+            mode_value = clean_df[col].mode()
+            if not mode_value.empty:
+                state.impute_values[col] = mode_value[0]
+        clean_df = clean_df.fillna({col: state.impute_values[col] for col in categorical_cols if col in state.impute_values})
+
+        return clean_df.reset_index(drop=True), state
+
+    def clean_data(self, df: pd.DataFrame, drop_na: bool = True) -> Tuple[pd.DataFrame, DataTypeDict]:
+        """
+        Clean the dataframe by handling missing values and standardizing null representations.
+
+        Args:
+            df: DataFrame to clean
+            drop_na: If True, drop rows with NA values; if False, impute them with the
+                processor's impute_strategy (KNN by default)
+
+        Returns:
+            Tuple of (cleaned_dataframe, datatypes_dict)
+        """
+        if is_polars_frame(df):
+            return self._polars_backend().clean_data(df, drop_na=drop_na)
+        if is_arrow_table(df):
+            return self._arrow_backend().clean_data(df, drop_na=drop_na)
+
+        datatypes = self.determine_datatypes(df)
+        clean_df, _ = self._clean(df, datatypes, drop_na)
         return clean_df, datatypes
 
+    def _scalable_columns(self, columns, datatypes: Mapping[str, Union[DataType, str]]) -> List[str]:
+        """Return the columns that scaling applies to, skipping ID-like names."""
+        scalable = []
+        for col in columns:
+            # Skip ID columns
+            if any(word in col.lower() for word in ["id", "identification", "item"]):
+                continue
+
+            # Handle both enum and string datatypes
+            col_datatype = datatypes[col]
+            if hasattr(col_datatype, "value"):  # It's an enum object
+                col_datatype_value = col_datatype.value
+            else:  # It's already a string
+                col_datatype_value = col_datatype
+
+            # Check if column should be scaled
+            scalable_types = ["price", "numeric", "percentage", "integer"]
+            if col_datatype_value in scalable_types:
+                scalable.append(col)
+
+        return scalable
+
     def scaler(
         self,
         df: pd.DataFrame,
@@ -330,12 +644,17 @@ class FeaturePreProcessor:
             datatypes: Datatypes of dataframe - can contain DataType enums or strings
 
         Returns:
-            None (scales the dataframe in-place)
+            None (scales the dataframe in-place); for polars or pyarrow input, the scaled frame
         """
         # Convert string to enum if needed
         if isinstance(scaler_type, str):
             scaler_type = ScalerType(scaler_type)
 
+        if is_polars_frame(df):
+            return self._polars_backend().scaler(df, scaler_type, datatypes)
+        if is_arrow_table(df):
+            return self._arrow_backend().scaler(df, scaler_type, datatypes)
+
         scaler_func = self.scalers[scaler_type]
 
         if scaler_func is None:
@@ -344,22 +663,115 @@ class FeaturePreProcessor:
         if datatypes is None:
             return
 
-        for col in df.columns:
-            # Skip ID columns
-            if any(word in col.lower() for word in ["id", "identification", "item"]):
-                continue
+        for col in self._scalable_columns(df.columns, datatypes):
+            df[col] = scaler_func(df[col])
 
-            # Handle both enum and string datatypes
-            col_datatype = datatypes[col]
-            if hasattr(col_datatype, "value"):  # It's an enum object
-                col_datatype_value = col_datatype.value
-            else:  # It's already a string
-                col_datatype_value = col_datatype
+    def _scale_in_place(self, df: pd.DataFrame, scaler_type: ScalerType, datatypes: DataTypeDict, owned: bool = False) -> None:
+        """
+        Scale the scalable columns of df.
 
-            # Check if column should be scaled
-            scalable_types = ["price", "numeric", "percentage", "integer"]
-            if col_datatype_value in scalable_types:
-                df[col] = scaler_func(df[col])
+        If owned is True (df was just created by a filter and shares no buffer), float columns
+        are written into their existing buffers; otherwise each scaled column replaces the old
+        one, since writing into a buffer shared under Copy-on-Write would copy its whole block.
+        """
+        if scaler_type == ScalerType.NONE:
+            return
+
+        params_func = self.scaler_params[scaler_type]
+        for col in self._scalable_columns(df.columns, datatypes):
+            center, scale = params_func(df[col])
+            scaled = self._apply_scale(df[col], center, scale)
+            if owned and df[col].dtype == scaled.dtype:
+                df.loc[:, col] = scaled
+            else:
+                df[col] = scaled
+
+    def _resolve_scaler_type(self, scaler_type: Union[ScalerType, str]) -> ScalerType:
+        """Convert a scaler name to ScalerType and check that it is available."""
+        # Convert string to enum if needed
+        if isinstance(scaler_type, str):
+            scaler_type = ScalerType(scaler_type)
+
+        if scaler_type not in self.scalers:
+            raise ValueError(f"Unknown scaler type: {scaler_type}. Available: {list(self.scalers.keys())}")
+
+        return scaler_type
+
+    def _polars_backend(self) -> "PolarsBackend":
+        """Return a PolarsBackend for this processor, importing polars on first use."""
+        from .polars_backend import PolarsBackend
+
+        return PolarsBackend(self)
+
+    def _arrow_backend(self) -> "ArrowBackend":
+        """Return an ArrowBackend for this processor, importing pyarrow on first use."""
+        from .arrow_backend import ArrowBackend
+
+        return ArrowBackend(self)
+
+    def _run_stage(self, stage: str, func: Callable[..., Any], df: pd.DataFrame, *args, **kwargs) -> Any:
+        """
+        Run one pipeline stage and report its metrics to the stage hooks.
+
+        The output frame is the first element of a tuple result, the result itself if it is
+        a dataframe, and the input otherwise (for stages that return datatypes or work in-place).
+        """
+        if not self.stage_hooks:
+            return func(df, *args, **kwargs)
+
+        started_tracing = False
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+
+        try:
+            start = time.perf_counter()
+            result = func(df, *args, **kwargs)
+            seconds = time.perf_counter() - start
+            allocated = tracemalloc.get_traced_memory()[1] - base if self.track_memory else None
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+        out = result[0] if isinstance(result, tuple) else result
+        if not isinstance(out, pd.DataFrame):
+            out = df
+
+        metrics = StageMetrics(
+            stage=stage,
+            seconds=seconds,
+            rows_in=len(df),
+            rows_out=len(out),
+            columns_in=len(df.columns),
+            columns_out=len(out.columns),
+            bytes_allocated=allocated,
+        )
+        for hook in self.stage_hooks:
+            hook(metrics)
+
+        return result
+
+    def optimize_dtypes(
+        self, df: pd.DataFrame, datatypes: Optional[DataTypeDict] = None, float_tolerance: Optional[float] = None
+    ) -> Tuple[pd.DataFrame, DtypeReport]:
+        """
+        Downcast columns to compact dtypes according to their data types.
+
+        Args:
+            df: DataFrame to optimize (not modified)
+            datatypes: Dictionary mapping column names to their data types (detected if None)
+            float_tolerance: Maximum absolute error accepted to store float columns as float32
+                (None keeps float64)
+
+        Returns:
+            Tuple of (optimized_dataframe, report of the bytes saved per column)
+        """
+        if datatypes is None:
+            datatypes = self.determine_datatypes(df)
+        return optimize_dtypes(df, datatypes, float_tolerance=float_tolerance)
 
     def process(
         self,
@@ -367,36 +779,260 @@ class FeaturePreProcessor:
         drop_na: bool = True,
         scaler_type: Union[ScalerType, str] = ScalerType.STANDARD,
         remove_outlier: bool = True,
+        sequential_outliers: bool = True,
+        optimize_dtypes: bool = False,
+        float_tolerance: Optional[float] = None,
+        copy: bool = True,
     ) -> pd.DataFrame:
         """
         Clean and scale numeric features in the dataframe.
 
+        On pandas input, the stages detect_types, normalize, missing, outliers, scale and
+        optimize are reported to the processor's stage_hooks (with copy=False, a filter
+        stage removes the rows and missing and outliers only compute the row mask).
+
+        With copy=False the rows dropped for missing values and outliers are collected in
+        one boolean mask and removed by a single filter, and the filtered frame is scaled
+        in place, so peak memory stays close to the input plus the output instead of
+        several copies. Aliasing rules: df itself is never modified; columns that are not
+        converted, imputed or scaled are shared with df when no row is removed, and the
+        sharing is resolved by pandas Copy-on-Write, so writing to either frame later
+        copies the written column instead of changing the other frame.
+
         Args:
             df: DataFrame to process
             drop_na: Whether to drop NA values during cleaning
             scaler_type: Type of scaler to use (standard, robust, minmax, none)
             remove_outlier: Choose to remove outliers or not
+            sequential_outliers: Compute outlier bounds column by column on already-filtered
+                rows (True) or all at once with a single mask (False)
+            optimize_dtypes: Downcast the output columns to compact dtypes (pandas output only);
+                the bytes saved are stored in dtype_report
+            float_tolerance: Maximum absolute error accepted to store scaled features as float32
+                when optimize_dtypes is True (None keeps float64)
+            copy: Copy the data at each stage (True) or minimize copies (False, pandas input
+                only; see above)
 
         Returns:
-            Processed DataFrame
+            Processed DataFrame (a polars DataFrame or LazyFrame for polars input, a
+            pyarrow Table for pyarrow input)
         """
-        # Convert string to enum if needed
-        if isinstance(scaler_type, str):
-            scaler_type = ScalerType(scaler_type)
+        scaler_type = self._resolve_scaler_type(scaler_type)
 
-        if scaler_type not in self.scalers:
-            raise ValueError(f"Unknown scaler type: {scaler_type}. Available: {list(self.scalers.keys())}")
+        if optimize_dtypes and (is_polars_frame(df) or is_arrow_table(df)):
+            raise ValueError("optimize_dtypes is only supported for pandas DataFrames")
+        if is_polars_frame(df):
+            return self._polars_backend().process(df, drop_na, scaler_type, remove_outlier, sequential_outliers)
+        if is_arrow_table(df):
+            return self._arrow_backend().process(df, drop_na, scaler_type, remove_outlier, sequential_outliers)
+
+        if self.use_polars:
+            import polars as pl
+
+            backend = self._polars_backend()
+            result = backend.process(pl.from_pandas(df), drop_na, scaler_type, remove_outlier, sequential_outliers)
+            result = result.to_pandas()
+            if optimize_dtypes:
+                result, self.dtype_report = self.optimize_dtypes(result, self.determine_datatypes(df), float_tolerance)
+            return result
 
         # Get cleaned data set
-        clean_df, datatypes = self.clean_data(df, drop_na=drop_na)
+        datatypes = self._run_stage("detect_types", self.determine_datatypes, df)
+        clean_df = self._run_stage("normalize", self._normalize, df, datatypes)
 
-        # Remove outliers if wanted
-        if remove_outlier:
-            clean_df = self.clean_outliers(clean_df, datatypes)
+        if copy:
+            clean_df, _ = self._run_stage("missing", self._handle_missing, clean_df, datatypes, drop_na)
 
-        # Scale numeric columns
-        datatypes_str = {k: v.value for k, v in datatypes.items()}
-        self.scaler(clean_df, scaler_type.value, datatypes_str)
+            # Remove outliers if wanted
+            if remove_outlier:
+                clean_df = self._run_stage(
+                    "outliers", self.clean_outliers, clean_df, datatypes, sequential=sequential_outliers
+                )
+
+            # Scale numeric columns
+            datatypes_str = {k: v.value for k, v in datatypes.items()}
+            self._run_stage("scale", self.scaler, clean_df, scaler_type.value, datatypes_str)
+        else:
+            # Collect the rows to drop in one mask and filter once
+            mask = None
+            if drop_na:
+                mask = self._run_stage("missing", self._missing_mask, clean_df)
+            else:
+                clean_df, _ = self._run_stage("missing", self._handle_missing, clean_df, datatypes, drop_na)
+            if remove_outlier:
+                mask, _ = self._run_stage(
+                    "outliers", self._outlier_mask, clean_df, datatypes, mask, sequential=sequential_outliers
+                )
+            owned = mask is not None and not mask.all()
+            clean_df = self._run_stage("filter", self._apply_mask, clean_df, mask)
+            self._run_stage("scale", self._scale_in_place, clean_df, scaler_type, datatypes, owned)
 
         clean_df.index = range(len(clean_df))
+
+        # Shrink the output columns
+        if optimize_dtypes:
+            clean_df, self.dtype_report = self._run_stage(
+                "optimize", self.optimize_dtypes, clean_df, datatypes, float_tolerance
+            )
+        return clean_df
+
+    def fit(
+        self,
+        df: pd.DataFrame,
+        drop_na: bool = True,
+        scaler_type: Union[ScalerType, str] = ScalerType.STANDARD,
+        remove_outlier: bool = True,
+        sequential_outliers: bool = True,
+    ) -> FittedState:
+        """
+        Learn datatypes, imputation values, outlier bounds and scaler parameters from a dataframe.
+
+        The statistics are computed the same way process computes them, so transforming the
+        fitted dataframe gives the same result as processing it. With KNN imputation the state
+        keeps the rows neighbors are searched in, so transform imputes with the same model
+        (the state file grows with the fitted frame, up to 50,000 rows). The state is also
+        kept in self.fitted_state for later transform calls.
+
+        Args:
+            df: DataFrame to fit on
+            drop_na: Whether to drop NA values during cleaning
+            scaler_type: Type of scaler to use (standard, robust, minmax, none)
+            remove_outlier: Choose to remove outliers or not
+            sequential_outliers: Compute outlier bounds column by column on already-filtered
+                rows (True) or all at once with a single mask (False)
+
+        Returns:
+            The fitted state
+        """
+        scaler_type = self._resolve_scaler_type(scaler_type)
+
+        datatypes = self.determine_datatypes(df)
+        clean_df, state = self._clean(df, datatypes, drop_na)
+        state.scaler_type = scaler_type
+        state.remove_outlier = remove_outlier
+
+        if remove_outlier:
+            clean_df, state.outlier_bounds = self._fit_outlier_bounds(clean_df, datatypes, sequential=sequential_outliers)
+
+        if scaler_type != ScalerType.NONE:
+            params_func = self.scaler_params[scaler_type]
+            for col in self._scalable_columns(clean_df.columns, datatypes):
+                state.scaler_params[col] = params_func(clean_df[col])
+
+        self.fitted_state = state
+        return self.fitted_state
+
+    def _running_scaler_params(self, stats: RunningStats, scaler_type: ScalerType) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the (centers, scales) arrays of standard or min-max scaling from running statistics."""
+        if scaler_type == ScalerType.STANDARD:
+            return stats.means(), stats.std()
+        centers = np.where(stats.count > 0, stats.min, np.nan)
+        return centers, np.where(stats.count > 0, stats.max - stats.min, np.nan)
+
+    def partial_fit(self, df: pd.DataFrame, scaler_type: Optional[Union[ScalerType, str]] = None) -> FittedState:
+        """
+        Update the fitted state with one batch of a stream.
+
+        The first call (or the first after fit) detects the datatypes on the batch and starts
+        running count, mean, variance, min and max per scaled column; later calls add their
+        batch to these statistics in O(batch) and refresh scaler_params, so transform scales
+        each new batch with the statistics of every batch seen so far. Rows with missing
+        values are dropped and outliers are not removed, since neither can be decided from
+        running statistics alone.
+
+        Args:
+            df: Batch to add
+            scaler_type: Type of scaler to use (standard, minmax, none); fixed by the first call
+
+        Returns:
+            The updated state (also stored in self.fitted_state)
+        """
+        state = self.fitted_state
+        if state is None or state.running_stats is None:
+            scaler_type = self._resolve_scaler_type(scaler_type or ScalerType.STANDARD)
+            if scaler_type == ScalerType.ROBUST:
+                raise ValueError("partial_fit supports standard and minmax scaling; robust scaling needs quantiles")
+            datatypes = self.determine_datatypes(df)
+            n_cols = len(self._scalable_columns(list(datatypes), datatypes)) if scaler_type != ScalerType.NONE else 0
+            state = FittedState(
+                datatypes=datatypes,
+                scaler_type=scaler_type,
+                remove_outlier=False,
+                running_stats=RunningStats(n_cols),
+            )
+        elif scaler_type is not None and self._resolve_scaler_type(scaler_type) != state.scaler_type:
+            raise ValueError(f"partial_fit was started with the {state.scaler_type.value} scaler")
+
+        running_stats = state.running_stats
+        if running_stats is not None and state.scaler_type != ScalerType.NONE:
+            cols = self._scalable_columns(list(state.datatypes), state.datatypes)
+            clean_df = self.transform(df, replace(state, scaler_params={}))
+            running_stats.update(clean_df[cols].to_numpy(dtype=float))
+            centers, scales = self._running_scaler_params(running_stats, state.scaler_type)
+            state.scaler_params = {col: (float(centers[i]), float(scales[i])) for i, col in enumerate(cols)}
+
+        self.fitted_state = state
+        return state
+
+    def _knn_fill(self, df: pd.DataFrame, state: FittedState) -> pd.DataFrame:
+        """Impute the numeric columns of a normalized dataframe with the fitted KNN reference rows."""
+        imputer = NumericImputer(ImputeStrategy.KNN, n_neighbors=state.knn_neighbors)
+        imputer.statistics = state.impute_values
+        imputer.reference = pd.DataFrame(state.knn_reference, dtype=float)
+        imputer.use_tree = state.knn_tree
+
+        df = df.copy()
+        df[list(state.knn_reference)] = imputer.transform(df[list(state.knn_reference)])
+        return df
+
+    def transform(self, df: pd.DataFrame, state: Optional[FittedState] = None) -> pd.DataFrame:
+        """
+        Apply a fitted state to a dataframe without recomputing any statistics.
+
+        Args:
+            df: DataFrame to transform; must contain every fitted column
+            state: Fitted state to apply (defaults to self.fitted_state)
+
+        Returns:
+            Processed DataFrame with the fitted columns
+        """
+        if state is None:
+            state = self.fitted_state
+        if state is None:
+            raise ValueError("FeaturePreProcessor is not fitted. Call fit() first or pass a FittedState.")
+
+        missing = [col for col in state.datatypes if col not in df.columns]
+        if missing:
+            raise ValueError(f"Columns missing from dataframe: {missing}")
+
+        clean_df = self._normalize(df[list(state.datatypes)], state.datatypes)
+
+        if state.drop_na:
+            clean_df = clean_df.dropna(how="any")
+        else:
+            groups = clean_df[state.group_by] if state.group_by is not None else None
+            if state.knn_reference:
+                clean_df = self._knn_fill(clean_df, state)
+            clean_df = fill_missing(clean_df, state.impute_values, state.group_impute_values, groups)
+            other_cols = [
+                col for col, dtype in state.datatypes.items() if dtype not in NUMERIC_TYPES and dtype != DataType.CATEGORICAL
+            ]
+            clean_df = clean_df.dropna(subset=other_cols)
+
+        # Bounds are fixed, so applying them all at once keeps the same rows as sequential filtering
+        if state.outlier_bounds:
+            cols = list(state.outlier_bounds)
+            bounds = np.array(list(state.outlier_bounds.values()), dtype=float)
+            values = clean_df[cols].to_numpy(dtype=float)
+            mask = ((values >= bounds[:, 0]) & (values <= bounds[:, 1])).all(axis=1)
+            clean_df = clean_df[mask]
+
+        clean_df = clean_df.reset_index(drop=True)
+
+        if state.scaler_params:
+            cols = list(state.scaler_params)
+            params = np.array(list(state.scaler_params.values()), dtype=float)
+            scales = np.where(params[:, 1] == 0, 1.0, params[:, 1])
+            clean_df[cols] = (clean_df[cols].to_numpy(dtype=float) - params[:, 0]) / scales
+
         return clean_df
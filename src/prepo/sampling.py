@@ -0,0 +1,218 @@
+"""
+Row sampling for the prepo package.
+
+This module contains samplers that keep a bounded sample of the rows of a stream of
+DataFrame chunks, so datatype detection can run on files that are read in a single
+pass or not read whole at all: RowReservoir keeps a uniform sample, and StratifiedSample
+keeps rows from every region of the stream, so patterns that only appear late in a
+time-ordered file are still represented.
+"""
+
+import math
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def required_sample_size(min_frequency: float, confidence: float = 0.99) -> int:
+    """
+    Return the number of rows needed to see a pattern at least once.
+
+    A value pattern (e.g. a date format or a non-numeric token) occurring in a fraction
+    min_frequency of the rows is missed by n uniformly sampled rows with probability
+    (1 - min_frequency) ** n.
+
+    Args:
+        min_frequency: Smallest fraction of rows a pattern must occupy to be detected
+        confidence: Probability that such a pattern appears in the sample
+
+    Returns:
+        Sample size
+    """
+    if not 0 < min_frequency < 1:
+        raise ValueError(f"min_frequency must be between 0 and 1, got {min_frequency}")
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be between 0 and 1, got {confidence}")
+    return math.ceil(math.log(1 - confidence) / math.log(1 - min_frequency))
+
+
+class RowReservoir:
+    """
+    Uniform sample of at most size rows from a stream of DataFrame chunks.
+
+    Rows are kept with Algorithm R, vectorized per chunk. Samples built on consecutive
+    parts of a stream are merged by drawing from each in proportion to the number of rows
+    it has seen, like ReservoirSample for single columns.
+    """
+
+    def __init__(self, size: int = 1000, seed: int = 42):
+        """
+        Initialize an empty sample.
+
+        Args:
+            size: Maximum number of rows kept
+            seed: Seed for the random number generator
+        """
+        if size <= 0:
+            raise ValueError(f"size must be positive, got {size}")
+        self.size = size
+        self.seen = 0
+        self._frame: Optional[pd.DataFrame] = None
+        self._positions = np.empty(0, dtype=np.int64)
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, chunk: pd.DataFrame) -> "RowReservoir":
+        """
+        Add the rows of a chunk.
+
+        Args:
+            chunk: Next rows of the stream
+
+        Returns:
+            self
+        """
+        if len(chunk) == 0:
+            return self
+
+        frames = [] if self._frame is None else [self._frame]
+        positions = [self._positions]
+        fill = max(0, min(self.size - len(self._positions), len(chunk)))
+        frames.append(chunk.iloc[:fill])
+        positions.append(self.seen + np.arange(fill))
+
+        rest = np.arange(fill, len(chunk))
+        if len(rest):
+            # Row i of the stream replaces a random slot with probability size / (i + 1)
+            slots = self._rng.integers(0, self.seen + rest + 1)
+            rows, slots = rest[slots < self.size], slots[slots < self.size]
+            # A later row drawn for the same slot replaces the earlier one
+            _, last = np.unique(slots[::-1], return_index=True)
+            rows, slots = rows[len(rows) - 1 - last], slots[len(slots) - 1 - last]
+
+            keep = np.ones(self.size, dtype=bool)
+            keep[slots] = False
+            frame = pd.concat(frames, ignore_index=True)
+            frames = [frame.iloc[keep], chunk.iloc[rows]]
+            positions = [np.concatenate(positions)[keep], self.seen + rows]
+
+        self._frame = pd.concat(frames, ignore_index=True)
+        self._positions = np.concatenate(positions)
+        self.seen += len(chunk)
+        return self
+
+    def merge(self, other: "RowReservoir") -> "RowReservoir":
+        """
+        Merge the sample of the rows that follow this sample's rows.
+
+        Args:
+            other: Sample over the next part of the stream (e.g. the next chunk or row group)
+
+        Returns:
+            self
+        """
+        total = self.seen + other.seen
+        if other._frame is None:
+            return self
+        if self._frame is None:
+            self._frame, self._positions, self.seen = other._frame, other._positions, other.seen
+            return self
+
+        size = min(self.size, len(self._positions) + len(other._positions))
+        n_self = min(len(self._positions), int(round(size * self.seen / total)))
+        n_other = min(len(other._positions), size - n_self)
+        own = np.sort(self._rng.choice(len(self._positions), n_self, replace=False))
+        theirs = np.sort(self._rng.choice(len(other._positions), n_other, replace=False))
+
+        self._frame = pd.concat([self._frame.iloc[own], other._frame.iloc[theirs]], ignore_index=True)
+        self._positions = np.concatenate([self._positions[own], self.seen + other._positions[theirs]])
+        self.seen = total
+        return self
+
+    @property
+    def sample(self) -> pd.DataFrame:
+        """The sampled rows in stream order (empty if no rows were seen)."""
+        if self._frame is None:
+            return pd.DataFrame()
+        order = np.argsort(self._positions, kind="stable")
+        return self._frame.iloc[order].reset_index(drop=True)
+
+
+class StratifiedSample:
+    """
+    Sample of at most size rows drawn evenly from every region of a stream.
+
+    The stream is split into n_strata to 2 * n_strata contiguous strata of the same number
+    of rows, each keeping a uniform sample of size / n_strata of them. When the rows seen
+    no longer fit, neighbouring strata are merged pairwise and the stratum width doubles,
+    so the strata always cover the whole stream evenly and the last rows are represented
+    as well as the first. The sample takes from each stratum in proportion to its rows.
+    """
+
+    def __init__(self, size: int = 1000, n_strata: int = 10, seed: int = 42):
+        """
+        Initialize an empty sample.
+
+        Args:
+            size: Maximum number of rows kept
+            n_strata: Number of position strata
+            seed: Seed for the random number generators
+        """
+        if size <= 0 or n_strata <= 0:
+            raise ValueError(f"size and n_strata must be positive, got {size} and {n_strata}")
+        self.size = size
+        self.n_strata = min(n_strata, size)
+        self.per_stratum = math.ceil(size / self.n_strata)
+        # Rows covered by each stratum; every row is kept until the sample is full
+        self.width = self.per_stratum
+        self.strata: List[RowReservoir] = []
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def seen(self) -> int:
+        """Number of rows seen."""
+        return sum(stratum.seen for stratum in self.strata)
+
+    def _new_stratum(self) -> RowReservoir:
+        """Create an empty stratum with its own random stream."""
+        return RowReservoir(self.per_stratum, seed=int(self._rng.integers(2**32)))
+
+    def update(self, chunk: pd.DataFrame) -> "StratifiedSample":
+        """
+        Add the rows of a chunk.
+
+        Args:
+            chunk: Next rows of the stream
+
+        Returns:
+            self
+        """
+        while self.seen + len(chunk) > self.width * 2 * self.n_strata:
+            merged = [left.merge(right) for left, right in zip(self.strata[::2], self.strata[1::2])]
+            self.strata = merged + self.strata[len(merged) * 2 :]
+            self.width *= 2
+
+        start = 0
+        while start < len(chunk):
+            if not self.strata or self.strata[-1].seen >= self.width:
+                self.strata.append(self._new_stratum())
+            stop = start + self.width - self.strata[-1].seen
+            self.strata[-1].update(chunk.iloc[start:stop])
+            start = stop
+        return self
+
+    @property
+    def sample(self) -> pd.DataFrame:
+        """The sampled rows in stream order (empty if no rows were seen)."""
+        if not self.strata:
+            return pd.DataFrame()
+
+        seen = np.array([stratum.seen for stratum in self.strata])
+        quotas = np.diff(np.floor(self.size * np.cumsum(seen) / seen.sum()).astype(int), prepend=0)
+        pieces = []
+        for stratum, quota in zip(self.strata, quotas):
+            rows = stratum.sample
+            if quota < len(rows):
+                rows = rows.iloc[np.sort(self._rng.choice(len(rows), quota, replace=False))]
+            pieces.append(rows)
+        return pd.concat(pieces, ignore_index=True)
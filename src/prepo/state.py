@@ -0,0 +1,131 @@
+"""
+Fitted preprocessing state for the prepo package.
+
+This module contains the FittedState class that stores everything
+FeaturePreProcessor.fit learns from a DataFrame, so that new batches can be
+transformed consistently and the fit can be persisted to disk.
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .stats import RunningStats
+from .types import DataType, DataTypeDict, ScalerType
+
+STATE_VERSION = 3
+
+
+def _to_builtin(value: Any) -> Any:
+    """Convert numpy scalars to plain Python values for JSON encoding."""
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+@dataclass
+class FittedState:
+    """
+    Statistics learned by FeaturePreProcessor.fit.
+
+    Attributes:
+        datatypes: Detected data type of each column
+        scaler_type: Scaling method the parameters were computed for
+        drop_na: Whether rows with missing values are dropped (otherwise imputed)
+        remove_outlier: Whether rows outside the outlier bounds are removed
+        impute_values: Fill value per column, used when drop_na is False
+        group_by: Grouping column of grouped imputation, if any
+        group_impute_values: Fill value per column and group key, used before impute_values
+        knn_reference: Rows KNN imputation searches for neighbors, per numeric column (empty
+            unless fitted with the knn strategy and drop_na False)
+        knn_neighbors: Number of neighbors of KNN imputation
+        knn_tree: Whether knn_reference holds sampled complete rows searched with a KD-tree
+        outlier_bounds: (lower, upper) bounds per numeric column
+        scaler_params: (center, scale) per scaled column; x -> (x - center) / scale
+        running_stats: Running statistics of the scaled columns (in datatypes order), kept by
+            FeaturePreProcessor.partial_fit to update scaler_params with each batch
+    """
+
+    datatypes: DataTypeDict
+    scaler_type: ScalerType = ScalerType.STANDARD
+    drop_na: bool = True
+    remove_outlier: bool = True
+    impute_values: Dict[str, Any] = field(default_factory=dict)
+    group_by: Optional[str] = None
+    group_impute_values: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    knn_reference: Dict[str, List[float]] = field(default_factory=dict)
+    knn_neighbors: int = 3
+    knn_tree: bool = False
+    outlier_bounds: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    scaler_params: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    running_stats: Optional[RunningStats] = field(default=None, compare=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable representation of the state."""
+        return {
+            "version": STATE_VERSION,
+            "datatypes": {col: dtype.value for col, dtype in self.datatypes.items()},
+            "scaler_type": self.scaler_type.value,
+            "drop_na": self.drop_na,
+            "remove_outlier": self.remove_outlier,
+            "impute_values": {col: _to_builtin(value) for col, value in self.impute_values.items()},
+            "group_by": self.group_by,
+            "group_impute_values": {
+                col: {key: _to_builtin(value) for key, value in values.items()}
+                for col, values in self.group_impute_values.items()
+            },
+            "knn_reference": {col: [float(value) for value in values] for col, values in self.knn_reference.items()},
+            "knn_neighbors": self.knn_neighbors,
+            "knn_tree": self.knn_tree,
+            "outlier_bounds": {col: [float(lo), float(hi)] for col, (lo, hi) in self.outlier_bounds.items()},
+            "scaler_params": {col: [float(c), float(s)] for col, (c, s) in self.scaler_params.items()},
+            "running_stats": self.running_stats.to_dict(list(self.scaler_params)) if self.running_stats else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FittedState":
+        """Rebuild a state from the output of to_dict."""
+        version = data.get("version", STATE_VERSION)
+        if version > STATE_VERSION:
+            raise ValueError(f"Unsupported fitted state version: {version}")
+
+        return cls(
+            datatypes={col: DataType(value) for col, value in data["datatypes"].items()},
+            scaler_type=ScalerType(data["scaler_type"]),
+            drop_na=data["drop_na"],
+            remove_outlier=data["remove_outlier"],
+            impute_values=dict(data.get("impute_values", {})),
+            group_by=data.get("group_by"),
+            group_impute_values={col: dict(values) for col, values in data.get("group_impute_values", {}).items()},
+            knn_reference={col: list(values) for col, values in data.get("knn_reference", {}).items()},
+            knn_neighbors=data.get("knn_neighbors", 3),
+            knn_tree=data.get("knn_tree", False),
+            outlier_bounds={col: (lo, hi) for col, (lo, hi) in data.get("outlier_bounds", {}).items()},
+            scaler_params={col: (c, s) for col, (c, s) in data.get("scaler_params", {}).items()},
+            running_stats=RunningStats.from_dict(data["running_stats"]) if data.get("running_stats") else None,
+        )
+
+    def save(self, filepath: Union[str, Path]) -> None:
+        """
+        Save the state as JSON.
+
+        Args:
+            filepath: Output file path
+        """
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, filepath: Union[str, Path]) -> "FittedState":
+        """
+        Load a state previously written by save.
+
+        Args:
+            filepath: Path to the JSON file
+
+        Returns:
+            The loaded FittedState
+        """
+        with open(filepath, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
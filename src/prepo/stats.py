@@ -0,0 +1,583 @@
+"""
+Mergeable column statistics for the prepo package.
+
+This module contains accumulators that are updated batch by batch and can be
+merged across chunks or workers: RunningStats for count, mean, variance, min and
+max, ReservoirSample for a uniform sample, QuantileSketch for quantiles with
+a bounded rank error, HyperLogLog for distinct counts and HeavyHitters for the
+frequencies of the most common values.
+"""
+
+import numbers
+from typing import Any, Dict, List, Union, cast
+
+import numpy as np
+
+# infer_dtype results of object arrays holding only numbers, which pandas compares by value
+NUMBER_KINDS = {"integer", "floating", "mixed-integer-float", "boolean", "decimal", "complex"}
+
+
+class RunningStats:
+    """
+    Array-backed running count, mean, variance, min and max for a block of columns.
+
+    Batches are combined with the parallel variance formula of Chan et al., so two
+    instances built on different chunks can be merged into the statistics of both.
+    NaN values are ignored.
+    """
+
+    def __init__(self, n_columns: int):
+        """
+        Initialize empty statistics.
+
+        Args:
+            n_columns: Number of columns tracked
+        """
+        self.count = np.zeros(n_columns, dtype=np.int64)
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.min = np.full(n_columns, np.inf)
+        self.max = np.full(n_columns, -np.inf)
+
+    def update(self, values: np.ndarray) -> "RunningStats":
+        """
+        Add a batch of rows.
+
+        Args:
+            values: 2D array of shape (rows, n_columns)
+
+        Returns:
+            self
+        """
+        values = np.asarray(values, dtype=float)
+        batch = RunningStats(values.shape[1])
+        batch.count = (~np.isnan(values)).sum(axis=0)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.nansum(values, axis=0) / batch.count
+        batch.mean = np.where(batch.count > 0, mean, 0.0)
+        batch.m2 = np.nansum((values - batch.mean) ** 2, axis=0)
+        batch.min = np.fmin.reduce(values, axis=0, initial=np.inf)
+        batch.max = np.fmax.reduce(values, axis=0, initial=-np.inf)
+
+        return self.merge(batch)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """
+        Merge the statistics of another instance into this one.
+
+        Args:
+            other: Statistics over the same columns
+
+        Returns:
+            self
+        """
+        total = self.count + other.count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(total > 0, other.count / total, 0.0)
+
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * weight
+        self.m2 = self.m2 + other.m2 + delta**2 * self.count * weight
+        self.count = total
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        return self
+
+    def variance(self, ddof: int = 1) -> np.ndarray:
+        """Return the per-column variance, NaN where there are not enough values."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > ddof, self.m2 / (self.count - ddof), np.nan)
+
+    def std(self, ddof: int = 1) -> np.ndarray:
+        """Return the per-column standard deviation (ddof=1 matches pandas)."""
+        return np.asarray(np.sqrt(self.variance(ddof)))
+
+    def means(self) -> np.ndarray:
+        """Return the per-column mean (NaN for columns without values)."""
+        return np.where(self.count > 0, self.mean, np.nan)
+
+    def to_dict(self, columns: List[str]) -> Dict[str, List[float]]:
+        """
+        Return a JSON-serializable representation.
+
+        Args:
+            columns: Names of the tracked columns, in order
+
+        Returns:
+            Dictionary mapping each column to [count, mean, m2, min, max]
+        """
+        return {
+            col: [int(self.count[i]), float(self.mean[i]), float(self.m2[i]), float(self.min[i]), float(self.max[i])]
+            for i, col in enumerate(columns)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, List[float]]) -> "RunningStats":
+        """Rebuild statistics from the output of to_dict (columns in the same order)."""
+        stats = cls(len(data))
+        if data:
+            values = np.array(list(data.values()), dtype=float)
+            stats.count = values[:, 0].astype(np.int64)
+            stats.mean, stats.m2, stats.min, stats.max = values[:, 1], values[:, 2], values[:, 3], values[:, 4]
+        return stats
+
+
+class ReservoirSample:
+    """
+    Fixed-size uniform sample of a stream of values, used to estimate quantiles.
+
+    Values are kept with Algorithm R; two samples are merged by drawing from each in
+    proportion to the number of values it has seen. NaN values are ignored.
+    """
+
+    def __init__(self, capacity: int = 100_000, seed: int = 42):
+        """
+        Initialize an empty sample.
+
+        Args:
+            capacity: Maximum number of values kept
+            seed: Seed for the random number generator
+        """
+        self.capacity = capacity
+        self.seen = 0
+        self.values = np.empty(0)
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray) -> "ReservoirSample":
+        """
+        Add a batch of values.
+
+        Args:
+            values: 1D array of values
+
+        Returns:
+            self
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+
+        free = self.capacity - len(self.values)
+        if free > 0:
+            self.values = np.concatenate([self.values, values[:free]])
+            self.seen += min(free, len(values))
+            values = values[free:]
+
+        if len(values):
+            positions = self.seen + np.arange(len(values))
+            slots = self._rng.integers(0, positions + 1)
+            keep = slots < self.capacity
+            self.values[slots[keep]] = values[keep]
+            self.seen += len(values)
+
+        return self
+
+    def merge(self, other: "ReservoirSample") -> "ReservoirSample":
+        """
+        Merge another sample into this one.
+
+        Args:
+            other: Sample over the same column
+
+        Returns:
+            self
+        """
+        total = self.seen + other.seen
+        if total == 0:
+            return self
+
+        size = min(self.capacity, len(self.values) + len(other.values))
+        n_self = min(len(self.values), int(round(size * self.seen / total)))
+        n_other = min(len(other.values), size - n_self)
+
+        self.values = np.concatenate(
+            [
+                self._rng.choice(self.values, n_self, replace=False),
+                self._rng.choice(other.values, n_other, replace=False),
+            ]
+        )
+        self.seen = total
+        return self
+
+    def quantile(self, q: Union[float, List[float]]) -> Any:
+        """Return the estimated quantile or quantiles of the values seen, NaN if empty."""
+        if len(self.values) == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        return np.quantile(self.values, q)
+
+
+class QuantileSketch:
+    """
+    Mergeable KLL quantile sketch of a stream of values.
+
+    Values are kept in a hierarchy of compactors: an item on level h stands for 2**h
+    values, and when the sketch is over capacity the lowest full level is sorted and every
+    other item (from a random offset) is promoted to the next level. Sketches built on
+    different chunks or workers can be merged into a sketch of all their values, and the
+    memory used depends on k, not on the number of values. Quantiles are exact until the
+    first compaction; afterwards the rank error is about rank_error with high probability.
+    NaN values are ignored.
+    """
+
+    def __init__(self, k: int = 200, seed: int = 42):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            k: Size of the largest compactor; the rank error shrinks roughly as 1/k
+            seed: Seed for the random number generator
+        """
+        if k < 8:
+            raise ValueError(f"k must be at least 8, got {k}")
+        self.k = k
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def for_error(cls, rank_error: float, seed: int = 42) -> "QuantileSketch":
+        """
+        Create a sketch whose normalized rank error is about rank_error.
+
+        Args:
+            rank_error: Target error of a quantile's rank as a fraction of the count (e.g. 0.01)
+            seed: Seed for the random number generator
+
+        Returns:
+            An empty sketch
+        """
+        if not 0 < rank_error < 1:
+            raise ValueError(f"rank_error must be between 0 and 1, got {rank_error}")
+        # Inverse of the empirical KLL error bound used by rank_error
+        return cls(k=max(8, int(np.ceil((2.296 / rank_error) ** (1 / 0.9723)))), seed=seed)
+
+    @property
+    def rank_error(self) -> float:
+        """Approximate normalized rank error of a single quantile (99% confidence)."""
+        return float(2.296 / self.k**0.9723)
+
+    def _capacity(self, level: int) -> int:
+        """Return the capacity of a level; lower levels shrink geometrically."""
+        depth = len(self.levels) - 1 - level
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self) -> None:
+        """Compact levels until the sketch is within its total capacity."""
+        while sum(len(items) for items in self.levels) > sum(self._capacity(h) for h in range(len(self.levels))):
+            h = next(h for h, items in enumerate(self.levels) if len(items) > self._capacity(h))
+            if h == len(self.levels) - 1:
+                self.levels.append(np.empty(0))
+
+            items = np.sort(self.levels[h])
+            # An odd item out stays on its level, so the total weight is preserved
+            odd = len(items) % 2
+            offset = self._rng.integers(2)
+            self.levels[h] = items[len(items) - odd :]
+            self.levels[h + 1] = np.concatenate([self.levels[h + 1], items[offset : len(items) - odd : 2]])
+
+    def update(self, values: np.ndarray) -> "QuantileSketch":
+        """
+        Add a batch of values.
+
+        Args:
+            values: 1D array of values
+
+        Returns:
+            self
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        self.count += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def update_repeated(self, value: float, times: int) -> "QuantileSketch":
+        """
+        Add one value repeated many times without materializing the repeats.
+
+        The repeats are stored as one item per set bit of times, on the level of that bit.
+
+        Args:
+            value: Value to add
+            times: Number of repeats
+
+        Returns:
+            self
+        """
+        if times <= 0 or np.isnan(value):
+            return self
+
+        other = QuantileSketch(self.k)
+        other.levels = [np.full((times >> h) & 1, float(value)) for h in range(times.bit_length())]
+        other.count, other.min, other.max = times, value, value
+        return self.merge(other)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """
+        Merge another sketch into this one.
+
+        Args:
+            other: Sketch over the same column (from another chunk or worker)
+
+        Returns:
+            self
+        """
+        for h, items in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def quantile(self, q: Union[float, List[float]]) -> Any:
+        """Return the estimated quantile or quantiles with linear interpolation, NaN if empty."""
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        if len(self.levels) == 1:
+            return np.quantile(self.levels[0], q)
+
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0**h) for h, items in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        values, weights = values[order], weights[order]
+
+        # Each item stands for the ranks it covers; interpolate between their centers
+        centers = np.cumsum(weights) - (weights + 1) / 2
+        centers = np.concatenate([[0.0], centers, [self.count - 1.0]])
+        values = np.concatenate([[self.min], values, [self.max]])
+        return np.interp(np.asarray(q, dtype=float) * (self.count - 1), centers, values)
+
+
+def _value_kind(value: Any) -> str:
+    """Return the kind a value is compared within: numbers (bool included) equal across types, others by type."""
+    if isinstance(value, (numbers.Number, np.bool_)):
+        return "number"
+    return type(value).__name__
+
+
+def _hash_values(values: Any) -> np.ndarray:
+    """
+    Return 64-bit hashes of the non-null values of a 1D array or Series.
+
+    hash_array hashes object values by their string form, so the values of object arrays
+    are hashed together with their kind: 1 and 1.0 still hash alike, but "1" does not,
+    as in Series.nunique and value_counts.
+    """
+    import pandas as pd
+    from pandas.util import hash_array
+
+    values = np.asarray(values)
+    values = values[~pd.isna(values)]
+    if values.dtype.kind in "US":
+        values = values.astype(object)
+    hashes = np.asarray(hash_array(values))
+    if values.dtype != object:
+        return hashes
+
+    inferred = pd.api.types.infer_dtype(values, skipna=False)
+    if inferred == "string":
+        kinds = np.array(["str"], dtype=object)
+    elif inferred in NUMBER_KINDS:
+        kinds = np.array(["number"], dtype=object)
+    else:
+        kinds = np.array([_value_kind(value) for value in values], dtype=object)
+    hashes ^= np.asarray(hash_array(kinds))
+    return hashes
+
+
+class HyperLogLog:
+    """
+    Mergeable HyperLogLog estimate of the number of distinct values in a stream.
+
+    While the cardinality is small, the sketch keeps the distinct 64-bit hashes and its
+    count is exact (up to hash collisions). Past 2**precision / 8 hashes, the same memory
+    as the registers, it switches to 2**precision registers holding the longest run of
+    leading zeros per bucket, with a relative standard error of about
+    1.04 / sqrt(2**precision). Null values are ignored.
+    """
+
+    def __init__(self, precision: int = 12):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            precision: Number of hash bits selecting a register (4 to 18)
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError(f"precision must be between 4 and 18, got {precision}")
+        self.precision = precision
+        self.hashes: Union[np.ndarray, None] = np.empty(0, dtype=np.uint64)
+        self.registers: Union[np.ndarray, None] = None
+
+    @property
+    def relative_error(self) -> float:
+        """Relative standard error of the estimate once registers are used."""
+        return float(1.04 / np.sqrt(2**self.precision))
+
+    def _add_to_registers(self, hashes: np.ndarray) -> None:
+        """Fold hashes into the registers."""
+        registers = self.registers
+        if registers is None:
+            registers = self.registers = np.zeros(2**self.precision, dtype=np.uint8)
+
+        width = 64 - self.precision
+        index = (hashes >> np.uint64(width)).astype(np.intp)
+        rest = hashes & np.uint64((1 << width) - 1)
+        # Bit length of rest: frexp may round up to the next power of two, so correct it
+        bits = np.frexp(rest.astype(float))[1].astype(np.int64)
+        rounded = (bits > 0) & (np.left_shift(np.uint64(1), np.maximum(bits - 1, 0).astype(np.uint64)) > rest)
+        bits -= rounded
+        rank = (width - bits + 1).astype(np.uint8)
+        np.maximum.at(registers, index, rank)
+
+    def _add_hashes(self, hashes: np.ndarray) -> None:
+        """Add 64-bit hashes to the exact set or the registers."""
+        if self.hashes is None:
+            self._add_to_registers(hashes)
+            return
+
+        exact = np.union1d(self.hashes, hashes)
+        if len(exact) > 2**self.precision // 8:
+            self._add_to_registers(exact)
+            self.hashes = None
+        else:
+            self.hashes = exact
+
+    def update(self, values: Any) -> "HyperLogLog":
+        """
+        Add a batch of values.
+
+        Args:
+            values: 1D array or Series of hashable values
+
+        Returns:
+            self
+        """
+        self._add_hashes(_hash_values(values))
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """
+        Merge another sketch into this one.
+
+        Args:
+            other: Sketch with the same precision
+
+        Returns:
+            self
+        """
+        if other.precision != self.precision:
+            raise ValueError(f"Cannot merge precision {other.precision} into {self.precision}")
+        if other.hashes is not None:
+            self._add_hashes(other.hashes)
+            return self
+
+        if self.hashes is not None:
+            self._add_to_registers(self.hashes)
+            self.hashes = None
+        if self.registers is not None and other.registers is not None:
+            np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> float:
+        """Return the estimated number of distinct values (exact while the hashes are kept)."""
+        if self.hashes is not None:
+            return float(len(self.hashes))
+
+        # The registers replace the hashes, so exactly one of them is set
+        registers = cast(np.ndarray, self.registers)
+        m = len(registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int64)))
+        zeros = np.count_nonzero(registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate while many registers are empty
+            return float(m * np.log(m / zeros))
+        return float(estimate)
+
+
+class HeavyHitters:
+    """
+    Mergeable Misra-Gries summary of the most frequent values in a stream.
+
+    At most capacity values are tracked by hash. Each tracked count underestimates the
+    true frequency by at most error, which is bounded by count / (capacity + 1), so any
+    value more frequent than that is guaranteed to be tracked. Null values are ignored.
+    """
+
+    def __init__(self, capacity: int = 64):
+        """
+        Initialize an empty summary.
+
+        Args:
+            capacity: Number of values tracked
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self.count = 0
+        self.error = 0
+        self.keys = np.empty(0, dtype=np.uint64)
+        self.counts = np.empty(0, dtype=np.int64)
+
+    def _add_counts(self, keys: np.ndarray, counts: np.ndarray) -> None:
+        """Combine (key, count) pairs with the tracked ones and trim to capacity."""
+        keys, inverse = np.unique(np.concatenate([self.keys, keys]), return_inverse=True)
+        counts = np.bincount(inverse.ravel(), weights=np.concatenate([self.counts, counts])).astype(np.int64)
+
+        if len(keys) > self.capacity:
+            # Subtracting the (capacity + 1)-th largest count keeps at most capacity positives
+            threshold = np.partition(counts, len(counts) - self.capacity - 1)[len(counts) - self.capacity - 1]
+            counts = counts - threshold
+            keep = counts > 0
+            keys, counts = keys[keep], counts[keep]
+            self.error += int(threshold)
+
+        self.keys, self.counts = keys, counts
+
+    def update(self, values: Any) -> "HeavyHitters":
+        """
+        Add a batch of values.
+
+        Args:
+            values: 1D array or Series of hashable values
+
+        Returns:
+            self
+        """
+        keys, counts = np.unique(_hash_values(values), return_counts=True)
+        self.count += int(counts.sum())
+        self._add_counts(keys, counts)
+        return self
+
+    def merge(self, other: "HeavyHitters") -> "HeavyHitters":
+        """
+        Merge another summary into this one.
+
+        Args:
+            other: Summary over the same column
+
+        Returns:
+            self
+        """
+        self.count += other.count
+        self.error += other.error
+        self._add_counts(other.keys, other.counts)
+        return self
+
+    def max_frequency(self) -> float:
+        """Return the estimated share of the most frequent value (NaN if empty)."""
+        if self.count == 0:
+            return np.nan
+        return float(self.counts.max(initial=0)) / self.count
@@ -0,0 +1,318 @@
+"""
+Chunked processing for files larger than memory.
+
+This module contains the ChunkedProcessor class, which fits a FittedState over a
+sequence of chunks with the mergeable accumulators of the stats module and then
+transforms and writes the data one chunk at a time.
+"""
+
+from collections import Counter
+from itertools import chain
+from pathlib import Path
+from typing import Any, Callable, Dict, Generator, Iterable, Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .io import FileReader, FileWriter
+from .pipeline import map_ordered, read_ahead
+from .preprocessor import NUMERIC_TYPES, FeaturePreProcessor
+from .state import FittedState
+from .stats import QuantileSketch, RunningStats
+from .types import DataType, DataTypeDict, FileFormat, ImputeStrategy, SamplingMethod, ScalerType
+
+ChunkSource = Callable[[], Iterable[pd.DataFrame]]
+
+
+def _mode(counts: Counter) -> Any:
+    """Return the most frequent value, breaking ties like pandas' mode (smallest value)."""
+    top = max(counts.values())
+    return sorted(value for value, count in counts.items() if count == top)[0]
+
+
+class ChunkedProcessor:
+    """
+    Streaming counterpart of FeaturePreProcessor.process for data larger than memory.
+
+    Fitting reads the data chunk by chunk: the datatypes are detected on the first chunk,
+    imputation values and outlier bounds are accumulated in a first pass, and the scaler
+    parameters in a second pass over the cleaned, outlier-filtered chunks. Outlier bounds
+    are computed for all columns at once, as with sequential_outliers=False, and quartiles
+    and medians are estimated with mergeable QuantileSketches within quantile_error, so
+    results can differ slightly from the in-memory path. Missing values are filled with the
+    fitted per-column statistics (column means for KNN imputation) rather than by a neighbor
+    search. Peak memory depends on the chunk size, not on the file size.
+
+    With pipeline=True, chunks are read by a background thread and transformed by a pool
+    of worker threads while the previous results are accumulated or written, with at most
+    queue_size chunks waiting between stages; the output order is preserved.
+
+    Datatypes are detected on the first chunk unless a sampling method is set, in which
+    case fit detects them on FileReader.read_sample of the whole file, so columns whose
+    values change later in the file are typed correctly. Stratified sampling reads only
+    the sampled parts of CSV and Parquet files; reservoir sampling costs an extra pass.
+    """
+
+    def __init__(
+        self,
+        processor: Optional[FeaturePreProcessor] = None,
+        reader: Optional[FileReader] = None,
+        writer: Optional[FileWriter] = None,
+        chunksize: int = 100_000,
+        quantile_error: float = 0.001,
+        pipeline: bool = False,
+        workers: int = 1,
+        queue_size: int = 2,
+        sampling: Optional[Union[SamplingMethod, str]] = None,
+    ):
+        """
+        Initialize the ChunkedProcessor.
+
+        Args:
+            processor: FeaturePreProcessor used for detection and transformation
+            reader: FileReader used to read input chunks
+            writer: FileWriter used to append output chunks
+            chunksize: Number of rows per chunk
+            quantile_error: Normalized rank error of the quantile sketches used for medians,
+                outlier quartiles and robust scaling (memory per column grows as 1/quantile_error)
+            pipeline: Overlap reading, transforming and writing chunks in threads
+            workers: Number of threads transforming chunks when pipeline is True
+            queue_size: Maximum number of chunks waiting between two pipeline stages
+            sampling: Detect datatypes on a sample of the whole file (stratified, reservoir)
+                instead of on the first chunk
+        """
+        self.processor = processor or FeaturePreProcessor()
+        self.reader = reader or FileReader(null_values=self.processor.null_values)
+        self.writer = writer or FileWriter()
+        self.chunksize = chunksize
+        self.quantile_error = quantile_error
+        self.pipeline = pipeline
+        self.workers = workers
+        self.queue_size = queue_size
+        self.sampling = SamplingMethod(sampling) if isinstance(sampling, str) else sampling
+
+    def _read(self, chunks: Iterable[pd.DataFrame]) -> Generator[pd.DataFrame, None, None]:
+        """Iterate over chunks, reading ahead in a background thread when pipelined."""
+        if self.pipeline:
+            yield from read_ahead(chunks, self.queue_size)
+        else:
+            yield from chunks
+
+    def _transform(self, chunks: Iterable[pd.DataFrame], state: FittedState) -> Iterator[pd.DataFrame]:
+        """Transform chunks with a fitted state, in worker threads when pipelined."""
+        if self.pipeline:
+            yield from map_ordered(lambda chunk: self.processor.transform(chunk, state), chunks, self.workers, self.queue_size)
+        else:
+            yield from (self.processor.transform(chunk, state) for chunk in chunks)
+
+    def fit_chunks(
+        self,
+        chunks: ChunkSource,
+        drop_na: bool = True,
+        scaler_type: Union[ScalerType, str] = ScalerType.STANDARD,
+        remove_outlier: bool = True,
+        datatypes: Optional[DataTypeDict] = None,
+    ) -> FittedState:
+        """
+        Fit a state over a sequence of chunks.
+
+        Args:
+            chunks: Callable returning a fresh iterable of DataFrame chunks on each call
+            drop_na: Whether to drop NA values during cleaning
+            scaler_type: Type of scaler to use (standard, robust, minmax, none)
+            remove_outlier: Choose to remove outliers or not
+            datatypes: Column datatypes (detected on the first chunk if None)
+
+        Returns:
+            The fitted state (also stored in processor.fitted_state)
+        """
+        scaler_type = self.processor._resolve_scaler_type(scaler_type)
+        needs_first_pass = not drop_na or remove_outlier
+
+        reader = self._read(chunks())
+        try:
+            first = next(reader, None)
+            if first is None:
+                raise ValueError("Cannot fit on empty input: no chunks were read")
+
+            state = FittedState(
+                datatypes=datatypes if datatypes is not None else self.processor.determine_datatypes(first),
+                scaler_type=scaler_type,
+                drop_na=drop_na,
+                remove_outlier=remove_outlier,
+            )
+            accumulators = self._first_pass_accumulators(state)
+            if needs_first_pass:
+                for clean in self._transform(chain([first], reader), state):
+                    self._update_first_pass(accumulators, clean)
+        finally:
+            reader.close()
+
+        if needs_first_pass:
+            self._finalize_first_pass(accumulators, state)
+
+        if scaler_type != ScalerType.NONE:
+            state.scaler_params = self._fit_scaler(chunks, state)
+
+        self.processor.fitted_state = state
+        return state
+
+    def _first_pass_accumulators(self, state: FittedState) -> Dict[str, Any]:
+        """Create the accumulators for imputation values and outlier quartiles."""
+        numeric_cols = [col for col, dtype in state.datatypes.items() if dtype in NUMERIC_TYPES]
+        categorical_cols = [col for col, dtype in state.datatypes.items() if dtype == DataType.CATEGORICAL]
+        outlier_cols = [col for col in numeric_cols if self.processor._is_outlier_column(col, state.datatypes[col])]
+
+        impute_cols = numeric_cols if not state.drop_na else []
+        outlier_cols = outlier_cols if state.remove_outlier else []
+        # Median strategies need the value distribution, KNN statistics are column means
+        use_median = self.processor.impute_strategy != ImputeStrategy.KNN
+        sampled_cols = set(outlier_cols) | (set(impute_cols) if use_median else set())
+
+        return {
+            "rows": 0,
+            "numeric_cols": impute_cols,
+            "categorical_cols": categorical_cols if not state.drop_na else [],
+            "outlier_cols": outlier_cols,
+            "use_median": use_median,
+            "stats": RunningStats(len(impute_cols)),
+            "counts": {col: Counter() for col in categorical_cols},
+            "sketches": {col: QuantileSketch.for_error(self.quantile_error) for col in sampled_cols},
+        }
+
+    def _update_first_pass(self, accumulators: Dict[str, Any], clean: pd.DataFrame) -> None:
+        """Accumulate one cleaned (but not yet imputed) chunk."""
+        accumulators["rows"] += len(clean)
+        if accumulators["numeric_cols"]:
+            accumulators["stats"].update(clean[accumulators["numeric_cols"]].to_numpy(dtype=float))
+        for col in accumulators["categorical_cols"]:
+            accumulators["counts"][col].update(clean[col].value_counts().to_dict())
+        for col, sketch in accumulators["sketches"].items():
+            sketch.update(clean[col].to_numpy(dtype=float))
+
+    def _finalize_first_pass(self, accumulators: Dict[str, Any], state: FittedState) -> None:
+        """
+        Turn the first-pass accumulators into imputation values and outlier bounds.
+
+        Grouped-median imputation is not tracked per group here; it falls back to column medians.
+        """
+        stats = accumulators["stats"]
+        means = stats.means()
+        for i, col in enumerate(accumulators["numeric_cols"]):
+            if accumulators["use_median"]:
+                state.impute_values[col] = float(accumulators["sketches"][col].quantile(0.5))
+            else:
+                state.impute_values[col] = means[i]
+        for col in accumulators["categorical_cols"]:
+            if accumulators["counts"][col]:
+                state.impute_values[col] = _mode(accumulators["counts"][col])
+
+        for col in accumulators["outlier_cols"]:
+            sketch = accumulators["sketches"][col]
+            # Imputed rows take part in the quartiles, as in the in-memory path
+            if not state.drop_na:
+                index = accumulators["numeric_cols"].index(col)
+                n_missing = int(accumulators["rows"] - stats.count[index])
+                sketch.update_repeated(state.impute_values[col], n_missing)
+
+            q1, q3 = sketch.quantile([0.25, 0.75])
+            iqrv = q3 - q1
+            state.outlier_bounds[col] = (q1 - 1.5 * iqrv, q3 + 1.5 * iqrv)
+
+    def _fit_scaler(self, chunks: ChunkSource, state: FittedState) -> Dict[str, Any]:
+        """Accumulate scaler parameters over the cleaned and outlier-filtered chunks."""
+        cols = self.processor._scalable_columns(list(state.datatypes), state.datatypes)
+        if not cols:
+            return {}
+
+        stats = RunningStats(len(cols))
+        sketches = {col: QuantileSketch.for_error(self.quantile_error) for col in cols}
+        robust = state.scaler_type == ScalerType.ROBUST
+
+        for clean in self._transform(self._read(chunks()), state):
+            values = clean[cols].to_numpy(dtype=float)
+            stats.update(values)
+            if robust:
+                for i, col in enumerate(cols):
+                    sketches[col].update(values[:, i])
+
+        if state.scaler_type in [ScalerType.STANDARD, ScalerType.MINMAX]:
+            centers, scales = self.processor._running_scaler_params(stats, state.scaler_type)
+        else:
+            quartiles = np.array([sketches[col].quantile([0.25, 0.5, 0.75]) for col in cols])
+            centers, scales = quartiles[:, 1], quartiles[:, 2] - quartiles[:, 0]
+
+        return {col: (float(centers[i]), float(scales[i])) for i, col in enumerate(cols)}
+
+    def fit(
+        self,
+        filepath: Union[str, Path],
+        file_format: Optional[FileFormat] = None,
+        drop_na: bool = True,
+        scaler_type: Union[ScalerType, str] = ScalerType.STANDARD,
+        remove_outlier: bool = True,
+    ) -> FittedState:
+        """
+        Fit a state on a file read in chunks.
+
+        Args:
+            filepath: Path to the input file
+            file_format: Explicit file format (auto-detected if None)
+            drop_na: Whether to drop NA values during cleaning
+            scaler_type: Type of scaler to use (standard, robust, minmax, none)
+            remove_outlier: Choose to remove outliers or not
+
+        Returns:
+            The fitted state
+        """
+        datatypes = None
+        if self.sampling is not None:
+            sample = self.reader.read_sample(
+                filepath,
+                size=self.processor.sample_size,
+                method=self.sampling,
+                chunksize=self.chunksize,
+                file_format=file_format,
+            )
+            datatypes = self.processor.determine_datatypes(sample)
+
+        return self.fit_chunks(
+            lambda: self.reader.iter_chunks(filepath, self.chunksize, file_format=file_format),
+            drop_na=drop_na,
+            scaler_type=scaler_type,
+            remove_outlier=remove_outlier,
+            datatypes=datatypes,
+        )
+
+    def process_file(
+        self,
+        input_path: Union[str, Path],
+        output_path: Union[str, Path],
+        input_format: Optional[FileFormat] = None,
+        output_format: Optional[FileFormat] = None,
+        drop_na: bool = True,
+        scaler_type: Union[ScalerType, str] = ScalerType.STANDARD,
+        remove_outlier: bool = True,
+    ) -> int:
+        """
+        Fit on a file in chunks, then transform it chunk by chunk into the output file.
+
+        Args:
+            input_path: Path to the input file
+            output_path: Output file path
+            input_format: Explicit input file format (auto-detected if None)
+            output_format: Explicit output file format (auto-detected if None)
+            drop_na: Whether to drop NA values during cleaning
+            scaler_type: Type of scaler to use (standard, robust, minmax, none)
+            remove_outlier: Choose to remove outliers or not
+
+        Returns:
+            Number of rows written
+        """
+        state = self.fit(
+            input_path, file_format=input_format, drop_na=drop_na, scaler_type=scaler_type, remove_outlier=remove_outlier
+        )
+        chunks = self.reader.iter_chunks(input_path, self.chunksize, file_format=input_format)
+        return self.writer.write_chunks(
+            self._transform(self._read(chunks), state), output_path, file_format=output_format, datatypes=state.datatypes
+        )
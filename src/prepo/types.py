@@ -39,6 +39,37 @@ class ScalerType(Enum):
         return self.value
 
 
+class ImputeStrategy(Enum):
+    """Type-safe enumeration for missing value imputation strategies."""
+
+    KNN = "knn"
+    MEDIAN = "median"
+    GROUPED_MEDIAN = "grouped_median"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class ParallelBackend(Enum):
+    """Type-safe enumeration for the worker pools used by parallel datatype detection."""
+
+    THREAD = "thread"
+    PROCESS = "process"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class SamplingMethod(Enum):
+    """Type-safe enumeration for the row samplers used to inspect large files."""
+
+    RESERVOIR = "reservoir"
+    STRATIFIED = "stratified"
+
+    def __str__(self) -> str:
+        return self.value
+
+
 class FileFormat(Enum):
     """Type-safe enumeration for supported file formats."""
 
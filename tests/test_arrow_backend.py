@@ -0,0 +1,191 @@
+"""
+Tests for the Arrow backend.
+"""
+
+import os
+import tempfile
+import unittest
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from src.prepo.cli import main
+from src.prepo.dependencies import HAS_PYARROW, is_arrow_table
+from src.prepo.io import FileReader, FileWriter
+from src.prepo.preprocessor import FeaturePreProcessor
+from src.prepo.types import DataType, ScalerType
+
+if HAS_PYARROW:
+    import pyarrow as pa
+
+WINE_PATH = Path(__file__).resolve().parent.parent / "data" / "raw" / "winequality-white.csv"
+
+
+@unittest.skipUnless(HAS_PYARROW, "pyarrow not installed")
+class TestArrowBackend(unittest.TestCase):
+    """Test cases comparing the Arrow backend with the pandas path."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        rng = np.random.default_rng(1)
+        n = 500
+        price = [str(round(x, 2)) for x in rng.normal(100, 20, n)]
+        for i in rng.choice(n, 30, replace=False):
+            price[i] = "?"
+        rating = rng.random(n)
+        rating[rng.choice(n, 20, replace=False)] = np.nan
+        city = rng.choice(["north", "south", "east"], n).astype(object)
+        city[rng.choice(n, 10, replace=False)] = None
+
+        self.df = pd.DataFrame(
+            {
+                "price": price,
+                "rating": rating,
+                "city_group": city,
+                "signup": pd.date_range("2020-01-01", periods=n).strftime("%Y-%m-%d"),
+                "visits": rng.integers(0, 50, n),
+                "customer_id": np.arange(n),
+            }
+        )
+        self.table = pa.Table.from_pandas(self.df, preserve_index=False)
+        self.processor = FeaturePreProcessor()
+
+    def assert_same_output(self, expected: pd.DataFrame, actual: pd.DataFrame):
+        """Check that two processed frames have the same rows and values."""
+        self.assertEqual(list(expected.columns), list(actual.columns))
+        self.assertEqual(len(expected), len(actual))
+        numeric = expected.select_dtypes("number").columns
+        np.testing.assert_allclose(expected[numeric].to_numpy(float), actual[numeric].to_numpy(float), atol=1e-9)
+        self.assertEqual(expected["city_group"].tolist(), actual["city_group"].tolist())
+
+    def test_is_arrow_table(self):
+        """Test pyarrow Table detection."""
+        self.assertTrue(is_arrow_table(self.table))
+        self.assertFalse(is_arrow_table(self.df))
+
+    def test_determine_datatypes_matches_pandas(self):
+        """Test that both backends detect the same datatypes."""
+        datatypes = self.processor.determine_datatypes(self.table)
+        self.assertEqual(datatypes, self.processor.determine_datatypes(self.df))
+        self.assertEqual(datatypes["price"], DataType.PRICE)
+        self.assertEqual(datatypes["city_group"], DataType.CATEGORICAL)
+
+    def test_process_matches_pandas(self):
+        """Test that process gives equivalent output for every option."""
+        options = [
+            {},
+            {"drop_na": False},
+            {"scaler_type": ScalerType.ROBUST, "sequential_outliers": False},
+            {"scaler_type": ScalerType.MINMAX, "remove_outlier": False},
+        ]
+        for strategy in ["knn", "median", "grouped_median"]:
+            processor = FeaturePreProcessor(impute_strategy=strategy)
+            for kwargs in options:
+                with self.subTest(strategy=strategy, **kwargs):
+                    expected = processor.process(self.df, **kwargs)
+                    result = processor.process(self.table, **kwargs)
+                    self.assertIsInstance(result, pa.Table)
+                    self.assert_same_output(expected, result.to_pandas())
+
+    def test_step_methods(self):
+        """Test clean_data, clean_outliers and scaler on pyarrow input."""
+        clean_pd, datatypes = self.processor.clean_data(self.df)
+        clean_pa, datatypes_pa = self.processor.clean_data(self.table)
+        self.assertEqual(datatypes, datatypes_pa)
+        self.assert_same_output(clean_pd, clean_pa.to_pandas())
+
+        filtered_pd = self.processor.clean_outliers(clean_pd, datatypes)
+        filtered_pa = self.processor.clean_outliers(clean_pa, datatypes)
+        self.assert_same_output(filtered_pd, filtered_pa.to_pandas())
+
+        self.processor.scaler(filtered_pd, "robust", datatypes)
+        scaled_pa = self.processor.scaler(filtered_pa, "robust", datatypes)
+        self.assert_same_output(filtered_pd.reset_index(drop=True), scaled_pa.to_pandas())
+
+    def test_dictionary_columns_match_pandas(self):
+        """Test that null tokens in dictionary-encoded columns are masked as in pandas."""
+        df = self.df.assign(city_group=self.df["city_group"].fillna("na").astype("category"))
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        self.assertTrue(pa.types.is_dictionary(table.schema.field("city_group").type))
+
+        for drop_na in [True, False]:
+            with self.subTest(drop_na=drop_na):
+                expected = self.processor.process(df, drop_na=drop_na)
+                result = self.processor.process(table, drop_na=drop_na).to_pandas()
+                self.assertEqual(len(expected), len(result))
+                self.assertEqual(expected["city_group"].astype(str).tolist(), result["city_group"].astype(str).tolist())
+
+    def test_pandas_metadata_dropped(self):
+        """Test that replaced columns do not come back with their input pandas dtypes."""
+        table = pa.Table.from_pandas(self.df)
+        self.assertIn(b"pandas", table.schema.metadata)
+
+        result = self.processor.process(table)
+        self.assertFalse(result.schema.metadata)
+        self.assertEqual(result.to_pandas()["price"].dtype, np.float64)
+
+    def test_unchanged_columns_are_shared(self):
+        """Test that columns no stage changes keep the input buffers."""
+        table = self.table.select(["signup", "city_group", "visits"]).drop_null()
+        result = self.processor.process(table)
+
+        for col in ["signup", "city_group"]:
+            shared = result.column(col).chunk(0).buffers()[-1].address == table.column(col).chunk(0).buffers()[-1].address
+            self.assertTrue(shared, col)
+
+    def test_wine_dataset(self):
+        """Test the backend on the wine quality dataset read natively by pyarrow."""
+        import pyarrow.csv as csv
+
+        table = FileReader().read_arrow(WINE_PATH, parse_options=csv.ParseOptions(delimiter=";"))
+        df = pd.read_csv(WINE_PATH, sep=";")
+
+        self.assertEqual(self.processor.determine_datatypes(table), self.processor.determine_datatypes(df))
+        expected = self.processor.process(df)
+        result = self.processor.process(table).to_pandas()
+        np.testing.assert_allclose(expected.to_numpy(float), result.to_numpy(float), atol=1e-9)
+
+    def test_read_and_write_arrow(self):
+        """Test reading every Arrow-native format into a Table and writing Tables."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            writer = FileWriter()
+            reader = FileReader()
+            expected = self.processor.process(self.df)
+
+            for name in ["data.parquet", "data.feather", "data.orc", "data.csv", "data.tsv", "data.json"]:
+                with self.subTest(name=name):
+                    input_path = os.path.join(temp_dir, name)
+                    writer.write_file(self.table, input_path)
+                    table = reader.read_arrow(input_path)
+                    self.assertIsInstance(table, pa.Table)
+                    self.assertEqual(table.num_rows, len(self.df))
+
+                    output_path = os.path.join(temp_dir, "out_" + name)
+                    writer.write_file(self.processor.process(table), output_path)
+                    written = reader.read_file(output_path)
+                    self.assertEqual(len(written), len(expected))
+
+            written = pd.read_parquet(os.path.join(temp_dir, "out_data.parquet"))
+            self.assert_same_output(expected, written)
+
+    @patch("builtins.print")
+    def test_cli_pyarrow(self, mock_print):
+        """Test that the CLI keeps Arrow-native formats in Arrow with --pyarrow."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_path = os.path.join(temp_dir, "input.parquet")
+            output_path = os.path.join(temp_dir, "output.feather")
+            self.df.to_parquet(input_path)
+
+            with patch.object(FileReader, "read_file", side_effect=AssertionError("pandas reader used")):
+                with patch("sys.argv", ["prepo", input_path, output_path, "--pyarrow"]):
+                    with patch("sys.stderr", new_callable=StringIO):
+                        main()
+
+            self.assert_same_output(self.processor.process(self.df), pd.read_feather(output_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Tests for the benchmark suite.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from benchmarks.bench import compare, main, run
+from benchmarks.datasets import DATASETS
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Test cases for the benchmark runner and comparison."""
+
+    def test_datasets(self):
+        """Test that every synthetic generator returns the requested number of rows."""
+        for name, generator in DATASETS.items():
+            with self.subTest(name=name):
+                df = generator(200, seed=1)
+                self.assertEqual(len(df), 200)
+                self.assertTrue(df.equals(generator(200, seed=1)))
+
+    @patch("builtins.print")
+    def test_run(self, mock_print):
+        """Test that a run records time and peak memory for every stage."""
+        results = run(["tall"], [500], repeat=1, max_cells=10**6)
+
+        stages = {record["stage"] for record in results["results"]}
+        self.assertTrue({"determine_datatypes", "clean_data", "clean_outliers", "scaler", "process"} <= stages)
+        self.assertTrue({"write_csv", "read_csv"} <= stages)
+        for record in results["results"]:
+            self.assertEqual(record["rows"], 500)
+            self.assertGreater(record["seconds"], 0)
+            self.assertGreaterEqual(record["peak_bytes"], 0)
+
+        skipped = run(["wide"], [500], repeat=1, max_cells=100)
+        self.assertEqual(skipped["results"], [])
+
+    def test_compare(self):
+        """Test that only slowdowns and memory growth above the thresholds are flagged."""
+
+        def results(seconds, peak_bytes):
+            record = {"dataset": "tall", "rows": 10, "stage": "process", "seconds": seconds, "peak_bytes": peak_bytes}
+            return {"results": [record]}
+
+        baseline = results(1.0, 10 * 2**20)
+        self.assertEqual(compare(baseline, results(1.1, 10 * 2**20))[0]["regressions"], [])
+        self.assertEqual(compare(baseline, results(1.5, 10 * 2**20))[0]["regressions"], ["time"])
+        self.assertEqual(compare(baseline, results(1.0, 20 * 2**20))[0]["regressions"], ["memory"])
+        self.assertEqual(compare(results(0.001, 100), results(0.003, 1000))[0]["regressions"], [])
+
+        failed = {"results": [{"dataset": "tall", "rows": 10, "stage": "process", "error": "ValueError"}]}
+        self.assertEqual(compare(baseline, failed), [])
+
+    @patch("builtins.print")
+    def test_compare_command(self, mock_print):
+        """Test the compare command exit status."""
+        record = {"dataset": "tall", "rows": 10, "stage": "process", "seconds": 1.0, "peak_bytes": 100}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            baseline_path = os.path.join(temp_dir, "baseline.json")
+            current_path = os.path.join(temp_dir, "current.json")
+            with open(baseline_path, "w") as f:
+                json.dump({"results": [record]}, f)
+
+            with open(current_path, "w") as f:
+                json.dump({"results": [record]}, f)
+            self.assertEqual(main(["compare", baseline_path, current_path]), 0)
+
+            with open(current_path, "w") as f:
+                json.dump({"results": [{**record, "seconds": 2.0}]}, f)
+            self.assertEqual(main(["compare", baseline_path, current_path]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
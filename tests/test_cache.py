@@ -0,0 +1,127 @@
+"""
+Tests for the cache module.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from src.prepo.cache import DatatypeCache
+from src.prepo.preprocessor import FeaturePreProcessor
+from src.prepo.types import DataType
+
+
+def make_batch(seed: int, n: int = 300) -> pd.DataFrame:
+    """Create a batch with the same schema and different values for each seed."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "price": rng.normal(100, 10, n).round(2),
+            "rating": rng.random(n),
+            "visits": rng.integers(0, 50, n),
+            "city": rng.choice(["north", "south", "east"], n),
+            "signup": pd.date_range("2020-01-01", periods=n).strftime("%Y-%m-%d"),
+        }
+    )
+
+
+class TestDatatypeCache(unittest.TestCase):
+    """Test cases for the DatatypeCache class."""
+
+    def test_fingerprint(self):
+        """Test that batches with the same schema share a fingerprint and changed schemas do not."""
+        cache = DatatypeCache()
+        key = cache.fingerprint(make_batch(0))
+
+        self.assertEqual(cache.fingerprint(make_batch(1)), key)
+        self.assertNotEqual(cache.fingerprint(make_batch(0).rename(columns={"price": "cost"})), key)
+        self.assertNotEqual(cache.fingerprint(make_batch(0).astype({"visits": float})), key)
+
+        changed = make_batch(0)
+        changed["rating"] = changed["rating"] * 10
+        self.assertNotEqual(cache.fingerprint(changed), key)
+
+        changed = make_batch(0)
+        changed["city"] = "x" * 150
+        self.assertNotEqual(cache.fingerprint(changed), key)
+
+        self.assertIsInstance(cache.fingerprint(make_batch(0).iloc[:0]), str)
+
+    def test_processor_skips_detection_on_hit(self):
+        """Test that repeat batches reuse cached datatypes without running detection."""
+        cache = DatatypeCache()
+        processor = FeaturePreProcessor(datatype_cache=cache)
+        expected = FeaturePreProcessor().determine_datatypes(make_batch(0))
+
+        self.assertEqual(processor.determine_datatypes(make_batch(0)), expected)
+        with patch.object(processor, "_detect_datatypes") as detect:
+            datatypes = processor.determine_datatypes(make_batch(1))
+            processor.process(make_batch(2))
+        detect.assert_not_called()
+
+        self.assertEqual(datatypes, expected)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+        # Returned dictionaries are copies
+        datatypes["price"] = DataType.UNKNOWN
+        self.assertEqual(processor.determine_datatypes(make_batch(0))["price"], expected["price"])
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = DatatypeCache(maxsize=2)
+        cache.put("a", {"x": DataType.NUMERIC})
+        cache.put("b", {"x": DataType.STRING})
+        cache.get("a")
+        cache.put("c", {"x": DataType.BINARY})
+
+        self.assertEqual(len(cache), 2)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+
+        with self.assertRaises(ValueError):
+            DatatypeCache(maxsize=0)
+
+    def test_invalidation(self):
+        """Test explicit invalidation by dataframe, key and clear."""
+        cache = DatatypeCache()
+        processor = FeaturePreProcessor(datatype_cache=cache)
+        processor.determine_datatypes(make_batch(0))
+
+        self.assertTrue(cache.invalidate(make_batch(1)))
+        self.assertFalse(cache.invalidate(key="missing"))
+        self.assertEqual(len(cache), 0)
+
+        processor.determine_datatypes(make_batch(0))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+        with self.assertRaises(ValueError):
+            cache.invalidate()
+
+    def test_persistence(self):
+        """Test that entries survive in the cache file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "cache.json")
+            FeaturePreProcessor(datatype_cache=DatatypeCache(path=path)).determine_datatypes(make_batch(0))
+
+            cache = DatatypeCache(path=path)
+            self.assertEqual(len(cache), 1)
+            self.assertEqual(
+                cache.get(cache.fingerprint(make_batch(1))), FeaturePreProcessor().determine_datatypes(make_batch(1))
+            )
+
+            cache.clear()
+            self.assertEqual(len(DatatypeCache(path=path)), 0)
+
+            with open(path, "w") as f:
+                f.write('{"version": 99, "entries": []}')
+            with self.assertRaises(ValueError):
+                DatatypeCache(path=path)
+
+
+if __name__ == "__main__":
+    unittest.main()
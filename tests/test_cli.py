@@ -12,7 +12,8 @@ from unittest.mock import MagicMock, patch
 
 import pandas as pd
 
-from src.prepo.cli import create_parser, main, process_file, validate_args
+from src.prepo.cli import _batch_output_path, batch_root, create_parser, expand_inputs, main, process_file, validate_args
+from src.prepo.io import HAS_PYARROW
 
 
 class TestCLI(unittest.TestCase):
@@ -189,6 +190,293 @@ class TestCLI(unittest.TestCase):
         info_messages = [msg for msg in call_args if "Detected data types:" in str(msg)]
         self.assertTrue(len(info_messages) > 0)
 
+        # Check for the stage breakdown
+        breakdown = [msg for msg in call_args if str(msg).startswith("stage")]
+        self.assertEqual(len(breakdown), 1)
+        for stage in ["detect_types", "normalize", "missing", "outliers", "scale"]:
+            self.assertIn(stage, breakdown[0])
+
+    @patch("builtins.print")
+    def test_process_file_chunked(self, mock_print):
+        """Test streaming processing with --chunksize."""
+        parser = create_parser()
+        args = parser.parse_args([self.input_path, self.output_path, "--chunksize", "2", "--no-outliers", "--info"])
+
+        process_file(args)
+
+        result_df = pd.read_csv(self.output_path)
+        self.assertEqual(len(result_df), len(self.df))
+        self.assertEqual(list(result_df.columns), list(self.df.columns))
+
+    def _write_batch_inputs(self, count=3):
+        """Write several input files to a subdirectory and return it."""
+        input_dir = os.path.join(self.temp_dir, "batch")
+        os.makedirs(input_dir)
+        for i in range(count):
+            pd.concat([self.df] * (i + 2), ignore_index=True).to_csv(os.path.join(input_dir, f"part_{i}.csv"), index=False)
+        return input_dir
+
+    @patch("builtins.print")
+    def test_batch_mode(self, mock_print):
+        """Test processing a directory and a glob pattern with a worker pool."""
+        input_dir = self._write_batch_inputs()
+        self.assertEqual([p.name for p in expand_inputs(input_dir)], ["part_0.csv", "part_1.csv", "part_2.csv"])
+        self.assertEqual(len(expand_inputs(os.path.join(input_dir, "part_[01].csv"))), 2)
+
+        parser = create_parser()
+        for source, workers in [(input_dir, "1"), (os.path.join(input_dir, "*.csv"), "2")]:
+            output_dir = os.path.join(self.temp_dir, f"out_{workers}")
+            args = parser.parse_args([source, output_dir, "--workers", workers, "--output-format", "parquet"])
+            validate_args(args)
+            process_file(args)
+
+            for i in range(3):
+                result = pd.read_parquet(os.path.join(output_dir, f"part_{i}.parquet"))
+                self.assertEqual(len(result), 5 * (i + 2))
+
+        printed = " ".join(str(call[0][0]) for call in mock_print.call_args_list if call[0])
+        self.assertIn("3 succeeded, 0 failed", printed)
+
+    @patch("builtins.print")
+    def test_batch_mode_keeps_relative_paths(self, mock_print):
+        """Test that inputs with the same name in different directories get separate outputs."""
+        for year in ["2023", "2024"]:
+            os.makedirs(os.path.join(self.temp_dir, "b", year))
+            self.df.to_csv(os.path.join(self.temp_dir, "b", year, "sales.csv"), index=False)
+        pattern = os.path.join(self.temp_dir, "b", "**", "*.csv")
+        output_dir = os.path.join(self.temp_dir, "o2")
+        self.assertEqual(batch_root(pattern), Path(self.temp_dir, "b"))
+
+        args = create_parser().parse_args([pattern, output_dir, "--workers", "2"])
+        validate_args(args)
+        process_file(args)
+
+        for year in ["2023", "2024"]:
+            self.assertEqual(len(pd.read_csv(os.path.join(output_dir, year, "sales.csv"))), len(self.df))
+
+    def test_batch_output_path(self):
+        """Test batch output names and suffixes."""
+        root, output_dir = Path("data"), Path("out")
+        self.assertEqual(_batch_output_path(Path("data/a/x.csv"), root, output_dir, None), Path("out/a/x.csv"))
+        self.assertEqual(_batch_output_path(Path("data/x.v2.csv"), root, output_dir, "parquet"), Path("out/x.v2.parquet"))
+        self.assertEqual(_batch_output_path(Path("data/x.csv"), root, output_dir, "excel"), Path("out/x.xlsx"))
+        self.assertEqual(batch_root("*.csv"), Path("."))
+        self.assertEqual(batch_root("data/2024-*/*.csv"), Path("data"))
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow not installed")
+    @patch("builtins.print")
+    def test_memory_mapped_input(self, mock_print):
+        """Test that --mmap processes Feather input like a regular read."""
+        input_file = os.path.join(self.temp_dir, "input.feather")
+        self.df.to_feather(input_file)
+        outputs = {}
+        for flags in [[], ["--mmap"]]:
+            output_file = os.path.join(self.temp_dir, f"output{len(flags)}.csv")
+            args = create_parser().parse_args([input_file, output_file] + flags)
+            process_file(args)
+            outputs[tuple(flags)] = pd.read_csv(output_file)
+
+        self.assertTrue(create_parser().parse_args(["in.feather", "out.csv", "--mmap"]).mmap)
+        pd.testing.assert_frame_equal(outputs[()], outputs[("--mmap",)])
+
+    @patch("builtins.print")
+    def test_batch_mode_fit_on_reference(self, mock_print):
+        """Test that --fit-on applies one fitted state to every file."""
+        input_dir = self._write_batch_inputs()
+        reference = os.path.join(input_dir, "part_0.csv")
+        output_dir = os.path.join(self.temp_dir, "out")
+
+        args = create_parser().parse_args([input_dir, output_dir, "--fit-on", reference, "--no-outliers"])
+        validate_args(args)
+        process_file(args)
+
+        # Scaler parameters come from the reference, so identical rows scale identically
+        first = pd.read_csv(os.path.join(output_dir, "part_0.csv"))
+        last = pd.read_csv(os.path.join(output_dir, "part_2.csv"))
+        pd.testing.assert_frame_equal(last.iloc[:5].reset_index(drop=True), first.iloc[:5])
+
+    @patch("sys.stderr", new_callable=StringIO)
+    @patch("builtins.print")
+    def test_batch_mode_failures(self, mock_print, mock_stderr):
+        """Test that failed files are reported and give a non-zero exit status."""
+        input_dir = self._write_batch_inputs(count=1)
+        with open(os.path.join(input_dir, "broken.json"), "w") as f:
+            f.write("{not json")
+
+        args = create_parser().parse_args([input_dir, os.path.join(self.temp_dir, "out")])
+        with self.assertRaises(SystemExit):
+            process_file(args)
+
+        printed = " ".join(str(call[0][0]) for call in mock_print.call_args_list if call[0])
+        self.assertIn("FAILED", printed)
+        self.assertIn("1 succeeded, 1 failed", printed)
+
+    @patch("sys.stderr", new_callable=StringIO)
+    def test_validate_batch_args(self, mock_stderr):
+        """Test batch mode argument validation."""
+        parser = create_parser()
+        input_dir = self._write_batch_inputs(count=1)
+        self.df.to_json(os.path.join(input_dir, "part_0.json"))
+        invalid = [
+            [os.path.join(self.temp_dir, "*.missing"), self.temp_dir],
+            [input_dir, self.temp_dir, "--workers", "0"],
+            [input_dir, self.temp_dir, "--fit-on", "missing.csv"],
+            [input_dir, self.temp_dir, "--chunksize", "10"],
+            [input_dir, self.input_path],
+            # part_0.csv and part_0.json would both be written to part_0.parquet
+            [input_dir, self.temp_dir, "--output-format", "parquet"],
+            # Outputs would overwrite the inputs
+            [input_dir, input_dir],
+            [self.input_path, self.output_path, "--fit-on", self.input_path],
+        ]
+        for argv in invalid:
+            with self.subTest(argv=argv):
+                with self.assertRaises(SystemExit):
+                    validate_args(parser.parse_args(argv))
+
+    def test_validate_args_invalid_chunksize(self):
+        """Test validation with a non-positive chunk size."""
+        parser = create_parser()
+        args = parser.parse_args([self.input_path, self.output_path, "--chunksize", "0"])
+
+        with patch("sys.stderr", new_callable=StringIO):
+            with self.assertRaises(SystemExit):
+                validate_args(args)
+
+    @patch("builtins.print")
+    def test_columns_and_filter(self, mock_print):
+        """Test reading a subset of columns and rows."""
+        args = create_parser().parse_args(
+            [self.input_path, self.output_path, "--columns", "price_USD, category", "--filter", "numeric_col >= 2"]
+        )
+        validate_args(args)
+        process_file(args)
+
+        result_df = pd.read_csv(self.output_path)
+        self.assertEqual(list(result_df.columns), ["price_USD", "category"])
+        self.assertEqual(result_df["category"].tolist(), ["B", "A", "C", "B"])
+
+    @patch("builtins.print")
+    def test_parquet_layout(self, mock_print):
+        """Test partitioned dataset output, codec and row group options and their validation."""
+        if not HAS_PYARROW:
+            self.skipTest("PyArrow not available")
+        import pyarrow.parquet as pq
+
+        parquet_path = os.path.join(self.temp_dir, "layout.parquet")
+        argv = [self.input_path, parquet_path, "--no-outliers", "--compression", "zstd", "--compression-level", "3"]
+        args = create_parser().parse_args(argv + ["--row-group-size", "2"])
+        validate_args(args)
+        process_file(args)
+        metadata = pq.ParquetFile(parquet_path).metadata
+        self.assertEqual(metadata.num_row_groups, 3)
+        self.assertEqual(metadata.row_group(0).column(0).compression, "ZSTD")
+
+        dataset_path = os.path.join(self.temp_dir, "dataset")
+        args = create_parser().parse_args([self.input_path, dataset_path, "--no-outliers", "--partition-by", "category"])
+        validate_args(args)
+        process_file(args)
+        self.assertEqual(len(list(Path(dataset_path).glob("category=*/part-0.parquet"))), 3)
+
+        invalid = [
+            [self.input_path, self.output_path, "--compression", "zstd"],
+            [self.input_path, parquet_path, "--compression-level", "3"],
+            [self.input_path, parquet_path, "--row-group-size", "0"],
+            [self.input_path, parquet_path, "--row-group-size", "2", "--row-group-mb", "1"],
+            [self.input_path, dataset_path, "--partition-by", "category", "--chunksize", "2"],
+            [self.input_path, dataset_path, "--partition-by", "category", "--output-format", "csv"],
+        ]
+        for argv in invalid:
+            with self.subTest(argv=argv):
+                with patch("sys.stderr", new_callable=StringIO):
+                    with self.assertRaises(SystemExit):
+                        validate_args(create_parser().parse_args(argv))
+
+    def test_inspect(self):
+        """Test the inspect command and its validation."""
+        for argv in [[], ["--min-frequency", "0.01", "--sampling", "reservoir", "--chunksize", "2"]]:
+            with self.subTest(argv=argv):
+                with patch("sys.stdout", new_callable=StringIO) as stdout:
+                    main(["inspect", self.input_path] + argv)
+                output = stdout.getvalue()
+                self.assertIn("Detected data types:", output)
+                self.assertIn("numeric_col:", output)
+
+        for argv in [["missing.csv"], [self.input_path, "--sample-size", "0"], [self.input_path, "--min-frequency", "2"]]:
+            with self.subTest(argv=argv):
+                with patch("sys.stderr", new_callable=StringIO):
+                    with self.assertRaises(SystemExit):
+                        main(["inspect"] + argv)
+
+    @patch("builtins.print")
+    def test_pipeline(self, mock_print):
+        """Test the pipelined chunked mode and its validation."""
+        pipeline_path = os.path.join(self.temp_dir, "pipeline.csv")
+        argv = [self.input_path, self.output_path, "--chunksize", "2", "--no-outliers"]
+        process_file(create_parser().parse_args(argv))
+        argv[1] = pipeline_path
+        args = create_parser().parse_args(argv + ["--pipeline", "--workers", "2"])
+        validate_args(args)
+        process_file(args)
+
+        pd.testing.assert_frame_equal(pd.read_csv(pipeline_path), pd.read_csv(self.output_path))
+
+        with patch("sys.stderr", new_callable=StringIO):
+            with self.assertRaises(SystemExit):
+                validate_args(create_parser().parse_args([self.input_path, self.output_path, "--pipeline"]))
+
+    @patch("builtins.print")
+    def test_no_copy(self, mock_print):
+        """Test that --no-copy writes the same output as the default mode."""
+        no_copy_path = os.path.join(self.temp_dir, "no_copy.csv")
+        process_file(create_parser().parse_args([self.input_path, self.output_path]))
+        process_file(create_parser().parse_args([self.input_path, no_copy_path, "--no-copy"]))
+
+        pd.testing.assert_frame_equal(pd.read_csv(no_copy_path), pd.read_csv(self.output_path))
+
+    @patch("builtins.print")
+    def test_optimize_dtypes(self, mock_print):
+        """Test compact output dtypes and the validation of their options."""
+        output_path = os.path.join(self.temp_dir, "output.parquet")
+        args = create_parser().parse_args(
+            [self.input_path, output_path, "--no-outliers", "--optimize-dtypes", "--float32-tolerance", "1e-3"]
+        )
+        validate_args(args)
+        process_file(args)
+
+        result_df = pd.read_parquet(output_path)
+        self.assertIsInstance(result_df["category"].dtype, pd.CategoricalDtype)
+        self.assertEqual(str(result_df["price_USD"].dtype), "float32")
+        printed = "\n".join(str(call.args[0]) for call in mock_print.call_args_list if call.args)
+        self.assertIn("Dtype optimization", printed)
+
+        parser = create_parser()
+        invalid = [
+            [self.input_path, self.output_path, "--float32-tolerance", "0.1"],
+            [self.input_path, self.output_path, "--optimize-dtypes", "--float32-tolerance", "-1"],
+            [self.input_path, self.output_path, "--optimize-dtypes", "--chunksize", "2"],
+            [self.input_path, self.output_path, "--optimize-dtypes", "--polars"],
+        ]
+        for argv in invalid:
+            with self.subTest(argv=argv):
+                with patch("sys.stderr", new_callable=StringIO):
+                    with self.assertRaises(SystemExit):
+                        validate_args(parser.parse_args(argv))
+
+    def test_validate_args_invalid_filter(self):
+        """Test validation of filter expressions and their combination with --chunksize."""
+        parser = create_parser()
+        invalid = [
+            [self.input_path, self.output_path, "--filter", "numeric_col"],
+            [self.input_path, self.output_path, "--filter", "numeric_col > 1", "--chunksize", "2"],
+            [self.input_path, self.output_path, "--columns", "category", "--chunksize", "2"],
+        ]
+        for argv in invalid:
+            with self.subTest(argv=argv):
+                with patch("sys.stderr", new_callable=StringIO):
+                    with self.assertRaises(SystemExit):
+                        validate_args(parser.parse_args(argv))
+
     @patch("builtins.print")
     def test_process_file_json_output(self, mock_print):
         """Test processing with JSON output."""
@@ -0,0 +1,128 @@
+"""
+Tests for the dtype optimization module.
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.prepo.dtypes import DtypeReport, optimize_dtypes
+from src.prepo.preprocessor import FeaturePreProcessor
+from src.prepo.types import DataType
+
+
+class TestOptimizeDtypes(unittest.TestCase):
+    """Test cases for optimize_dtypes and the optimize stage of process."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        rng = np.random.default_rng(0)
+        n = 2000
+        self.df = pd.DataFrame(
+            {
+                "age": rng.integers(18, 90, n),
+                "flag": rng.integers(0, 2, n),
+                "city_group": rng.choice(["north", "south", "east"], n),
+                "income": rng.normal(50000, 10000, n),
+                "customer_id": np.arange(n),
+            }
+        )
+        self.datatypes = {
+            "age": DataType.INTEGER,
+            "flag": DataType.BINARY,
+            "city_group": DataType.CATEGORICAL,
+            "income": DataType.PRICE,
+            "customer_id": DataType.ID,
+        }
+
+    def test_downcast_by_datatype(self):
+        """Test the dtype chosen for each data type."""
+        result, report = optimize_dtypes(self.df, self.datatypes)
+
+        self.assertEqual(result["age"].dtype, np.int8)
+        self.assertEqual(result["flag"].dtype, bool)
+        self.assertIsInstance(result["city_group"].dtype, pd.CategoricalDtype)
+        self.assertEqual(result["customer_id"].dtype, np.int16)
+        self.assertEqual(result["income"].dtype, np.float64)
+
+        # Values are unchanged and the input is not modified
+        pd.testing.assert_frame_equal(result.astype(self.df.dtypes.to_dict()), self.df)
+        self.assertEqual(self.df["age"].dtype, np.int64)
+
+        self.assertEqual([change.column for change in report.changes], ["age", "flag", "city_group", "customer_id"])
+        for change in report.changes:
+            self.assertEqual(change.bytes_saved, change.bytes_before - change.bytes_after)
+            self.assertGreater(change.bytes_saved, 0)
+        saved = self.df.memory_usage(index=False, deep=True).sum() - result.memory_usage(index=False, deep=True).sum()
+        self.assertEqual(report.bytes_saved, saved)
+
+    def test_missing_and_non_integral_values(self):
+        """Test nullable integers, float integers and columns that are not downcast."""
+        df = pd.DataFrame(
+            {
+                "count": [1.0, np.nan, 300.0, 4.0] * 50,
+                "ratio_int": [0.5, 1.0, 2.0, 3.0] * 50,
+                "flag": [1.0, 0.0, np.nan, 1.0] * 50,
+            }
+        )
+        datatypes = {"count": DataType.INTEGER, "ratio_int": DataType.INTEGER, "flag": DataType.BINARY}
+        result, report = optimize_dtypes(df, datatypes)
+
+        self.assertEqual(str(result["count"].dtype), "Int16")
+        self.assertTrue(result["count"].isna().equals(df["count"].isna()))
+        self.assertEqual(result["ratio_int"].dtype, np.float64)
+        self.assertEqual(str(result["flag"].dtype), "boolean")
+        self.assertNotIn("ratio_int", [change.column for change in report.changes])
+
+    def test_float_tolerance(self):
+        """Test that float32 is only used within the tolerance."""
+        scaled = pd.DataFrame({"income": (self.df["income"] - 50000) / 10000})
+        datatypes = {"income": DataType.PRICE}
+
+        result, _ = optimize_dtypes(scaled, datatypes, float_tolerance=1e-6)
+        self.assertEqual(result["income"].dtype, np.float32)
+        np.testing.assert_allclose(result["income"], scaled["income"], atol=1e-6)
+
+        result, report = optimize_dtypes(self.df[["income"]], datatypes, float_tolerance=1e-6)
+        self.assertEqual(result["income"].dtype, np.float64)
+        self.assertEqual(report.changes, [])
+
+    def test_report(self):
+        """Test the report formatting and dictionary."""
+        _, report = optimize_dtypes(self.df, self.datatypes)
+        data = report.to_dict()
+
+        self.assertEqual(data["bytes_saved"], report.bytes_saved)
+        self.assertEqual(data["columns"][0]["column"], "age")
+        self.assertEqual(data["columns"][0]["to_dtype"], "int8")
+        self.assertIn("total saved", report.format())
+        self.assertEqual(DtypeReport().bytes_saved, 0)
+
+    def test_process_optimize_stage(self):
+        """Test the optimize stage of process."""
+        stages = []
+        processor = FeaturePreProcessor(stage_hooks=[lambda metrics: stages.append(metrics.stage)])
+        expected = processor.process(self.df)
+        self.assertIsNone(processor.dtype_report)
+
+        result = processor.process(self.df, optimize_dtypes=True, float_tolerance=1e-4)
+        self.assertEqual(stages[-1], "optimize")
+        self.assertEqual(result["flag"].dtype, bool)
+        self.assertEqual(result["income"].dtype, np.float32)
+        np.testing.assert_allclose(result["income"], expected["income"], atol=1e-4)
+        self.assertGreater(processor.dtype_report.bytes_saved, 0)
+
+    def test_process_rejects_other_frames(self):
+        """Test that optimize_dtypes needs pandas input."""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            self.skipTest("pyarrow not installed")
+
+        with self.assertRaises(ValueError):
+            FeaturePreProcessor().process(pa.Table.from_pandas(self.df), optimize_dtypes=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Tests for the imputation module.
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.prepo.imputation import NumericImputer, fill_missing, group_keys
+from src.prepo.types import ImputeStrategy
+
+
+class TestNumericImputer(unittest.TestCase):
+    """Test cases for the NumericImputer class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        # y follows x, so neighbors in x predict the missing y values
+        self.df = pd.DataFrame(
+            {
+                "x": [1.0, 2.0, 3.0, 10.0, 11.0, 12.0, 2.5, 11.5],
+                "y": [10.0, 20.0, 30.0, 100.0, 110.0, 120.0, np.nan, np.nan],
+                "empty": [np.nan] * 8,
+            }
+        )
+
+    def test_knn_uses_other_columns(self):
+        """Test that KNN fills a column from neighbors found on the other columns."""
+        imputer = NumericImputer(ImputeStrategy.KNN, n_neighbors=3)
+        result = imputer.fit_transform(self.df)
+
+        self.assertEqual(result.loc[6, "y"], 20.0)
+        self.assertEqual(result.loc[7, "y"], 110.0)
+        self.assertTrue(result["empty"].isna().all())
+        self.assertAlmostEqual(imputer.statistics["y"], 65.0)
+
+    def test_knn_tree_matches_small_path(self):
+        """Test that the KD-tree search finds the same neighbors as KNNImputer."""
+        small = NumericImputer("knn", n_neighbors=3).fit_transform(self.df)
+        tree = NumericImputer("knn", n_neighbors=3, tree_threshold=0, query_chunksize=1).fit_transform(self.df)
+
+        pd.testing.assert_frame_equal(tree, small)
+
+    def test_transform_matches_fit_transform(self):
+        """Test that transform imputes with the fitted reference rows, on the fitted block and on new rows."""
+        batch = pd.DataFrame({"x": [2.0, 11.0], "y": [np.nan, np.nan], "empty": [np.nan, np.nan]})
+        for tree_threshold in [10_000, 0]:
+            with self.subTest(tree_threshold=tree_threshold):
+                imputer = NumericImputer("knn", n_neighbors=3, tree_threshold=tree_threshold)
+                expected = imputer.fit_transform(self.df)
+
+                pd.testing.assert_frame_equal(imputer.transform(self.df), expected)
+                self.assertEqual(imputer.transform(batch)["y"].tolist(), [20.0, 110.0])
+
+        with self.assertRaises(ValueError):
+            NumericImputer("median").transform(self.df)
+
+    def test_knn_tree_large(self):
+        """Test the KD-tree path on a larger frame with several missing patterns."""
+        rng = np.random.default_rng(0)
+        x = rng.uniform(0, 100, 5000)
+        df = pd.DataFrame({"x": x, "y": 2 * x, "z": -x})
+        df.loc[::7, "y"] = np.nan
+        df.loc[::11, "z"] = np.nan
+        df.loc[::77, "x"] = np.nan
+
+        result = NumericImputer("knn", tree_threshold=1000, max_reference_rows=2000).fit_transform(df)
+
+        self.assertFalse(result.isna().any().any())
+        np.testing.assert_allclose(result["y"], 2 * result["x"], atol=2.0)
+        np.testing.assert_allclose(result["z"], -result["x"], atol=1.0)
+
+    def test_median(self):
+        """Test median imputation."""
+        imputer = NumericImputer("median")
+        result = imputer.fit_transform(self.df[["x", "y"]])
+
+        self.assertEqual(list(result.loc[6:, "y"]), [65.0, 65.0])
+        self.assertEqual(imputer.statistics["y"], 65.0)
+
+    def test_grouped_median(self):
+        """Test grouped median imputation with fallback for unknown groups."""
+        groups = pd.Series(["a", "a", "a", "b", "b", "b", "a", np.nan])
+        imputer = NumericImputer("grouped_median")
+        result = imputer.fit_transform(self.df[["x", "y"]], groups=groups)
+
+        self.assertEqual(result.loc[6, "y"], 20.0)
+        self.assertEqual(result.loc[7, "y"], 65.0)
+        self.assertEqual(imputer.group_statistics["y"], {"a": 20.0, "b": 110.0})
+
+    def test_no_missing_values(self):
+        """Test that complete frames are returned unchanged."""
+        df = self.df[["x"]]
+        self.assertIs(NumericImputer().fit_transform(df), df)
+
+    def test_fill_missing(self):
+        """Test filling a new batch with fitted statistics."""
+        batch = pd.DataFrame({"y": [np.nan, np.nan, np.nan, 5.0]})
+        groups = pd.Series(["a", "b", "c", "a"])
+
+        result = fill_missing(batch, {"y": 65.0}, {"y": {"a": 20.0, "b": 110.0}}, groups)
+        self.assertEqual(list(result["y"]), [20.0, 110.0, 65.0, 5.0])
+
+        self.assertEqual(list(fill_missing(batch, {"y": 1.0})["y"]), [1.0, 1.0, 1.0, 5.0])
+
+    def test_group_keys(self):
+        """Test that group keys are strings and missing groups stay missing."""
+        keys = group_keys(pd.Series([1, 2, None]))
+        self.assertEqual(list(keys[:2]), ["1.0", "2.0"])
+        self.assertTrue(pd.isna(keys[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Tests for the instrumentation module.
+"""
+
+import tracemalloc
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.prepo.instrumentation import StageCollector, StageMetrics
+from src.prepo.preprocessor import FeaturePreProcessor
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test cases for stage hooks and the StageCollector."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        rng = np.random.default_rng(0)
+        values = rng.normal(50, 10, 200)
+        values[:5] = [500, -500, 400, -400, 300]
+        self.df = pd.DataFrame(
+            {
+                "score": values.astype(str),
+                "rating": rng.random(200),
+                "city": rng.choice(["a", "b", "c"], 200),
+            }
+        )
+        self.df.loc[10:14, "score"] = np.nan
+
+    def test_collector_records_every_stage(self):
+        """Test that process reports each stage with row and column counts."""
+        collector = StageCollector()
+        processor = FeaturePreProcessor(stage_hooks=[collector])
+        result = processor.process(self.df)
+
+        stages = [m.stage for m in collector.stages]
+        self.assertEqual(stages, ["detect_types", "normalize", "missing", "outliers", "scale"])
+
+        metrics = {m.stage: m for m in collector.stages}
+        self.assertEqual(metrics["detect_types"].rows_in, 200)
+        self.assertEqual(metrics["missing"].rows_in, 200)
+        self.assertEqual(metrics["missing"].rows_out, 195)
+        self.assertEqual(metrics["outliers"].rows_in, 195)
+        self.assertEqual(metrics["outliers"].rows_out, len(result))
+        self.assertEqual(metrics["scale"].columns_out, 3)
+        self.assertTrue(all(m.seconds >= 0 and m.bytes_allocated is None for m in collector.stages))
+
+        report = collector.report()
+        self.assertEqual(len(report["stages"]), 5)
+        self.assertAlmostEqual(report["total_seconds"], sum(m.seconds for m in collector.stages))
+        self.assertIsNone(report["total_bytes_allocated"])
+        self.assertIn("outliers", collector.format())
+
+        collector.clear()
+        self.assertEqual(collector.stages, [])
+
+    def test_track_memory(self):
+        """Test that memory tracking reports allocations and stops tracing afterwards."""
+        collector = StageCollector()
+        processor = FeaturePreProcessor(stage_hooks=[collector], track_memory=True)
+        processor.process(self.df, drop_na=False)
+
+        self.assertTrue(all(m.bytes_allocated is not None and m.bytes_allocated >= 0 for m in collector.stages))
+        self.assertGreater(collector.report()["total_bytes_allocated"], 0)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_hooks_do_not_change_output(self):
+        """Test that instrumented and plain runs give the same result."""
+        received = []
+        instrumented = FeaturePreProcessor(stage_hooks=[received.append]).process(self.df, scaler_type="robust")
+        plain = FeaturePreProcessor().process(self.df, scaler_type="robust")
+
+        pd.testing.assert_frame_equal(instrumented, plain)
+        self.assertTrue(all(isinstance(m, StageMetrics) for m in received))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,8 +10,17 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
-from src.prepo.io import FileReader, FileWriter
-from src.prepo.types import FileFormat
+from src.prepo.io import (
+    HAS_POLARS,
+    HAS_PYARROW,
+    FileReader,
+    FileWriter,
+    ParquetOptions,
+    filter_rows,
+    mask_null_tokens,
+    parse_filter,
+)
+from src.prepo.types import DataType, FileFormat
 
 
 class TestFileIO(unittest.TestCase):
@@ -271,6 +280,267 @@ class TestFileIO(unittest.TestCase):
         except ImportError:
             self.skipTest("PyArrow not available")
 
+    def test_iter_chunks(self):
+        """Test reading files in chunks."""
+        reader = FileReader()
+        writer = FileWriter()
+
+        for name in ["chunks.csv", "chunks.tsv", "chunks.parquet", "chunks.pkl"]:
+            path = os.path.join(self.temp_dir, name)
+            writer.write_file(self.df, path)
+
+            chunks = list(reader.iter_chunks(path, chunksize=2))
+            self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+            self.assertEqual(list(chunks[0].columns), list(self.df.columns))
+
+    def test_read_sample(self):
+        """Test stratified and reservoir sampling, including rows only found at the end of a file."""
+        n = 20_000
+        df = pd.DataFrame({"row": np.arange(n), "value": ["1.5"] * (n - 100) + ["late"] * 100})
+        df.loc[5, "value"] = "?"
+        reader = FileReader(null_values=["?"])
+        writer = FileWriter()
+
+        for name in ["sample.csv", "sample.tsv", "sample.parquet", "sample.pkl"]:
+            path = os.path.join(self.temp_dir, name)
+            writer.write_file(df, path, **({"row_group_size": 1000} if name.endswith("parquet") else {}))
+
+            for method in ["stratified", "reservoir"]:
+                with self.subTest(name=name, method=method):
+                    sample = reader.read_sample(path, size=500, method=method, chunksize=3000)
+
+                    self.assertLessEqual(len(sample), 500)
+                    self.assertGreater(len(sample), 400)
+                    self.assertEqual(list(sample.columns), ["row", "value"])
+                    self.assertTrue(sample["row"].is_monotonic_increasing)
+                    self.assertTrue((sample["value"] == "late").any())
+                    self.assertTrue(sample.loc[sample["row"] == 5, "value"].isna().all())
+
+        small = os.path.join(self.temp_dir, "small.csv")
+        writer.write_file(self.df, small)
+        pd.testing.assert_frame_equal(reader.read_sample(small), reader.read_file(small))
+
+    def test_mask_null_tokens(self):
+        """Test that only string-like columns containing tokens are replaced."""
+        df = pd.DataFrame(
+            {
+                "number": [1.0, 2.0, 3.0],
+                "text": ["a", "?", "unknown"],
+                "category": pd.Categorical(["x", "NA", "y"]),
+                "clean": ["p", "q", "r"],
+            }
+        )
+        result = mask_null_tokens(df, ["?", "unknown", "NA"])
+
+        self.assertEqual(result["text"].isna().tolist(), [False, True, True])
+        self.assertEqual(result["category"].isna().tolist(), [False, True, False])
+        self.assertTrue(np.shares_memory(result["number"].to_numpy(), df["number"].to_numpy()))
+        self.assertEqual(df["text"].tolist(), ["a", "?", "unknown"])
+
+        self.assertIs(mask_null_tokens(df, ["missing"]), df)
+
+    def test_read_null_values(self):
+        """Test that null tokens are read as missing values in every reader."""
+        raw = pd.DataFrame({"value": ["1.5", "?", "2.5", "error"], "label": ["a", "b", "unknown", "c"]})
+        tokens = ["?", "error", "unknown"]
+        expected_value = [1.5, np.nan, 2.5, np.nan]
+
+        csv_path = os.path.join(self.temp_dir, "tokens.csv")
+        raw.to_csv(csv_path, index=False)
+        json_path = os.path.join(self.temp_dir, "tokens.json")
+        raw.to_json(json_path)
+
+        df = FileReader(null_values=tokens).read_file(csv_path)
+        np.testing.assert_array_equal(df["value"].to_numpy(dtype=float), expected_value)
+        self.assertTrue(df["label"].isna().iloc[2])
+
+        df = FileReader(null_values=tokens).read_file(json_path)
+        self.assertEqual(df["value"].isna().tolist(), [False, True, False, True])
+
+        chunks = list(FileReader(null_values=tokens).iter_chunks(csv_path, chunksize=2))
+        self.assertEqual(pd.concat(chunks)["value"].isna().sum(), 2)
+
+        # Without null_values the tokens are kept
+        self.assertEqual(FileReader().read_file(csv_path)["value"].iloc[1], "?")
+
+        if HAS_POLARS:
+            df = FileReader(use_polars=True, null_values=tokens).read_file(csv_path)
+            np.testing.assert_array_equal(df["value"].to_numpy(dtype=float), expected_value)
+            df_pl = FileReader(null_values=tokens).read_polars(csv_path)
+            self.assertEqual(df_pl["value"].null_count(), 2)
+
+        if HAS_PYARROW:
+            parquet_path = os.path.join(self.temp_dir, "tokens.parquet")
+            raw.to_parquet(parquet_path)
+            df = FileReader(use_pyarrow=True, null_values=tokens).read_file(parquet_path)
+            self.assertEqual(df["value"].isna().tolist(), [False, True, False, True])
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow not installed")
+    def test_memory_map(self):
+        """Test that memory-mapped Feather input is used in place."""
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        df = pd.DataFrame({"value": np.arange(10_000, dtype=float), "label": ["a", "?"] * 5_000})
+        feather_path = os.path.join(self.temp_dir, "mapped.feather")
+        feather.write_feather(df, feather_path, compression="uncompressed")
+        parquet_path = os.path.join(self.temp_dir, "mapped.parquet")
+        df.to_parquet(parquet_path)
+
+        reader = FileReader(memory_map=True, null_values=["?"])
+        allocated = pa.total_allocated_bytes()
+        table = reader.read_arrow(feather_path)
+        self.assertEqual(pa.total_allocated_bytes(), allocated)
+        self.assertEqual(table.num_rows, len(df))
+
+        result = reader.read_file(feather_path)
+        pd.testing.assert_series_equal(result["value"], df["value"])
+        self.assertEqual(result["label"].isna().sum(), 5_000)
+        self.assertFalse(result["value"].to_numpy().flags.writeable)  # Backed by the mapped file
+
+        pd.testing.assert_frame_equal(FileReader(memory_map=True).read_file(parquet_path), df)
+
+        chunks = list(reader.iter_chunks(feather_path, chunksize=3_000))
+        self.assertEqual([len(chunk) for chunk in chunks], [3_000, 3_000, 3_000, 1_000])
+        self.assertEqual(pd.concat(chunks)["label"].isna().sum(), 5_000)
+
+    def test_parse_filter(self):
+        """Test parsing filter expressions."""
+        self.assertEqual(parse_filter("year >= 2020"), ("year", ">=", "2020"))
+        self.assertEqual(parse_filter("city = 'north'"), ("city", "==", "north"))
+        self.assertEqual(parse_filter("x!=1.5"), ("x", "!=", "1.5"))
+        with self.assertRaises(ValueError):
+            parse_filter("year")
+
+    def test_read_columns_and_filters(self):
+        """Test that every reader returns the same projected and filtered rows."""
+        df = pd.DataFrame(
+            {
+                "value": np.arange(10),
+                "date": pd.date_range("2020-01-01", periods=10),
+                "label": list("abcdefghij"),
+                "score": np.linspace(0, 1, 10),
+            }
+        )
+        filters = ["value >= 3", "date < 2020-01-08", ("label", "!=", "e")]
+        expected = ["d", "f", "g"]
+
+        paths = {"csv": os.path.join(self.temp_dir, "subset.csv"), "json": os.path.join(self.temp_dir, "subset.json")}
+        df.to_csv(paths["csv"], index=False)
+        df.to_json(paths["json"], date_format="iso")
+        if HAS_PYARROW:
+            for fmt in ["parquet", "feather", "orc"]:
+                paths[fmt] = os.path.join(self.temp_dir, f"subset.{fmt}")
+                getattr(df, f"to_{fmt}")(paths[fmt])
+
+        options = [{}, {"use_pyarrow": HAS_PYARROW}, {"use_polars": HAS_POLARS}, {"memory_map": HAS_PYARROW}]
+        for fmt, path in paths.items():
+            for kwargs in options:
+                with self.subTest(fmt=fmt, **kwargs):
+                    result = FileReader(**kwargs).read_file(path, columns=["score", "label"], filters=filters)
+                    self.assertEqual(list(result.columns), ["score", "label"])
+                    self.assertEqual(result["label"].tolist(), expected)
+
+            with self.subTest(fmt=fmt, reader="native"):
+                if HAS_PYARROW:
+                    table = FileReader().read_arrow(path, columns=["label"], filters=filters)
+                    self.assertEqual(table.column("label").to_pylist(), expected)
+                if HAS_POLARS:
+                    lazy = FileReader().read_polars(path, lazy=True, columns=["label"], filters=filters)
+                    self.assertEqual(lazy.collect()["label"].to_list(), expected)
+
+        self.assertEqual(len(FileReader().read_file(paths["csv"], filters="value > 100")), 0)
+        with self.assertRaises(ValueError):
+            FileReader().read_file(paths["csv"], filters=["missing > 1"])
+        with self.assertRaises(ValueError):
+            FileReader().read_file(paths["csv"], filters=[("value", "~", 1)])
+        with self.assertRaises(ValueError):
+            filter_rows(df, ["date > tomorrow-ish"])
+
+    def test_write_chunks(self):
+        """Test writing a sequence of chunks to one file."""
+        reader = FileReader()
+        writer = FileWriter()
+        chunks = [self.df.iloc[:2], self.df.iloc[2:]]
+
+        for name in ["chunks.csv", "chunks.tsv", "chunks.parquet", "chunks.json"]:
+            path = os.path.join(self.temp_dir, name)
+            rows = writer.write_chunks(iter(chunks), path)
+
+            self.assertEqual(rows, len(self.df))
+            df_read = reader.read_file(path)
+            self.assertEqual(len(df_read), len(self.df))
+            self.assertEqual(list(df_read.columns), list(self.df.columns))
+
+        # No chunks still produces an output file
+        empty_path = os.path.join(self.temp_dir, "empty.csv")
+        self.assertEqual(writer.write_chunks(iter([]), empty_path), 0)
+        self.assertTrue(os.path.exists(empty_path))
+
+    def test_parquet_options(self):
+        """Test codec, row group targets and datatype-based dictionary encoding of Parquet output."""
+        if not HAS_PYARROW:
+            self.skipTest("PyArrow not available")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        df = pd.DataFrame({"label": ["a", "b", "c"] * 1000, "value": np.arange(3000.0)})
+        datatypes = {"label": DataType.CATEGORICAL, "value": DataType.NUMERIC}
+        writer = FileWriter(parquet_options=ParquetOptions(compression="zstd", compression_level=5, row_group_size=500))
+
+        file_path = os.path.join(self.temp_dir, "layout.parquet")
+        chunks_path = os.path.join(self.temp_dir, "layout_chunks.parquet")
+        writer.write_file(df, file_path, datatypes=datatypes)
+        # Chunks are buffered into full row groups whatever their size
+        chunks = (df.iloc[start : start + 333] for start in range(0, len(df), 333))
+        writer.write_chunks(chunks, chunks_path, datatypes=datatypes)
+
+        for path in [file_path, chunks_path]:
+            with self.subTest(path=path):
+                metadata = pq.ParquetFile(path).metadata
+                self.assertEqual([metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)], [500] * 6)
+                label, value = metadata.row_group(0).column(0), metadata.row_group(0).column(1)
+                self.assertEqual(label.compression, "ZSTD")
+                self.assertIn("RLE_DICTIONARY", label.encodings)
+                self.assertNotIn("RLE_DICTIONARY", value.encodings)
+                pd.testing.assert_frame_equal(pd.read_parquet(path), df)
+
+        options = ParquetOptions(row_group_bytes=8000)
+        self.assertEqual(options.rows_per_group(pa.Table.from_pandas(df[["value"]], preserve_index=False)), 1000)
+        self.assertNotIn("use_dictionary", options.writer_kwargs(pa.Table.from_pandas(df)))
+
+    def test_write_dataset(self):
+        """Test writing a Hive-partitioned dataset with parallel partition writes."""
+        if not HAS_PYARROW:
+            self.skipTest("PyArrow not available")
+        import pyarrow.dataset as ds
+
+        df = pd.DataFrame(
+            {
+                "region": ["eu", "us/west", None, "eu"] * 50,
+                "year": [2023, 2024] * 100,
+                "value": np.arange(200.0),
+            }
+        )
+        path = os.path.join(self.temp_dir, "dataset")
+        partitions = FileWriter().write_dataset(df, path, ["region", "year"], workers=3)
+
+        self.assertEqual(partitions, 4)
+        self.assertTrue(os.path.exists(os.path.join(path, "region=us%2Fwest", "year=2024", "part-0.parquet")))
+        self.assertTrue(os.path.isdir(os.path.join(path, "region=__HIVE_DEFAULT_PARTITION__")))
+
+        table = ds.dataset(path, format="parquet", partitioning="hive").to_table()
+        result = table.to_pandas().sort_values("value").reset_index(drop=True)
+        self.assertEqual(len(result), len(df))
+        np.testing.assert_array_equal(result["value"], df["value"])
+        self.assertEqual(result["region"].isna().sum(), 50)
+        self.assertEqual(result.loc[1, "region"], "us/west")
+
+        with self.assertRaises(FileExistsError):
+            FileWriter().write_dataset(df, path, "region")
+        with self.assertRaises(ValueError):
+            FileWriter().write_dataset(df, os.path.join(self.temp_dir, "other"), "missing")
+
     def test_large_file_handling(self):
         """Test handling of larger datasets."""
         # Create a larger test dataset
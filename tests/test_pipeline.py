@@ -0,0 +1,94 @@
+"""
+Tests for the pipeline module.
+"""
+
+import threading
+import time
+import unittest
+
+from src.prepo.pipeline import map_ordered, read_ahead
+
+
+class TestPipeline(unittest.TestCase):
+    """Test cases for read_ahead and map_ordered."""
+
+    def _slow(self, items, delay):
+        for item in items:
+            time.sleep(delay)
+            yield item
+
+    def test_order_preserved(self):
+        """Test that results come back in input order with several workers."""
+        delays = [0.03, 0.0, 0.02, 0.0, 0.01] * 4
+
+        def work(i):
+            time.sleep(delays[i])
+            return i * 2
+
+        result = list(map_ordered(work, read_ahead(range(len(delays))), workers=3))
+        self.assertEqual(result, [i * 2 for i in range(len(delays))])
+
+    def test_stages_overlap(self):
+        """Test that reading, transforming and consuming run concurrently."""
+
+        def work(item):
+            time.sleep(0.05)
+            return item
+
+        start = time.perf_counter()
+        for _ in map_ordered(work, read_ahead(self._slow(range(10), 0.05))):
+            time.sleep(0.05)
+        elapsed = time.perf_counter() - start
+
+        # 1.5s when the three stages take turns, about 0.6s when they overlap
+        self.assertLess(elapsed, 1.1)
+
+    def test_backpressure(self):
+        """Test that the reader stays at most queue_size items ahead of the consumer."""
+        produced = []
+
+        def source():
+            for i in range(20):
+                produced.append(i)
+                yield i
+
+        for consumed, _ in enumerate(read_ahead(source(), queue_size=2)):
+            time.sleep(0.01)
+            # The item being consumed, the queued items and the one waiting to be put
+            self.assertLessEqual(len(produced) - consumed, 4)
+
+    def test_errors_propagate(self):
+        """Test that reader and worker exceptions are raised in the consumer."""
+
+        def failing_source():
+            yield 1
+            raise OSError("disk error")
+
+        with self.assertRaises(OSError):
+            list(read_ahead(failing_source()))
+
+        def failing_work(item):
+            if item == 3:
+                raise ValueError("bad chunk")
+            return item
+
+        with self.assertRaises(ValueError):
+            list(map_ordered(failing_work, range(10), workers=2))
+
+        with self.assertRaises(ValueError):
+            next(read_ahead([], queue_size=0))
+        with self.assertRaises(ValueError):
+            next(map_ordered(str, [], workers=0))
+
+    def test_early_close_stops_reader(self):
+        """Test that the reader thread ends when the consumer stops early."""
+        before = threading.active_count()
+        iterator = read_ahead(iter(range(1000)), queue_size=1)
+        self.assertEqual(next(iterator), 0)
+        iterator.close()
+
+        self.assertEqual(threading.active_count(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
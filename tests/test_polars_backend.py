@@ -0,0 +1,145 @@
+"""
+Tests for the Polars backend.
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.prepo.dependencies import HAS_POLARS, is_polars_frame
+from src.prepo.io import FileReader, FileWriter
+from src.prepo.preprocessor import FeaturePreProcessor
+from src.prepo.types import DataType, ScalerType
+
+if HAS_POLARS:
+    import polars as pl
+
+WINE_PATH = Path(__file__).resolve().parent.parent / "data" / "raw" / "winequality-white.csv"
+
+
+@unittest.skipUnless(HAS_POLARS, "polars not installed")
+class TestPolarsBackend(unittest.TestCase):
+    """Test cases comparing the Polars backend with the pandas path."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        rng = np.random.default_rng(1)
+        n = 500
+        price = [str(round(x, 2)) for x in rng.normal(100, 20, n)]
+        for i in rng.choice(n, 30, replace=False):
+            price[i] = "?"
+        rating = rng.random(n)
+        rating[rng.choice(n, 20, replace=False)] = np.nan
+
+        self.df = pd.DataFrame(
+            {
+                "price": price,
+                "rating": rating,
+                "city": rng.choice(["north", "south", "east"], n),
+                "signup": pd.date_range("2020-01-01", periods=n).strftime("%Y-%m-%d"),
+                "visits": rng.integers(0, 50, n),
+                "customer_id": np.arange(n),
+            }
+        )
+        self.df_pl = pl.from_pandas(self.df)
+        self.processor = FeaturePreProcessor()
+
+    def assert_same_output(self, expected: pd.DataFrame, actual: pd.DataFrame):
+        """Check that two processed frames have the same rows and numeric values."""
+        self.assertEqual(list(expected.columns), list(actual.columns))
+        self.assertEqual(len(expected), len(actual))
+        numeric = expected.select_dtypes("number").columns
+        np.testing.assert_allclose(expected[numeric].to_numpy(float), actual[numeric].to_numpy(float), atol=1e-9)
+
+    def test_is_polars_frame(self):
+        """Test polars frame detection."""
+        self.assertTrue(is_polars_frame(self.df_pl))
+        self.assertTrue(is_polars_frame(self.df_pl.lazy()))
+        self.assertFalse(is_polars_frame(self.df))
+
+    def test_determine_datatypes_matches_pandas(self):
+        """Test that both backends detect the same datatypes."""
+        datatypes = self.processor.determine_datatypes(self.df_pl)
+        self.assertEqual(datatypes, self.processor.determine_datatypes(self.df))
+        self.assertEqual(datatypes["price"], DataType.PRICE)
+        self.assertEqual(datatypes["signup"], DataType.TEMPORAL)
+        self.assertEqual(self.processor.determine_datatypes(self.df_pl.lazy()), datatypes)
+
+    def test_process_matches_pandas(self):
+        """Test that process gives numerically equivalent output for every option."""
+        options = [
+            {},
+            {"drop_na": False},
+            {"scaler_type": ScalerType.ROBUST, "sequential_outliers": False},
+            {"scaler_type": ScalerType.MINMAX, "remove_outlier": False},
+        ]
+        for strategy in ["knn", "median", "grouped_median"]:
+            processor = FeaturePreProcessor(impute_strategy=strategy)
+            for kwargs in options:
+                with self.subTest(strategy=strategy, **kwargs):
+                    expected = processor.process(self.df, **kwargs)
+                    result = processor.process(self.df_pl, **kwargs)
+                    self.assertIsInstance(result, pl.DataFrame)
+                    self.assert_same_output(expected, result.to_pandas())
+
+    def test_lazy_input_stays_lazy(self):
+        """Test that a LazyFrame is returned for LazyFrame input."""
+        result = self.processor.process(self.df_pl.lazy())
+        self.assertIsInstance(result, pl.LazyFrame)
+        self.assert_same_output(self.processor.process(self.df), result.collect().to_pandas())
+
+    def test_step_methods(self):
+        """Test clean_data, clean_outliers and scaler on polars input."""
+        clean_pd, datatypes = self.processor.clean_data(self.df)
+        clean_pl, datatypes_pl = self.processor.clean_data(self.df_pl)
+        self.assertEqual(datatypes, datatypes_pl)
+        self.assert_same_output(clean_pd, clean_pl.to_pandas())
+
+        filtered_pd = self.processor.clean_outliers(clean_pd, datatypes)
+        filtered_pl = self.processor.clean_outliers(clean_pl, datatypes)
+        self.assert_same_output(filtered_pd, filtered_pl.to_pandas())
+
+        self.processor.scaler(filtered_pd, "robust", datatypes)
+        scaled_pl = self.processor.scaler(filtered_pl, "robust", datatypes)
+        self.assert_same_output(filtered_pd.reset_index(drop=True), scaled_pl.to_pandas())
+
+    def test_use_polars_with_pandas_input(self):
+        """Test that use_polars runs pandas input through the backend and returns pandas."""
+        processor = FeaturePreProcessor(use_polars=True)
+        result = processor.process(self.df, drop_na=False)
+        self.assertIsInstance(result, pd.DataFrame)
+        self.assert_same_output(self.processor.process(self.df, drop_na=False), result)
+
+    def test_wine_dataset(self):
+        """Test the backend on the wine quality dataset read natively by polars."""
+        df_pl = FileReader(use_polars=True).read_polars(WINE_PATH, separator=";")
+        df = pd.read_csv(WINE_PATH, sep=";")
+
+        self.assertEqual(self.processor.determine_datatypes(df_pl), self.processor.determine_datatypes(df))
+        self.assert_same_output(self.processor.process(df), self.processor.process(df_pl).to_pandas())
+
+    def test_read_and_write_polars(self):
+        """Test reading lazily and writing polars frames."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_path = os.path.join(temp_dir, "input.csv")
+            self.df.to_csv(input_path, index=False)
+
+            lazy = FileReader().read_polars(input_path, lazy=True)
+            self.assertIsInstance(lazy, pl.LazyFrame)
+
+            writer = FileWriter()
+            for name in ["out.csv", "out.parquet", "out.feather", "out.json"]:
+                output_path = os.path.join(temp_dir, name)
+                writer.write_file(self.processor.process(lazy), output_path)
+                self.assertTrue(os.path.exists(output_path))
+
+            written = pd.read_parquet(os.path.join(temp_dir, "out.parquet"))
+            self.assert_same_output(self.processor.process(self.df), written)
+
+
+if __name__ == "__main__":
+    unittest.main()
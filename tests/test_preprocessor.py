@@ -9,8 +9,11 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
+from scipy.stats import iqr
 
-from src.prepo import DataType, FeaturePreProcessor, ScalerType
+from src.prepo import DataType, FeaturePreProcessor, FittedState, ImputeStrategy, ScalerType
+
+WINE_PATH = Path(__file__).resolve().parent.parent / "data" / "raw" / "winequality-white.csv"
 
 
 class TestFeaturePreProcessor(unittest.TestCase):
@@ -56,6 +59,56 @@ class TestFeaturePreProcessor(unittest.TestCase):
         self.assertEqual(datatypes["id_column"], DataType.ID)
         self.assertEqual(datatypes["long_text"], DataType.TEXT)
 
+    def test_null_values(self):
+        """Test configurable null tokens and that numeric columns are not copied."""
+        df = pd.DataFrame({"value": ["1.5", "missing", "2.5", "?"], "number": [1.0, 2.0, 3.0, 4.0]})
+        datatypes = {"value": DataType.NUMERIC, "number": DataType.NUMERIC}
+
+        clean_df = FeaturePreProcessor(null_values=["missing"])._normalize(df, datatypes)
+        self.assertEqual(clean_df["value"].isna().tolist(), [False, True, False, True])
+        self.assertTrue(np.shares_memory(clean_df["number"].to_numpy(), df["number"].to_numpy()))
+        self.assertEqual(df["value"].tolist(), ["1.5", "missing", "2.5", "?"])
+
+        clean_df = self.processor._normalize(df, datatypes)
+        self.assertEqual(clean_df["value"].isna().tolist(), [False, True, False, True])
+
+    def test_determine_datatypes_parallel(self):
+        """Test that parallel detection gives the same datatypes as the serial path."""
+        rng = np.random.default_rng(0)
+        wide = pd.concat([self.df.sample(500, replace=True, random_state=1).reset_index(drop=True)] * 4, axis=1)
+        wide.columns = [f"{col}_{i}" for i in range(4) for col in self.df.columns]
+        wide["measure"] = rng.normal(0, 1, 500)
+        expected = self.processor.determine_datatypes(wide)
+
+        for backend in ["thread", "process"]:
+            with self.subTest(backend=backend):
+                processor = FeaturePreProcessor(n_jobs=3, parallel_backend=backend)
+                datatypes = processor.determine_datatypes(wide)
+                self.assertEqual(datatypes, expected)
+                self.assertEqual(list(datatypes), list(wide.columns))
+
+        self.assertGreaterEqual(FeaturePreProcessor(n_jobs=-1).n_jobs, 1)
+
+    def test_determine_datatypes_approximate_cardinality(self):
+        """Test that sketch-based cardinality gives the same datatypes as exact counting."""
+        rng = np.random.default_rng(0)
+        df = self.df.sample(500, replace=True, random_state=1).reset_index(drop=True)
+        df["url"] = [f"https://example.com/{i}" for i in range(len(df))]
+        df["flag"] = rng.choice(["yes", "no"], len(df))
+        df["colour"] = pd.Series(rng.choice(list("abcdefgh"), len(df)), dtype=object)
+        # 1 and 1.0 are the same value for nunique, "1" is another one
+        df["mixed"] = pd.Series([[1, 1.0, "1"][i] for i in rng.integers(0, 3, len(df))], dtype=object)
+        expected = self.processor.determine_datatypes(df)
+
+        for kwargs in [{}, {"n_jobs": 2, "parallel_backend": "process"}]:
+            with self.subTest(**kwargs):
+                processor = FeaturePreProcessor(approximate_cardinality=True, **kwargs)
+                self.assertEqual(processor.determine_datatypes(df), expected)
+
+        self.assertEqual(expected["flag"], DataType.BINARY)
+        self.assertEqual(expected["colour"], DataType.CATEGORICAL)
+        self.assertEqual(expected["mixed"], DataType.BINARY)
+
     def test_determine_datatypes_edge_cases(self):
         """Test edge cases in data type determination."""
         # Test with empty dataframe
@@ -88,6 +141,34 @@ class TestFeaturePreProcessor(unittest.TestCase):
         # Check that the dataframe has the expected structure
         self.assertGreater(len(clean_df), 2)
 
+    def test_clean_data_impute_strategies(self):
+        """Test multivariate KNN, median and grouped-median imputation in clean_data."""
+        df = pd.DataFrame(
+            {
+                "size": [1.0, 2.0, 3.0, 10.0, 11.0, 12.0, 2.5, 11.5],
+                "weight": [10.0, 20.0, 30.0, 100.0, 110.0, 120.0, np.nan, np.nan],
+                "group": ["a", "a", "a", "b", "b", "b", "a", "b"],
+            }
+        )
+
+        clean_df, _ = FeaturePreProcessor().clean_data(df, drop_na=False)
+        self.assertEqual(list(clean_df["weight"][6:]), [20.0, 110.0])
+
+        clean_df, _ = FeaturePreProcessor(impute_strategy="median").clean_data(df, drop_na=False)
+        self.assertEqual(list(clean_df["weight"][6:]), [65.0, 65.0])
+
+        processor = FeaturePreProcessor(impute_strategy=ImputeStrategy.GROUPED_MEDIAN, impute_group_by="group")
+        clean_df, _ = processor.clean_data(df, drop_na=False)
+        self.assertEqual(list(clean_df["weight"][6:]), [20.0, 110.0])
+
+        # Group medians are kept in the fitted state and reused on new batches
+        state = processor.fit(df, drop_na=False, scaler_type=ScalerType.NONE, remove_outlier=False)
+        self.assertEqual(state.group_by, "group")
+        self.assertEqual(state.group_impute_values["weight"], {"a": 20.0, "b": 110.0})
+
+        batch = pd.DataFrame({"size": [2.0, 2.0], "weight": [np.nan, np.nan], "group": ["b", "c"]})
+        self.assertEqual(list(processor.transform(batch)["weight"]), [110.0, 65.0])
+
     def test_clean_outliers(self):
         """Test the clean_outliers method."""
         # Create data with obvious outliers
@@ -101,6 +182,47 @@ class TestFeaturePreProcessor(unittest.TestCase):
         # Should have fewer rows after removing outliers
         self.assertLess(len(clean_df), len(outlier_df))
 
+    def test_clean_outliers_sequential_wine(self):
+        """Test sequential outlier removal against column-by-column refiltering on the wine dataset."""
+        wine = pd.read_csv(WINE_PATH, sep=";")
+        # Neutral names so no column is skipped by the ID keyword check ("acidity", "dioxide")
+        wine.columns = [f"feature_{i}" for i in range(len(wine.columns))]
+        datatypes = {col: DataType.NUMERIC for col in wine.columns}
+
+        expected = wine.copy()
+        for col in wine.columns:
+            if self.processor._is_outlier_column(col, datatypes[col]):
+                iqrv = iqr(expected[col])
+                q1, q3 = expected[col].quantile(0.25), expected[col].quantile(0.75)
+                expected = expected[expected[col].between(q1 - 1.5 * iqrv, q3 + 1.5 * iqrv)]
+
+        result = self.processor.clean_outliers(wine, datatypes)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_clean_outliers_simultaneous_wine(self):
+        """Test single-mask outlier removal with bounds computed on the input rows."""
+        wine = pd.read_csv(WINE_PATH, sep=";")
+        features = wine.set_axis([f"feature_{i}" for i in range(len(wine.columns))], axis=1)
+        datatypes = {col: DataType.NUMERIC for col in features.columns}
+
+        mask = pd.Series(True, index=features.index)
+        for col in features.columns:
+            q1, q3 = features[col].quantile(0.25), features[col].quantile(0.75)
+            mask &= features[col].between(q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1))
+
+        result = self.processor.clean_outliers(features, datatypes, sequential=False)
+        pd.testing.assert_frame_equal(result, features[mask])
+        self.assertGreater(len(result), len(self.processor.clean_outliers(features, datatypes)))
+
+        # Bounds are fixed in simultaneous mode, so fit/transform reproduces process
+        expected = self.processor.process(wine, sequential_outliers=False)
+        self.processor.fit(wine, sequential_outliers=False)
+        pd.testing.assert_frame_equal(self.processor.transform(wine), expected, check_dtype=False)
+
+        # Without outlier columns nothing is filtered
+        no_numeric = {col: DataType.STRING for col in wine.columns}
+        self.assertEqual(len(self.processor.clean_outliers(wine, no_numeric, sequential=False)), len(wine))
+
     def test_scaling_methods(self):
         """Test all scaling methods."""
         clean_df, datatypes = self.processor.clean_data(self.df, drop_na=True)
@@ -151,6 +273,35 @@ class TestFeaturePreProcessor(unittest.TestCase):
         processed_df = self.processor.process(self.df, drop_na=False, scaler_type=ScalerType.ROBUST, remove_outlier=False)
         self.assertIsInstance(processed_df, pd.DataFrame)
 
+    def test_process_without_copies(self):
+        """Test that copy=False gives the same result with peak memory close to the input size."""
+        import tracemalloc
+
+        rng = np.random.default_rng(0)
+        n = 200_000
+        df = pd.DataFrame({f"x{i}": rng.normal(size=n) for i in range(8)})
+        df["count"] = rng.integers(0, 100, n)
+        df.loc[::50, "x1"] = np.nan
+        original = df.copy()
+        processor = FeaturePreProcessor(impute_strategy="median")
+        processor.determine_datatypes(df)
+        input_bytes = df.memory_usage(index=False).sum()
+
+        for kwargs in [{}, {"sequential_outliers": False}, {"drop_na": False}, {"remove_outlier": False}]:
+            with self.subTest(**kwargs):
+                expected = processor.process(df, **kwargs)
+
+                tracemalloc.start()
+                try:
+                    result = processor.process(df, copy=False, **kwargs)
+                    peak = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+
+                pd.testing.assert_frame_equal(result, expected)
+                pd.testing.assert_frame_equal(df, original)
+                self.assertLess(peak / input_bytes, 1.6)
+
     def test_polars_optimization(self):
         """Test Polars optimization initialization."""
         try:
@@ -185,6 +336,14 @@ class TestFeaturePreProcessor(unittest.TestCase):
             invalid_scaler = "invalid"
             self.processor.process(self.df, scaler_type=invalid_scaler)
 
+    def test_determine_datatypes_null_tokens_in_numbers(self):
+        """Test that unparseable tokens in numeric-looking columns do not break integer detection."""
+        df = pd.DataFrame({"visits": ["1", "2", "?", "4", "15"] * 30, "weight": ["1.5", "2", "?", "4", "7"] * 30})
+        datatypes = self.processor.determine_datatypes(df)
+
+        self.assertEqual(datatypes["visits"], DataType.INTEGER)
+        self.assertEqual(datatypes["weight"], DataType.NUMERIC)
+
     def test_helper_methods(self):
         """Test private helper methods."""
         # Test _is_numeric
@@ -201,11 +360,172 @@ class TestFeaturePreProcessor(unittest.TestCase):
         non_percentage_series = pd.Series([10, 50, 90])
         self.assertFalse(self.processor._is_percentage_range(non_percentage_series))
 
+        # Test _is_integral on the shared numeric values
+        for series, expected in [
+            (pd.Series([1, 2, 3]), True),
+            (pd.Series([1.0, np.nan, 3.0]), True),
+            (pd.Series([1.5, 2.0]), False),
+            (pd.Series([1.0, np.inf]), False),
+            (pd.Series(["1", "?", "3"], dtype=object), True),
+        ]:
+            numeric = self.processor._numeric_values(series)
+            self.assertEqual(self.processor._is_integral(series, numeric), expected, list(series))
+
         # Test _is_date
         self.assertTrue(self.processor._is_date("2023-01-01"))
         self.assertFalse(self.processor._is_date("not_a_date"))
         self.assertFalse(self.processor._is_date(np.nan))
 
+    def test_is_temporal_matches_per_value_parse(self):
+        """Test that vectorized date detection agrees with per-value dateutil parsing."""
+        cases = [
+            pd.Series(["2023-01-01", "2023-01-02", np.nan, "2023-01-04"]),
+            pd.Series(["01/31/2023", "2023-02-01", "1 Mar 2023", "2023-03-04 10:15:00"]),
+            pd.Series(["2023-01-01"] * 50 + ["Jan 5th, 2023"]),
+            pd.Series(["2023-01-01", "2023-01-02", "not a date"]),
+            pd.Series(["2023-01-01"] * 50 + ["garbage"]),
+            pd.Series(["Product A", "Product B"]),
+            pd.Series([20230101, 20230102]),
+            pd.Series([np.nan, np.nan], dtype=object),
+        ]
+        for series in cases:
+            expected = series.dropna().apply(self.processor._is_date).all() and not series.dropna().empty
+            self.assertEqual(self.processor._is_temporal(series), expected, list(series))
+
+    def test_is_temporal_common_formats(self):
+        """Test that long columns in common date formats are still detected as temporal."""
+        dates = pd.date_range("2020-01-01", periods=300, freq="37h")
+        formats = [
+            "%Y-%m-%dT%H:%M:%SZ",
+            "%Y-%m-%dT%H:%M:%S+00:00",
+            "%Y-%m-%d %H:%M:%S.%f",
+            "%m/%d/%Y %H:%M",
+            "%b %d, %Y",
+            "%d %B %Y",
+            "%b %d, %Y %I%p",
+            # Not in DATE_FORMATS: every value is parsed by dateutil
+            "%Y.%m.%d",
+        ]
+        for fmt in formats:
+            series = pd.Series(dates.strftime(fmt))
+            self.assertTrue(self.processor._is_temporal(series), fmt)
+
+        offsets = pd.Series([f"2023-01-{day:02d}T10:00:00{'+02:00' if day % 2 else '-05:00'}" for day in range(1, 29)] * 10)
+        self.assertTrue(self.processor._is_temporal(offsets))
+        # dateutil rejects "0"
+        self.assertFalse(self.processor._is_temporal(pd.Series([str(i) for i in range(300)])))
+        self.assertFalse(self.processor._is_temporal(pd.Series(dates.strftime("%Y.%m.%d")[:-1].append(pd.Index(["later"])))))
+
+        # A single unparseable value among many unmatched ones rules the column out, as per-value parsing does
+        unmatched = pd.Series(dates.strftime("%d-%b-%Y"))
+        unmatched[137] = "31-Foo-2020"
+        expected = unmatched.apply(self.processor._is_date).all()
+        self.assertFalse(expected)
+        self.assertEqual(self.processor._is_temporal(unmatched), expected)
+
+    def test_fit_transform_matches_process(self):
+        """Test that transforming the fitted frame reproduces process."""
+        for drop_na in [True, False]:
+            for scaler in [ScalerType.STANDARD, ScalerType.ROBUST, ScalerType.MINMAX, ScalerType.NONE]:
+                expected = self.processor.process(self.df, drop_na=drop_na, scaler_type=scaler, remove_outlier=True)
+
+                state = self.processor.fit(self.df, drop_na=drop_na, scaler_type=scaler, remove_outlier=True)
+                result = self.processor.transform(self.df)
+
+                self.assertIs(self.processor.fitted_state, state)
+                pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_fit_transform_knn_matches_process(self):
+        """Test that KNN imputation in transform uses the fitted neighbors, as process does."""
+        rng = np.random.default_rng(3)
+        x = rng.normal(0, 1, 200)
+        df = pd.DataFrame({"x": x, "y": 3 * x + rng.normal(0, 0.1, 200), "z": -2 * x + rng.normal(0, 0.1, 200)})
+        df.loc[::9, "y"] = np.nan
+        df.loc[::13, "z"] = np.nan
+
+        for scaler in [ScalerType.STANDARD, ScalerType.NONE]:
+            with self.subTest(scaler=scaler):
+                expected = self.processor.process(df, drop_na=False, scaler_type=scaler, remove_outlier=False)
+                state = self.processor.fit(df, drop_na=False, scaler_type=scaler, remove_outlier=False)
+                pd.testing.assert_frame_equal(self.processor.transform(df), expected, check_dtype=False)
+
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    path = os.path.join(temp_dir, "state.json")
+                    state.save(path)
+                    loaded = FeaturePreProcessor().transform(df, state=FittedState.load(path))
+                pd.testing.assert_frame_equal(loaded, expected, check_dtype=False)
+
+    def test_fit_transform_new_batch(self):
+        """Test that a new batch is scaled with the fitted statistics."""
+        train = pd.DataFrame({"amount": [1.0, 2.0, 3.0, 4.0, 5.0], "group": ["a", "b", "a", "b", "a"]})
+        batch = pd.DataFrame({"amount": [3.0, np.nan, 100.0], "group": ["b", "a", "?"]})
+
+        state = self.processor.fit(train, drop_na=False, scaler_type=ScalerType.MINMAX, remove_outlier=True)
+        self.assertEqual(state.scaler_params["amount"], (1.0, 4.0))
+
+        result = self.processor.transform(batch)
+
+        # NaN has no observed column to find neighbors on, so it gets the training mean; 100 is outside the bounds
+        self.assertEqual(list(result["amount"]), [0.5, 0.5])
+        self.assertEqual(list(result["group"]), ["b", "a"])
+
+    def test_transform_saved_state(self):
+        """Test that a state saved to disk transforms like the in-memory one."""
+        state = self.processor.fit(self.df, drop_na=False, scaler_type=ScalerType.ROBUST)
+        expected = self.processor.transform(self.df)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "state.json")
+            state.save(path)
+            result = FeaturePreProcessor().transform(self.df, state=FittedState.load(path))
+
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_partial_fit_matches_fit(self):
+        """Test that partial_fit over micro-batches gives the statistics of a single fit."""
+        wine = pd.read_csv(WINE_PATH, sep=";")
+        for scaler in [ScalerType.STANDARD, ScalerType.MINMAX]:
+            processor = FeaturePreProcessor()
+            for start in range(0, len(wine), 500):
+                state = processor.partial_fit(wine.iloc[start : start + 500], scaler_type=scaler)
+
+            expected = FeaturePreProcessor().fit(wine, scaler_type=scaler, remove_outlier=False)
+            self.assertIs(processor.fitted_state, state)
+            self.assertEqual(state.running_stats.count[0], len(wine))
+            for col, (center, scale) in expected.scaler_params.items():
+                self.assertAlmostEqual(state.scaler_params[col][0], center)
+                self.assertAlmostEqual(state.scaler_params[col][1], scale)
+
+            batch = wine.iloc[:100]
+            pd.testing.assert_frame_equal(processor.transform(batch), FeaturePreProcessor().transform(batch, expected))
+
+    def test_partial_fit_resume_and_errors(self):
+        """Test resuming partial_fit from a saved state and its argument checks."""
+        first, second = self.df.iloc[:5], self.df.iloc[5:]
+        processor = FeaturePreProcessor()
+        processor.partial_fit(first)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "state.json")
+            processor.fitted_state.save(path)
+            resumed = FeaturePreProcessor()
+            resumed.fitted_state = FittedState.load(path)
+
+        self.assertEqual(processor.partial_fit(second), resumed.partial_fit(second))
+        with self.assertRaises(ValueError):
+            processor.partial_fit(second, scaler_type=ScalerType.MINMAX)
+        with self.assertRaises(ValueError):
+            FeaturePreProcessor().partial_fit(first, scaler_type=ScalerType.ROBUST)
+
+    def test_transform_errors(self):
+        """Test transform error handling."""
+        with self.assertRaises(ValueError):
+            FeaturePreProcessor().transform(self.df)
+
+        self.processor.fit(self.df)
+        with self.assertRaises(ValueError):
+            self.processor.transform(self.df.drop(columns=["revenue"]))
+
     def test_scalers_dict(self):
         """Test that all scalers are properly initialized."""
         expected_scalers = {ScalerType.STANDARD, ScalerType.ROBUST, ScalerType.MINMAX, ScalerType.NONE}
@@ -0,0 +1,82 @@
+"""
+Tests for the sampling module.
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.prepo.sampling import RowReservoir, StratifiedSample, required_sample_size
+
+
+class TestSampling(unittest.TestCase):
+    """Test cases for the row samplers."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        n = 100_000
+        self.df = pd.DataFrame({"row": np.arange(n), "label": np.arange(n).astype(str)})
+
+    def _stream(self, sampler, chunksize):
+        for start in range(0, len(self.df), chunksize):
+            sampler.update(self.df.iloc[start : start + chunksize])
+        return sampler
+
+    def test_required_sample_size(self):
+        """Test the sample size needed to see a rare pattern."""
+        self.assertEqual(required_sample_size(0.001, 0.99), 4603)
+        self.assertLess((1 - 0.01) ** required_sample_size(0.01, 0.95), 0.05)
+        with self.assertRaises(ValueError):
+            required_sample_size(0, 0.99)
+        with self.assertRaises(ValueError):
+            required_sample_size(0.01, 1)
+
+    def test_reservoir(self):
+        """Test that the reservoir keeps whole rows, in order, uniformly over the stream."""
+        sample = self._stream(RowReservoir(1000, seed=0), 7000).sample
+
+        self.assertEqual(len(sample), 1000)
+        self.assertTrue(sample["row"].is_monotonic_increasing)
+        self.assertTrue((sample["label"] == sample["row"].astype(str)).all())
+        counts = np.histogram(sample["row"], bins=4, range=(0, len(self.df)))[0]
+        self.assertTrue((np.abs(counts - 250) < 60).all(), counts)
+
+        small = RowReservoir(1000).update(self.df.iloc[:10]).update(self.df.iloc[10:30])
+        pd.testing.assert_frame_equal(small.sample, self.df.iloc[:30])
+        self.assertTrue(RowReservoir().sample.empty)
+        with self.assertRaises(ValueError):
+            RowReservoir(0)
+
+    def test_reservoir_merge(self):
+        """Test merging the samples of consecutive parts of a stream."""
+        first = RowReservoir(500, seed=1).update(self.df.iloc[:25_000])
+        second = RowReservoir(500, seed=2).update(self.df.iloc[25_000:])
+        sample = first.merge(second).sample
+
+        self.assertEqual(first.seen, len(self.df))
+        self.assertEqual(len(sample), 500)
+        self.assertTrue(sample["row"].is_monotonic_increasing)
+        self.assertEqual((sample["row"] < 25_000).sum(), 125)
+
+    def test_stratified(self):
+        """Test that every region of the stream is equally represented, whatever the chunk size."""
+        for chunksize in [999, 7000, len(self.df)]:
+            with self.subTest(chunksize=chunksize):
+                sampler = self._stream(StratifiedSample(1000, n_strata=10), chunksize)
+                sample = sampler.sample
+
+                self.assertEqual(sampler.seen, len(self.df))
+                self.assertLessEqual(len(sampler.strata), 20)
+                self.assertEqual(len(sample), 1000)
+                self.assertTrue(sample["row"].is_monotonic_increasing)
+                counts = np.histogram(sample["row"], bins=5, range=(0, len(self.df)))[0]
+                self.assertTrue((counts >= 150).all(), counts)
+
+        self.assertEqual(len(StratifiedSample(1000).update(self.df.iloc[:300]).sample), 300)
+        with self.assertRaises(ValueError):
+            StratifiedSample(1000, n_strata=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
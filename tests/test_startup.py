@@ -0,0 +1,42 @@
+"""
+Tests for the package and CLI startup cost.
+"""
+
+import unittest
+from unittest.mock import patch
+
+from benchmarks.startup import check, main
+
+
+class TestStartup(unittest.TestCase):
+    """Test cases for lazy imports and startup time budgets."""
+
+    def test_startup(self):
+        """Test that import and --help load no heavy dependency and stay within generous budgets."""
+        rows = check(repeat=1, budgets={"import": 2.0, "help": 2.0})
+
+        self.assertEqual([row["target"] for row in rows], ["import", "help"])
+        for row in rows:
+            with self.subTest(target=row["target"]):
+                self.assertEqual(row["heavy_modules"], [])
+                self.assertEqual(row["failures"], [])
+
+    @patch("builtins.print")
+    def test_main(self, mock_print):
+        """Test the exit status when budgets are met or exceeded."""
+        self.assertEqual(main(["--repeat", "1", "--import-budget", "2", "--help-budget", "2"]), 0)
+        self.assertEqual(main(["--repeat", "1", "--import-budget", "0", "--help-budget", "0"]), 1)
+
+    def test_lazy_attributes(self):
+        """Test that lazily loaded names resolve on first access."""
+        import src.prepo as prepo
+        from src.prepo.preprocessor import FeaturePreProcessor
+
+        self.assertIs(prepo.FeaturePreProcessor, FeaturePreProcessor)
+        self.assertIn("FileReader", dir(prepo))
+        with self.assertRaises(AttributeError):
+            prepo.missing_name
+
+
+if __name__ == "__main__":
+    unittest.main()
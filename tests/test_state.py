@@ -0,0 +1,92 @@
+"""
+Tests for the fitted state module.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.prepo.state import FittedState
+from src.prepo.stats import RunningStats
+from src.prepo.types import DataType, ScalerType
+
+
+class TestFittedState(unittest.TestCase):
+    """Test cases for FittedState serialization."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.state = FittedState(
+            datatypes={"price": DataType.PRICE, "category": DataType.CATEGORICAL, "name": DataType.STRING},
+            scaler_type=ScalerType.ROBUST,
+            drop_na=False,
+            remove_outlier=True,
+            impute_values={"price": np.float64(12.5), "category": "A"},
+            group_by="category",
+            group_impute_values={"price": {"A": np.float64(10.0), "B": np.float64(15.0)}},
+            knn_reference={"price": [10.0, 12.0, np.nan]},
+            knn_neighbors=5,
+            outlier_bounds={"price": (np.float64(-3.0), np.float64(30.0))},
+            scaler_params={"price": (np.float64(11.0), np.float64(4.0))},
+        )
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test files."""
+        import shutil
+
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_to_dict_is_json_serializable(self):
+        """Test that numpy statistics are converted to builtin types."""
+        data = self.state.to_dict()
+        encoded = json.loads(json.dumps(data))
+
+        self.assertEqual(encoded["datatypes"]["price"], "price")
+        self.assertEqual(encoded["scaler_type"], "robust")
+        self.assertEqual(encoded["impute_values"], {"price": 12.5, "category": "A"})
+        self.assertEqual(encoded["outlier_bounds"]["price"], [-3.0, 30.0])
+
+    def test_save_load_round_trip(self):
+        """Test that a saved state loads back unchanged."""
+        path = os.path.join(self.temp_dir, "state.json")
+        self.state.save(path)
+        loaded = FittedState.load(path)
+
+        self.assertEqual(loaded.datatypes, self.state.datatypes)
+        self.assertEqual(loaded.scaler_type, ScalerType.ROBUST)
+        self.assertFalse(loaded.drop_na)
+        self.assertTrue(loaded.remove_outlier)
+        self.assertEqual(loaded.impute_values, {"price": 12.5, "category": "A"})
+        self.assertEqual(loaded.group_by, "category")
+        self.assertEqual(loaded.group_impute_values, {"price": {"A": 10.0, "B": 15.0}})
+        np.testing.assert_array_equal(loaded.knn_reference["price"], [10.0, 12.0, np.nan])
+        self.assertEqual(loaded.knn_neighbors, 5)
+        self.assertFalse(loaded.knn_tree)
+        self.assertEqual(loaded.outlier_bounds, {"price": (-3.0, 30.0)})
+        self.assertEqual(loaded.scaler_params, {"price": (11.0, 4.0)})
+
+    def test_running_stats_round_trip(self):
+        """Test that the running statistics of partial_fit survive serialization."""
+        self.state.running_stats = RunningStats(1).update(np.array([[1.0], [2.0], [np.nan], [6.0]]))
+        loaded = FittedState.from_dict(json.loads(json.dumps(self.state.to_dict())))
+
+        np.testing.assert_array_equal(loaded.running_stats.count, [3])
+        np.testing.assert_allclose(loaded.running_stats.means(), [3.0])
+        np.testing.assert_allclose(loaded.running_stats.std(), self.state.running_stats.std())
+        self.assertIsNone(FittedState.from_dict(FittedState(datatypes={}).to_dict()).running_stats)
+
+    def test_unsupported_version(self):
+        """Test that states written by a newer version are rejected."""
+        data = self.state.to_dict()
+        data["version"] = 999
+
+        with self.assertRaises(ValueError):
+            FittedState.from_dict(data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+"""
+Tests for the stats module.
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.prepo.stats import HeavyHitters, HyperLogLog, QuantileSketch, ReservoirSample, RunningStats
+
+
+class TestRunningStats(unittest.TestCase):
+    """Test cases for the mergeable running statistics."""
+
+    def test_update_matches_numpy(self):
+        """Test that chunked updates give the statistics of the whole array."""
+        rng = np.random.default_rng(0)
+        values = rng.normal(5, 2, size=(1000, 3))
+        values[::7, 1] = np.nan
+        values[:, 2] = np.nan
+
+        stats = RunningStats(3)
+        for start in range(0, 1000, 128):
+            stats.update(values[start : start + 128])
+
+        np.testing.assert_array_equal(stats.count, [1000, 857, 0])
+        np.testing.assert_allclose(stats.means()[:2], np.nanmean(values[:, :2], axis=0))
+        np.testing.assert_allclose(stats.std()[:2], np.nanstd(values[:, :2], axis=0, ddof=1))
+        np.testing.assert_allclose(stats.min[:2], np.nanmin(values[:, :2], axis=0))
+        np.testing.assert_allclose(stats.max[:2], np.nanmax(values[:, :2], axis=0))
+        self.assertTrue(np.isnan(stats.means()[2]))
+        self.assertTrue(np.isnan(stats.std()[2]))
+
+    def test_merge(self):
+        """Test that merging two partial results equals a single pass."""
+        values = np.arange(20, dtype=float).reshape(10, 2)
+        left = RunningStats(2).update(values[:3])
+        right = RunningStats(2).update(values[3:])
+        merged = left.merge(right)
+
+        np.testing.assert_allclose(merged.means(), values.mean(axis=0))
+        np.testing.assert_allclose(merged.variance(), values.var(axis=0, ddof=1))
+
+
+class TestReservoirSample(unittest.TestCase):
+    """Test cases for the reservoir sample."""
+
+    def test_exact_below_capacity(self):
+        """Test that quantiles are exact while the sample fits."""
+        reservoir = ReservoirSample(capacity=100)
+        reservoir.update(np.array([1.0, np.nan, 2.0, 3.0])).update(np.array([4.0, 5.0]))
+
+        self.assertEqual(reservoir.seen, 5)
+        self.assertEqual(reservoir.quantile(0.5), 3.0)
+
+    def test_capacity_and_merge(self):
+        """Test that the sample stays bounded and merges by weight."""
+        left = ReservoirSample(capacity=500, seed=1).update(np.zeros(9000))
+        right = ReservoirSample(capacity=500, seed=2).update(np.ones(1000))
+
+        self.assertEqual(len(left.values), 500)
+        left.merge(right)
+        self.assertEqual(left.seen, 10000)
+        self.assertEqual(len(left.values), 500)
+        self.assertEqual(left.values.sum(), 50)
+
+    def test_empty_quantile(self):
+        """Test quantiles of an empty sample."""
+        self.assertTrue(np.isnan(ReservoirSample().quantile(0.5)))
+        self.assertTrue(np.isnan(ReservoirSample().quantile([0.25, 0.75])).all())
+
+
+class TestQuantileSketch(unittest.TestCase):
+    """Test cases for the mergeable quantile sketch."""
+
+    def _rank_errors(self, values, sketch, qs):
+        """Return the distance between the target and the actual ranks of the estimates."""
+        ranks = np.searchsorted(np.sort(values), sketch.quantile(qs)) / len(values)
+        return np.abs(ranks - qs)
+
+    def test_exact_before_compaction(self):
+        """Test that quantiles are exact while every value fits in the sketch."""
+        sketch = QuantileSketch(k=100).update(np.array([1.0, np.nan, 2.0, 3.0])).update(np.array([4.0, 5.0]))
+
+        self.assertEqual(sketch.count, 5)
+        self.assertEqual(sketch.quantile(0.5), 3.0)
+        np.testing.assert_allclose(sketch.quantile([0.25, 0.75]), [2.0, 4.0])
+
+    def test_error_bound_and_memory(self):
+        """Test the rank error and the bounded size on a million values."""
+        values = np.random.default_rng(0).lognormal(size=1_000_000)
+        qs = [0.01, 0.25, 0.5, 0.75, 0.99]
+        for error in [0.01, 0.001]:
+            with self.subTest(error=error):
+                sketch = QuantileSketch.for_error(error)
+                for start in range(0, len(values), 100_000):
+                    sketch.update(values[start : start + 100_000])
+
+                self.assertLessEqual(self._rank_errors(values, sketch, qs).max(), error)
+                self.assertLess(sum(len(items) for items in sketch.levels), 5 * sketch.k)
+                self.assertEqual(sketch.quantile(0.0), values.min())
+                self.assertEqual(sketch.quantile(1.0), values.max())
+
+    def test_merge(self):
+        """Test that sketches built on separate chunks merge into a sketch of all values."""
+        values = np.random.default_rng(1).normal(size=200_000)
+        parts = [QuantileSketch(k=400, seed=i).update(part) for i, part in enumerate(np.array_split(values, 8))]
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+
+        self.assertEqual(merged.count, len(values))
+        self.assertLessEqual(self._rank_errors(values, merged, [0.25, 0.5, 0.75]).max(), merged.rank_error)
+
+    def test_update_repeated(self):
+        """Test adding a repeated value as weighted items."""
+        sketch = QuantileSketch(k=100).update(np.arange(10.0)).update_repeated(100.0, 1000)
+
+        self.assertEqual(sketch.count, 1010)
+        self.assertEqual(sketch.quantile(0.5), 100.0)
+        self.assertLess(sum(len(items) for items in sketch.levels), 20)
+
+    def test_invalid_and_empty(self):
+        """Test argument validation and quantiles of an empty sketch."""
+        with self.assertRaises(ValueError):
+            QuantileSketch(k=2)
+        with self.assertRaises(ValueError):
+            QuantileSketch.for_error(0)
+        self.assertTrue(np.isnan(QuantileSketch().quantile(0.5)))
+        self.assertTrue(np.isnan(QuantileSketch().quantile([0.25, 0.75])).all())
+
+
+class TestHyperLogLog(unittest.TestCase):
+    """Test cases for the distinct-count sketch."""
+
+    def test_exact_while_small(self):
+        """Test that small cardinalities are counted exactly, ignoring nulls."""
+        sketch = HyperLogLog().update(pd.Series(["a", "b", None, "a"])).update(np.array(["c", "b"]))
+
+        self.assertEqual(sketch.count(), 3.0)
+        self.assertIsNone(sketch.registers)
+
+    def test_mixed_types(self):
+        """Test that object values are distinct by kind as in nunique: 1 equals 1.0 and True but not "1"."""
+        for values in [[1, 1.0, "1"], [True, 1, "a", "a"], [1, 2, 2.0], [b"1", "1"]]:
+            series = pd.Series(values, dtype=object)
+            with self.subTest(values=values):
+                self.assertEqual(HyperLogLog().update(series).count(), series.nunique())
+                self.assertAlmostEqual(
+                    HeavyHitters().update(series).max_frequency(), series.value_counts(normalize=True).max()
+                )
+
+    def test_error_bound_and_merge(self):
+        """Test the estimate on large cardinalities and merging overlapping sketches."""
+        values = np.array([f"user-{i}" for i in range(100_000)], dtype=object)
+        sketch = HyperLogLog(precision=12).update(values)
+
+        self.assertIsNone(sketch.hashes)
+        self.assertEqual(len(sketch.registers), 4096)
+        self.assertLess(abs(sketch.count() - 100_000) / 100_000, 3 * sketch.relative_error)
+
+        left = HyperLogLog().update(values[:60_000])
+        right = HyperLogLog().update(values[40_000:])
+        self.assertEqual(left.merge(right).count(), sketch.count())
+        self.assertEqual(HyperLogLog().update(values[:10]).merge(sketch).count(), sketch.count())
+
+        with self.assertRaises(ValueError):
+            HyperLogLog(precision=2)
+        with self.assertRaises(ValueError):
+            HyperLogLog(precision=10).merge(sketch)
+
+
+class TestHeavyHitters(unittest.TestCase):
+    """Test cases for the Misra-Gries summary."""
+
+    def test_max_frequency(self):
+        """Test that the most frequent value is found within the error bound across merges."""
+        rng = np.random.default_rng(0)
+        values = np.concatenate([rng.choice(["a", "b", "c"], 20_000, p=[0.5, 0.3, 0.2]), np.arange(20_000).astype(str)])
+        values = values[rng.permutation(len(values))]
+        exact = pd.Series(values).value_counts(normalize=True).max()
+
+        parts = [HeavyHitters(capacity=16).update(part) for part in np.array_split(values, 4)]
+        summary = parts[0]
+        for part in parts[1:]:
+            summary.merge(part)
+
+        self.assertEqual(summary.count, len(values))
+        self.assertLessEqual(len(summary.keys), 16)
+        self.assertLessEqual(summary.error, summary.count / 17)
+        self.assertLessEqual(summary.max_frequency(), exact)
+        self.assertGreaterEqual(summary.max_frequency(), exact - summary.error / summary.count)
+
+    def test_exact_and_empty(self):
+        """Test exact counts below capacity and an empty summary."""
+        self.assertEqual(HeavyHitters().update(pd.Series(["x", "y", "x", None])).max_frequency(), 2 / 3)
+        self.assertTrue(np.isnan(HeavyHitters().max_frequency()))
+        with self.assertRaises(ValueError):
+            HeavyHitters(capacity=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
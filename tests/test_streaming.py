@@ -0,0 +1,136 @@
+"""
+Tests for the streaming module.
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.prepo.io import FileReader
+from src.prepo.preprocessor import FeaturePreProcessor
+from src.prepo.streaming import ChunkedProcessor
+from src.prepo.types import DataType, ScalerType
+
+WINE_PATH = Path(__file__).resolve().parent.parent / "data" / "raw" / "winequality-white.csv"
+
+
+class TestChunkedProcessor(unittest.TestCase):
+    """Test cases for chunked fitting and processing."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.wine = pd.read_csv(WINE_PATH, sep=";")
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test files."""
+        import shutil
+
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _chunks(self, df, size):
+        return lambda: (df.iloc[start : start + size] for start in range(0, len(df), size))
+
+    def test_fit_chunks_matches_fit(self):
+        """Test that exact statistics agree with the in-memory fit."""
+        for scaler in [ScalerType.STANDARD, ScalerType.MINMAX]:
+            expected = FeaturePreProcessor().fit(self.wine, scaler_type=scaler, remove_outlier=False)
+            state = ChunkedProcessor(chunksize=700).fit_chunks(
+                self._chunks(self.wine, 700), scaler_type=scaler, remove_outlier=False
+            )
+
+            self.assertEqual(state.datatypes, expected.datatypes)
+            for col, (center, scale) in expected.scaler_params.items():
+                self.assertAlmostEqual(state.scaler_params[col][0], center)
+                self.assertAlmostEqual(state.scaler_params[col][1], scale)
+
+    def test_fit_chunks_imputation_and_outliers(self):
+        """Test imputation values and outlier bounds accumulated over chunks."""
+        df = self.wine.copy()
+        df.loc[::10, "alcohol"] = np.nan
+        processor = FeaturePreProcessor()
+        state = ChunkedProcessor(processor=processor).fit_chunks(
+            self._chunks(df, 1000), drop_na=False, scaler_type=ScalerType.ROBUST
+        )
+
+        self.assertIs(processor.fitted_state, state)
+        self.assertAlmostEqual(state.impute_values["alcohol"], df["alcohol"].mean())
+
+        # The sketch error is below the spacing of the rounded alcohol values, so the quartiles are exact
+        filled = df["alcohol"].fillna(df["alcohol"].mean())
+        q1, q3 = filled.quantile([0.25, 0.75])
+        lower, upper = state.outlier_bounds["alcohol"]
+        self.assertAlmostEqual(lower, q1 - 1.5 * (q3 - q1))
+        self.assertAlmostEqual(upper, q3 + 1.5 * (q3 - q1))
+        self.assertIn("alcohol", state.scaler_params)
+
+    def test_fit_chunks_median_imputation(self):
+        """Test that median imputation values are estimated over chunks."""
+        df = self.wine.copy()
+        df.loc[::10, "pH"] = np.nan
+        processor = FeaturePreProcessor(impute_strategy="median")
+        state = ChunkedProcessor(processor=processor).fit_chunks(
+            self._chunks(df, 1000), drop_na=False, scaler_type=ScalerType.NONE, remove_outlier=False
+        )
+
+        self.assertAlmostEqual(state.impute_values["pH"], df["pH"].median())
+        self.assertEqual(state.scaler_params, {})
+
+    def test_pipeline_matches_serial(self):
+        """Test that the pipelined fit and output equal the serial ones."""
+        input_path = os.path.join(self.temp_dir, "wine.csv")
+        self.wine.to_csv(input_path, index=False)
+
+        outputs = []
+        for kwargs in [{}, {"pipeline": True, "workers": 3, "queue_size": 1}]:
+            output_path = os.path.join(self.temp_dir, f"out_{len(outputs)}.parquet")
+            chunked = ChunkedProcessor(chunksize=500, **kwargs)
+            rows = chunked.process_file(input_path, output_path, drop_na=False, scaler_type=ScalerType.ROBUST)
+            outputs.append((rows, chunked.processor.fitted_state, pd.read_parquet(output_path)))
+
+        self.assertEqual(outputs[0][0], outputs[1][0])
+        self.assertEqual(outputs[0][1], outputs[1][1])
+        pd.testing.assert_frame_equal(outputs[0][2], outputs[1][2])
+
+    def test_sampling_detects_late_values(self):
+        """Test that a sampled detection types columns whose values change after the first chunk."""
+        df = pd.DataFrame({"amount": np.arange(2000.0), "status": [np.nan] * 1500 + [f"s{i}" for i in range(500)]})
+        input_path = os.path.join(self.temp_dir, "late.csv")
+        df.to_csv(input_path, index=False)
+
+        first_chunk = ChunkedProcessor(chunksize=500).fit(input_path, drop_na=False, remove_outlier=False)
+        self.assertEqual(first_chunk.datatypes["status"], DataType.INTEGER)
+
+        for sampling in ["stratified", "reservoir"]:
+            with self.subTest(sampling=sampling):
+                state = ChunkedProcessor(chunksize=500, sampling=sampling).fit(input_path, drop_na=False, remove_outlier=False)
+                self.assertIn(state.datatypes["status"], [DataType.STRING, DataType.CATEGORICAL])
+                self.assertEqual(state.datatypes["amount"], DataType.INTEGER)
+
+    def test_fit_chunks_empty(self):
+        """Test that fitting on no chunks raises an error."""
+        with self.assertRaises(ValueError):
+            ChunkedProcessor().fit_chunks(lambda: iter([]))
+
+    def test_process_file(self):
+        """Test chunked processing of the wine dataset to CSV and Parquet."""
+        input_path = os.path.join(self.temp_dir, "wine.csv")
+        self.wine.to_csv(input_path, index=False)
+        expected = FeaturePreProcessor().process(self.wine, remove_outlier=False)
+
+        chunked = ChunkedProcessor(chunksize=1000)
+        for name in ["out.csv", "out.parquet"]:
+            output_path = os.path.join(self.temp_dir, name)
+            rows = chunked.process_file(input_path, output_path, remove_outlier=False)
+
+            result = FileReader().read_file(output_path)
+            self.assertEqual(rows, len(self.wine))
+            pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
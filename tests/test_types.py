@@ -4,7 +4,7 @@ Tests for the types module.
 
 import unittest
 
-from src.prepo.types import DataType, FileFormat, ScalerType
+from src.prepo.types import DataType, FileFormat, ImputeStrategy, ParallelBackend, ScalerType
 
 
 class TestDataTypes(unittest.TestCase):
@@ -49,6 +49,23 @@ class TestDataTypes(unittest.TestCase):
         self.assertIn(ScalerType.STANDARD, ScalerType)
         self.assertIn(ScalerType.NONE, ScalerType)
 
+    def test_impute_strategy_enum(self):
+        """Test ImputeStrategy enum values and methods."""
+        self.assertEqual(ImputeStrategy.KNN.value, "knn")
+        self.assertEqual(ImputeStrategy.MEDIAN.value, "median")
+        self.assertEqual(ImputeStrategy.GROUPED_MEDIAN.value, "grouped_median")
+
+        self.assertEqual(str(ImputeStrategy.KNN), "knn")
+        self.assertEqual(ImputeStrategy("grouped_median"), ImputeStrategy.GROUPED_MEDIAN)
+        self.assertEqual(len(list(ImputeStrategy)), 3)
+
+    def test_parallel_backend_enum(self):
+        """Test ParallelBackend enum values and methods."""
+        self.assertEqual(ParallelBackend.THREAD.value, "thread")
+        self.assertEqual(ParallelBackend.PROCESS.value, "process")
+        self.assertEqual(str(ParallelBackend.PROCESS), "process")
+        self.assertEqual(ParallelBackend("thread"), ParallelBackend.THREAD)
+
     def test_file_format_enum(self):
         """Test FileFormat enum values and methods."""
         # Test enum values